@@ -0,0 +1,134 @@
+"""
+Admission control and load shedding for the Flask APIs
+
+Every endpoint belongs to a class ('cheap', 'predict', 'expensive') with its
+own concurrency limit, bounded wait queue and queueing deadline
+(ADMISSION_LIMITS in config.py). A request that finds its class full waits
+in the queue. It is shed with a fast 503 and a Retry-After header when the
+queue is full or no slot frees up before the deadline. Because each class
+has separate slots, a burst of batch or /explain requests cannot starve the
+cheap /api/* lookups.
+
+Limits apply per process (the APIs serve requests on threads).
+
+Usage:
+    admission = AdmissionControl(ADMISSION_LIMITS, {'predict_batch': 'expensive'})
+    admission.init_app(app)
+    ...
+    admission.stats()   # per-class active / waiting / admitted / queued / shed
+"""
+
+import math
+import threading
+import time
+
+from flask import g, jsonify, request
+
+
+class ConcurrencyLimiter:
+    """Counting semaphore with a bounded wait queue and a wait deadline"""
+
+    def __init__(self, max_concurrent, max_queue, timeout_seconds):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self._cond = threading.Condition()
+
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+
+    def acquire(self):
+        """Take a slot, waiting up to timeout_seconds; False means shed"""
+        with self._cond:
+            if self.active < self.max_concurrent and self.waiting == 0:
+                self.active += 1
+                self.admitted += 1
+                return True
+
+            if self.waiting >= self.max_queue:
+                self.shed += 1
+                return False
+
+            self.waiting += 1
+            self.queued += 1
+            deadline = time.monotonic() + self.timeout_seconds
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed += 1
+                        return False
+                    self._cond.wait(remaining)
+                self.active += 1
+                self.admitted += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'timeout_seconds': self.timeout_seconds,
+                'active': self.active,
+                'waiting': self.waiting,
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'shed': self.shed
+            }
+
+
+class AdmissionControl:
+    """Per-endpoint-class limiters wired into Flask request hooks"""
+
+    def __init__(self, limits, endpoint_classes, default_class='cheap', exempt=()):
+        """
+        Args:
+            limits: {class: {'max_concurrent', 'max_queue', 'timeout_seconds'}}
+            endpoint_classes: {flask endpoint name: class}; others use default_class
+            exempt: endpoint names never limited (health checks, metrics)
+        """
+        self.limiters = {name: ConcurrencyLimiter(**spec) for name, spec in limits.items()}
+        self.endpoint_classes = endpoint_classes
+        self.default_class = default_class
+        self.exempt = set(exempt)
+
+    def init_app(self, app):
+        app.before_request(self._admit)
+        app.teardown_request(self._release)
+
+    def _admit(self):
+        endpoint = request.endpoint
+        if endpoint is None or endpoint in self.exempt:
+            return None
+
+        request_class = self.endpoint_classes.get(endpoint, self.default_class)
+        limiter = self.limiters[request_class]
+        if not limiter.acquire():
+            response = jsonify({
+                'error': 'Service overloaded',
+                'message': f'Too many concurrent {request_class} requests, please retry shortly'
+            })
+            response.status_code = 503
+            response.headers['Retry-After'] = str(max(1, math.ceil(limiter.timeout_seconds)))
+            return response
+
+        g.admission_limiter = limiter
+        return None
+
+    def _release(self, exc=None):
+        limiter = g.pop('admission_limiter', None)
+        if limiter is not None:
+            limiter.release()
+
+    def stats(self):
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
@@ -7,30 +7,73 @@ Fixes:
 4. Clear error messages
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import joblib
 import pandas as pd
-import numpy as np
-import traceback
 
 # Import configuration (Fix Issue #3: Consistent Paths)
-from config import DATASET_PATH, MODEL_PATH, ENCODER_PATH
+from config import DATASET_PATH, MODEL_PATH, ENCODER_PATH, MODEL_ONNX_PATH, ADMISSION_LIMITS
+from validation import (
+    PREDICTION_FIELDS, validate_prediction_input,
+    country_code_map, build_feature_matrix
+)
+from uncertainty import TreeDistribution, parse_uncertainty_options
+from estimators import describe
+from onnx_backend import load_predictor
+from history_store import HistoryStore, parse_history_options
+from admission import AdmissionControl
+from singleflight import SingleFlight, single_flight
+from warmup import Readiness, start_warm_up
+from request_profiler import RequestProfiler
+from slow_requests import SlowRequestLog, mark_stage, is_admin_request
+from structured_logging import configure_logging, init_request_logging, log_exception, dropped_records
 
 app = Flask(__name__)
 CORS(app)
 
+# JSON-lines logs written by a background thread; sampled access log
+LOGGER_NAME = 'gdp-api'
+logger = configure_logging(LOGGER_NAME)
+init_request_logging(app, logger)
+
+# Concurrency class of each endpoint; everything else is 'cheap'
+admission = AdmissionControl(ADMISSION_LIMITS, {
+    'predict': 'predict',
+    'predict_batch': 'expensive'
+}, exempt={'metrics', 'healthz', 'readyz', 'debug_slow'})
+admission.init_app(app)
+
+# Opt-in sampling profiler (REQUEST_PROFILING=1 or X-Profile-Token); no hooks when off
+profiler = RequestProfiler()
+profiler.init_app(app)
+
+# Per-stage timings of requests above SLOW_REQUEST_THRESHOLD_MS (/debug/slow)
+slow_log = SlowRequestLog()
+slow_log.init_app(app)
+
+# Identical concurrent requests share one computation
+flight = SingleFlight()
+
+# Set once the startup warm-up has run (/readyz)
+readiness = Readiness()
+
 # Global variables for model and data
 model = None
 encoder = None
 df_history = None
+tree_distribution = None
+history_store = None
+predictor = None
+inference_backend = 'sklearn'
 
 
 def load_model_and_data():
     """
     Load ML model, encoder, and historical data
     """
-    global model, encoder, df_history
+    global model, encoder, df_history, tree_distribution, predictor, inference_backend
+    global history_store
     
     # Load Model & Encoder
     try:
@@ -44,10 +87,24 @@ def load_model_and_data():
         model = None
         encoder = None
     
+    # Scoring backend: the sklearn model, or its ONNX export (INFERENCE_BACKEND)
+    predictor, inference_backend = load_predictor(model, MODEL_ONNX_PATH, MODEL_PATH)
+    
+    # Precompute per-tree value tables for uncertainty output
+    tree_distribution = None
+    if model is not None:
+        try:
+            tree_distribution = TreeDistribution(model)
+        except TypeError as e:
+            print(f"⚠️ Uncertainty output unavailable: {e}")
+    
     # Load Historical Data
     try:
         df_history = pd.read_csv(DATASET_PATH)
         
+        # Precomputed per-country slices and full-dataset snapshot
+        history_store = HistoryStore(df_history)
+        
         # Select columns for frontend
         df_history = df_history[[
             'Country', 
@@ -70,6 +127,26 @@ def load_model_and_data():
     except Exception as e:
         print(f"⚠️ Historical Data Error: {e}")
         df_history = pd.DataFrame()
+        history_store = None
+
+
+def warm_up_requests():
+    """One representative request per route, for a country the model knows"""
+    country = encoder.classes_[0] if encoder is not None else (
+        history_store.countries[0] if history_store is not None and len(history_store) else 'United States')
+    row = {'Country': country, 'Population': 1.0, 'Exports': 3.0, 'Imports': 3.0,
+           'Investment': 3.0, 'Consumption': 2.5, 'Govt_Spend': 2.0}
+    return [
+        ('GET', '/', {}),
+        ('GET', '/api/countries', {}),
+        ('GET', '/api/history', {'query_string': {'country': country}}),
+        ('GET', '/api/history', {'query_string': {'country': country, 'shape': 'columnar'}}),
+        ('GET', '/api/history/bulk', {'query_string': {'country': country}}),
+        ('GET', '/api/history/all', {'headers': {'Accept-Encoding': 'gzip'}}),
+        ('POST', '/predict', {'json': row}),
+        ('POST', '/predict', {'json': {**row, 'include_uncertainty': True}}),
+        ('POST', '/predict/batch', {'json': {'inputs': [row, row], 'include_uncertainty': True}})
+    ]
 
 
 # Load on startup
@@ -87,12 +164,19 @@ def home():
         'version': 'v3.0-refactored',
         'model_loaded': model is not None,
         'encoder_loaded': encoder is not None,
+        'inference_backend': inference_backend,
         'data_loaded': not df_history.empty if df_history is not None else False,
         'endpoints': {
             '/': 'GET - API information',
             '/api/countries': 'GET - List all countries',
-            '/api/history': 'GET - Historical data for a country (param: country)',
-            '/predict': 'POST - Predict GDP growth rate'
+            '/api/history': 'GET - Historical data for a country (params: country, fields, from, to, shape)',
+            '/api/history/bulk': 'GET - Historical data for several countries (repeat param: country)',
+            '/api/history/all': 'GET - Compressed snapshot of the full dataset',
+            '/predict': 'POST - Predict GDP growth rate',
+            '/predict/batch': 'POST - Predict GDP growth for a list of inputs',
+            '/metrics': 'GET - Admission control and deduplication counters',
+            '/healthz': 'GET - Liveness probe',
+            '/readyz': 'GET - Readiness probe (503 until warm-up has finished)'
         },
         'note': 'Model uses lagged features (T-1) to predict GDP at time T'
     })
@@ -120,9 +204,16 @@ def get_countries():
 
 
 @app.route('/api/history', methods=['GET'])
+@single_flight(flight)
 def get_history():
     """
     Get historical GDP data for a specific country
+    
+    Optional query parameters:
+    - fields: comma-separated, e.g. GDP_Growth,Investment_Growth
+      (default GDP_Growth,Exports_Growth,Imports_Growth)
+    - from / to: inclusive year range
+    - shape: records (default) or columnar (one array per field)
     """
     try:
         country = request.args.get('country')
@@ -132,22 +223,29 @@ def get_history():
                 'error': 'Missing required parameter: country'
             }), 400
         
+        query, error_msg = parse_history_options(
+            request.args, history_store.fields if history_store is not None else []
+        )
+        if error_msg:
+            return jsonify({
+                'error': 'Invalid parameter',
+                'message': error_msg
+            }), 400
+        
         if df_history is None or df_history.empty:
             return jsonify({
                 'error': 'Historical data not available'
             }), 500
         
-        # Filter for country
-        country_data = df_history[df_history['Country'] == country].sort_values('Year')
+        # Pre-serialized per-country slice
+        body = history_store.country_json(country, query) if history_store is not None else None
         
-        if country_data.empty:
+        if body is None:
             return jsonify({
                 'error': f'No data found for country: {country}'
             }), 404
         
-        # Convert to JSON
-        data_json = country_data.replace({np.nan: None}).to_dict(orient='records')
-        return jsonify(data_json)
+        return Response(body, mimetype='application/json')
     
     except Exception as e:
         return jsonify({
@@ -156,69 +254,70 @@ def get_history():
         }), 500
 
 
-def validate_prediction_input(data):
+@app.route('/api/history/bulk', methods=['GET', 'POST'])
+@single_flight(flight)
+def get_history_bulk():
     """
-    Validate incoming prediction request (Fix Issue #4: Input Validation)
+    Historical GDP data for several countries in one response
     
-    Args:
-        data: JSON request data
+    GET /api/history/bulk?country=China&country=India
+    POST /api/history/bulk {"countries": ["China", "India"]}
     
-    Returns:
-        tuple: (is_valid, error_message, validated_data)
+    Accepts the same fields / from / to / shape query parameters as /api/history.
+    Returns {"series": {country: history}, "missing": [unknown countries]}
     """
-    required_fields = [
-        'Country',
-        'Population',
-        'Exports',
-        'Imports',
-        'Investment',
-        'Consumption',
-        'Govt_Spend'
-    ]
-    
-    # Check if data exists
-    if not data:
-        return False, 'Request body is empty', None
-    
-    # Check for missing fields
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return False, f'Missing required fields: {", ".join(missing_fields)}', None
-    
-    # Validate and convert to float
-    validated_data = {}
-    
-    # Country should be string
     try:
-        validated_data['Country'] = str(data['Country']).strip()
-        if not validated_data['Country']:
-            return False, 'Country name cannot be empty', None
-    except Exception:
-        return False, 'Invalid Country value', None
+        if request.method == 'POST':
+            data = request.get_json(silent=True)
+            countries = data.get('countries') if isinstance(data, dict) else None
+        else:
+            countries = request.args.getlist('country')
+        
+        if not isinstance(countries, list) or not countries or not all(isinstance(c, str) for c in countries):
+            return jsonify({'error': 'Missing required parameter: country (one or more)'}), 400
+        
+        if history_store is None or not len(history_store):
+            return jsonify({'error': 'Historical data not available'}), 500
+        
+        query, error_msg = parse_history_options(request.args, history_store.fields)
+        if error_msg:
+            return jsonify({'error': 'Invalid parameter', 'message': error_msg}), 400
+        
+        body, missing = history_store.bulk_json(countries, query)
+        if len(missing) == len(set(countries)):
+            return jsonify({'error': 'No data found for the requested countries', 'missing': missing}), 404
+        
+        return Response(body, mimetype='application/json')
+    except Exception as e:
+        return jsonify({'error': 'Failed to retrieve historical data', 'details': str(e)}), 500
+
+
+@app.route('/api/history/all', methods=['GET'])
+def get_history_all():
+    """
+    Every country and field as one pre-built snapshot
     
-    # Numeric fields should be convertible to float
-    numeric_fields = [
-        'Population', 'Exports', 'Imports', 
-        'Investment', 'Consumption', 'Govt_Spend'
-    ]
+    Served gzip-compressed when the client accepts it, with an ETag so
+    unchanged snapshots are answered with 304 Not Modified.
+    """
+    if history_store is None or not len(history_store):
+        return jsonify({'error': 'Historical data not available'}), 500
     
-    for field in numeric_fields:
-        try:
-            value = float(data[field])
-            
-            # Check for reasonable ranges (growth rates typically -100% to +100%)
-            if not -100 <= value <= 100:
-                return False, f'{field} value {value} is outside reasonable range (-100 to 100)', None
-            
-            validated_data[field] = value
-            
-        except (ValueError, TypeError):
-            return False, f'Invalid {field} value: must be a number', None
+    if history_store.snapshot_etag in request.if_none_match:
+        response = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        response = Response(history_store.snapshot_gzip, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(history_store.snapshot, mimetype='application/json')
     
-    return True, None, validated_data
+    response.set_etag(history_store.snapshot_etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 
 @app.route('/predict', methods=['POST'])
+@single_flight(flight)
 def predict():
     """
     Predict GDP growth rate using lagged features
@@ -234,6 +333,9 @@ def predict():
         "Govt_Spend": 2.0
     }
     
+    Optional: "include_uncertainty": true and "quantiles": [0.05, 0.95]
+    to add the spread of the individual tree predictions
+    
     Note: These values represent growth rates from year T-1
     The model will predict GDP growth for year T
     """
@@ -254,6 +356,11 @@ def predict():
                 ]
             }), 400
         
+        include_uncertainty, quantiles, error_msg = parse_uncertainty_options(data)
+        if error_msg:
+            return jsonify({'error': 'Invalid input', 'message': error_msg}), 400
+        mark_stage('validate')
+        
         # Check if model is loaded
         if model is None or encoder is None:
             # Fallback simulation
@@ -262,11 +369,15 @@ def predict():
                 validated_data['Exports'] * 0.2 -
                 validated_data['Imports'] * 0.1
             )
-            return jsonify({
+            response = {
                 'growth': round(sim_growth, 2),
                 'method': 'Simulation (Model not loaded)',
                 'warning': 'Using fallback simulation. Model file not found.'
-            })
+            }
+            if include_uncertainty:
+                response['uncertainty'] = None
+                response['uncertainty_unavailable'] = 'The fallback simulation has no per-tree predictions'
+            return jsonify(response)
         
         # Check if country is in encoder
         try:
@@ -288,21 +399,33 @@ def predict():
             validated_data['Consumption'],
             validated_data['Govt_Spend']
         ]
+        mark_stage('encode')
         
         # Make prediction
-        prediction = model.predict([features])[0]
+        prediction = float(predictor.predict([features])[0])
         
-        return jsonify({
+        response = {
             'growth': round(prediction, 2),
-            'method': 'AI Model (Random Forest)',
+            'method': f'AI Model ({describe(model)})',
             'note': 'Prediction based on lagged features (T-1 → T)',
             'country': validated_data['Country']
-        })
+        }
+        
+        if include_uncertainty:
+            if tree_distribution is None:
+                return jsonify({
+                    'error': 'Uncertainty unavailable',
+                    'message': f'{type(model).__name__} does not provide per-tree predictions'
+                }), 501
+            summary = tree_distribution.summarize([features], quantiles)
+            response['uncertainty'] = tree_distribution.to_json(summary, quantiles)[0]
+        mark_stage('predict')
+        
+        return jsonify(response)
     
     except Exception as e:
-        # Log full error for debugging
-        print(f"❌ Prediction Error: {e}")
-        print(traceback.format_exc())
+        # Log full error for debugging (off the request thread)
+        log_exception(logger, 'Prediction failed', e, endpoint='/predict')
         
         # Return user-friendly error
         return jsonify({
@@ -312,6 +435,141 @@ def predict():
         }), 500
 
 
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Predict GDP growth rate for many inputs in one request
+    
+    Expected JSON body:
+    {
+        "inputs": [ {same fields as /predict}, ... ],
+        "include_uncertainty": false,
+        "quantiles": [0.05, 0.5, 0.95]
+    }
+    
+    All rows are scored with a single model call; with uncertainty enabled the
+    per-tree statistics come from one (trees x rows) prediction matrix.
+    """
+    try:
+        data = request.get_json()
+        inputs = data.get('inputs') if isinstance(data, dict) else None
+        
+        if not isinstance(inputs, list) or not inputs:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'inputs must be a non-empty list of prediction requests'
+            }), 400
+        
+        include_uncertainty, quantiles, error_msg = parse_uncertainty_options(data)
+        if error_msg:
+            return jsonify({'error': 'Invalid input', 'message': error_msg}), 400
+        
+        # Validate every row before doing any work
+        validated_rows = []
+        for i, row in enumerate(inputs):
+            is_valid, error_msg, validated_data = validate_prediction_input(row)
+            if not is_valid:
+                return jsonify({
+                    'error': 'Invalid input',
+                    'message': f'Input {i}: {error_msg}',
+                    'required_fields': PREDICTION_FIELDS
+                }), 400
+            validated_rows.append(validated_data)
+        mark_stage('validate')
+        
+        if model is None or encoder is None:
+            return jsonify({
+                'error': 'Model not loaded',
+                'message': 'Batch prediction requires the trained model'
+            }), 500
+        
+        X, unknown = build_feature_matrix(validated_rows, PREDICTION_FIELDS, country_code_map(encoder))
+        if unknown:
+            return jsonify({
+                'error': 'Unknown country',
+                'message': f"Country '{validated_rows[unknown[0]]['Country']}' not found in training data",
+                'available_countries': encoder.classes_.tolist()[:10]
+            }), 400
+        mark_stage('encode')
+        
+        predictions = predictor.predict(X)
+        results = [
+            {'country': row['Country'], 'growth': round(float(prediction), 2)}
+            for row, prediction in zip(validated_rows, predictions)
+        ]
+        
+        if include_uncertainty:
+            if tree_distribution is None:
+                return jsonify({
+                    'error': 'Uncertainty unavailable',
+                    'message': f'{type(model).__name__} does not provide per-tree predictions'
+                }), 501
+            summary = tree_distribution.summarize(X, quantiles)
+            for result, uncertainty in zip(results, tree_distribution.to_json(summary, quantiles)):
+                result['uncertainty'] = uncertainty
+        mark_stage('predict')
+        
+        return jsonify({
+            'predictions': results,
+            'count': len(results),
+            'method': f'AI Model ({describe(model)})',
+            'note': 'Prediction based on lagged features (T-1 → T)'
+        })
+    
+    except Exception as e:
+        log_exception(logger, 'Batch prediction failed', e, endpoint='/predict/batch')
+        
+        return jsonify({
+            'error': 'Prediction failed',
+            'message': 'An unexpected error occurred during batch prediction',
+            'details': str(e)
+        }), 500
+
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving"""
+    return jsonify({'status': 'alive', 'uptime_seconds': round(readiness.uptime(), 1)})
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: models loaded and warm-up finished, so requests are fast"""
+    if not readiness.ready:
+        response = jsonify({'status': 'warming_up'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+    
+    return jsonify({
+        'status': 'ready',
+        'model_loaded': model is not None,
+        'warm_up': readiness.report
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Admission control counters per endpoint class and single-flight deduplication"""
+    return jsonify({
+        'admission': admission.stats(),
+        'single_flight': flight.stats(),
+        'logging': {'dropped_records': dropped_records(LOGGER_NAME)}
+    })
+
+
+@app.route('/debug/slow', methods=['GET'])
+def debug_slow():
+    """Slowest recent requests with per-stage timings (requires X-Admin-Token)"""
+    if not is_admin_request():
+        return jsonify({
+            'error': 'Endpoint not found',
+            'message': 'The requested endpoint does not exist'
+        }), 404
+    
+    return jsonify(slow_log.report())
+
+
 @app.errorhandler(404)
 def not_found(e):
     """Handle 404 errors"""
@@ -319,7 +577,8 @@ def not_found(e):
         'error': 'Endpoint not found',
         'message': 'The requested endpoint does not exist',
         'available_endpoints': [
-            '/', '/api/countries', '/api/history', '/predict'
+            '/', '/api/countries', '/api/history', '/api/history/bulk', '/api/history/all',
+            '/predict', '/predict/batch', '/metrics', '/healthz', '/readyz'
         ]
     }), 404
 
@@ -333,6 +592,10 @@ def internal_error(e):
     }), 500
 
 
+# Warm every route in the background; /readyz reports when it is done
+start_warm_up(app, warm_up_requests(), readiness)
+
+
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 5000))
@@ -8,34 +8,116 @@ Example: "If exports grow 10% and investment grows 5%, what happens to GDP?"
 This is NOT a forecasting tool - it's a scenario simulator!
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import joblib
 import pandas as pd
 import numpy as np
-import traceback
 
-from config import DATASET_PATH
+from config import (
+    DATASET_PATH, SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH,
+    SCENARIO_FEATURE_INFO_PATH, SCENARIO_SURROGATE_PATH, SCENARIO_SERVING_MODE,
+    SCENARIO_FAST_MAX_P99_ERROR, SCENARIO_ONNX_PATH,
+    SCENARIO_COMPARE_MAX_SCENARIOS, ADMISSION_LIMITS
+)
+from validation import (
+    SCENARIO_FIELDS, validate_scenario_input, validate_scenario_rates,
+    country_code_map, build_feature_matrix
+)
+from explain import ForestExplainer
+from uncertainty import TreeDistribution, parse_uncertainty_options
+from onnx_backend import load_predictor
+from history_store import HistoryStore, parse_history_options
+from admission import AdmissionControl
+from singleflight import SingleFlight, single_flight
+from warmup import Readiness, start_warm_up
+from request_profiler import RequestProfiler
+from slow_requests import SlowRequestLog, mark_stage, is_admin_request
+from structured_logging import configure_logging, init_request_logging, log_exception, dropped_records
 
 app = Flask(__name__)
 CORS(app)
 
+# JSON-lines logs written by a background thread; sampled access log
+LOGGER_NAME = 'gdp-scenario-api'
+logger = configure_logging(LOGGER_NAME)
+init_request_logging(app, logger)
+
+# Concurrency class of each endpoint; everything else is 'cheap'
+admission = AdmissionControl(ADMISSION_LIMITS, {
+    'simulate_scenario': 'predict',
+    'simulate_batch': 'expensive',
+    'simulate_compare': 'expensive',
+    'explain_scenario': 'expensive'
+}, exempt={'metrics', 'healthz', 'readyz', 'debug_slow'})
+admission.init_app(app)
+
+# Opt-in sampling profiler (REQUEST_PROFILING=1 or X-Profile-Token); no hooks when off
+profiler = RequestProfiler()
+profiler.init_app(app)
+
+# Per-stage timings of requests above SLOW_REQUEST_THRESHOLD_MS (/debug/slow)
+slow_log = SlowRequestLog()
+slow_log.init_app(app)
+
+# Identical concurrent requests share one computation
+flight = SingleFlight()
+
+# Set once the startup warm-up has run (/readyz)
+readiness = Readiness()
+
 # Global variables
 model = None
 encoder = None
 feature_info = None
 df_history = None
+explainer = None
+tree_distribution = None
+history_store = None
+baseline_table = {}
+baseline_rows = {}
+baseline_features = None
+surrogate = None
+predictor = None
+inference_backend = 'sklearn'
+default_serving_mode = 'model'
+
+# 'model' = full forest, 'fast' = distilled surrogate (distill.py)
+SERVING_MODES = ['model', 'fast']
+
+# /api/baseline rate name -> dataset column (same order as SCENARIO_FIELDS[1:])
+BASELINE_COLUMNS = {
+    'population': 'Population_Growth_Rate',
+    'exports': 'Exports of goods and services_Growth_Rate',
+    'imports': 'Imports of goods and services_Growth_Rate',
+    'investment': 'Gross capital formation_Growth_Rate',
+    'consumption': 'Final consumption expenditure_Growth_Rate',
+    'govt_spend': 'Government_Expenditure_Growth_Rate'
+}
+
+# Names used for each model feature in /explain responses
+CONTRIBUTION_NAMES = [
+    'country',
+    'population_growth',
+    'exports_growth',
+    'imports_growth',
+    'investment_growth',
+    'consumption_growth',
+    'govt_spend_growth'
+]
 
 
 def load_model_and_data():
     """Load scenario model, encoder, and historical data"""
-    global model, encoder, feature_info, df_history
+    global model, encoder, feature_info, df_history, explainer, tree_distribution
+    global surrogate, default_serving_mode, predictor, inference_backend
+    global history_store, baseline_table, baseline_rows, baseline_features
     
     # Load Scenario Model & Encoder
     try:
-        model = joblib.load("gdp_scenario_model.pkl")
-        encoder = joblib.load("country_encoder_scenario.pkl")
-        feature_info = joblib.load("feature_info_scenario.pkl")
+        model = joblib.load(SCENARIO_MODEL_PATH)
+        encoder = joblib.load(SCENARIO_ENCODER_PATH)
+        feature_info = joblib.load(SCENARIO_FEATURE_INFO_PATH)
         print(f"✅ Scenario Model loaded")
         print(f"✅ Encoder loaded")
         print(f"✅ Feature info loaded")
@@ -45,9 +127,50 @@ def load_model_and_data():
         encoder = None
         feature_info = None
     
+    # Scoring backend: the sklearn model, or its ONNX export (INFERENCE_BACKEND)
+    predictor, inference_backend = load_predictor(model, SCENARIO_ONNX_PATH, SCENARIO_MODEL_PATH)
+    
+    # Precompute decision-path tables for /explain and per-tree value
+    # tables for uncertainty output
+    explainer = None
+    tree_distribution = None
+    if model is not None:
+        try:
+            explainer = ForestExplainer(model)
+            tree_distribution = TreeDistribution(model)
+            print(f"✅ Explainer ready")
+        except TypeError as e:
+            print(f"⚠️ Explanations and uncertainty unavailable: {e}")
+    
+    # Distilled surrogate for fast mode (optional)
+    try:
+        surrogate = joblib.load(SCENARIO_SURROGATE_PATH)
+        print("✅ Surrogate loaded")
+    except Exception:
+        surrogate = None
+        print(f"ℹ️ No surrogate at {SCENARIO_SURROGATE_PATH} - fast mode unavailable")
+    
+    # Only serve a surrogate whose stored fidelity report is within tolerance
+    if surrogate is not None and not surrogate.p99_error <= SCENARIO_FAST_MAX_P99_ERROR:
+        print(f"⚠️ Surrogate p99 error {surrogate.p99_error:.2f} exceeds "
+              f"{SCENARIO_FAST_MAX_P99_ERROR} (or is unknown) - fast mode unavailable")
+        surrogate = None
+    
+    default_serving_mode = SCENARIO_SERVING_MODE
+    if not serving_mode_available(default_serving_mode):
+        print(f"⚠️ Serving mode '{SCENARIO_SERVING_MODE}' unavailable - using 'model'")
+        default_serving_mode = 'model'
+    
     # Load Historical Data
     try:
         df_history = pd.read_csv(DATASET_PATH)
+        history_store = HistoryStore(df_history)
+        
+        # Historical averages per country for /api/baseline
+        means = df_history.groupby('Country')[list(BASELINE_COLUMNS.values())].mean().round(2)
+        means.columns = list(BASELINE_COLUMNS)
+        baseline_table = means.to_dict(orient='index')
+        
         df_history = df_history[[
             'Country', 'Year', 'GDP_Growth_Rate',
             'Exports of goods and services_Growth_Rate',
@@ -63,6 +186,88 @@ def load_model_and_data():
     except Exception as e:
         print(f"⚠️ Historical Data Error: {e}")
         df_history = pd.DataFrame()
+        history_store = None
+        baseline_table = {}
+    
+    # Feature rows of each country's baseline scenario for /simulate/compare
+    baseline_rows, baseline_features = build_baseline_features()
+
+
+def build_baseline_features():
+    """
+    Model features of each country's baseline scenario (its /api/baseline rates)
+    
+    Countries unknown to the encoder or without an average for every rate
+    are left out.
+    
+    Returns: (rows, X) - {country: row of X}, float64 matrix in SCENARIO_FIELDS order
+    """
+    if encoder is None or not baseline_table:
+        return {}, np.empty((0, len(SCENARIO_FIELDS)))
+    
+    rows = [
+        {'Country': country, **dict(zip(SCENARIO_FIELDS[1:], (rates[name] for name in BASELINE_COLUMNS)))}
+        for country, rates in baseline_table.items()
+    ]
+    X, _ = build_feature_matrix(rows, SCENARIO_FIELDS, country_code_map(encoder))
+    complete = ~np.isnan(X).any(axis=1)
+    countries = [row['Country'] for row, keep in zip(rows, complete) if keep]
+    return {country: i for i, country in enumerate(countries)}, X[complete]
+
+
+def serving_mode_available(mode):
+    """Whether the artifacts behind a serving mode are loaded"""
+    return {
+        'model': True,
+        'fast': surrogate is not None
+    }.get(mode, False)
+
+
+def resolve_serving_mode(data):
+    """
+    Serving mode for a request: its "mode" field, else the configured default
+    
+    Returns: (mode, error_message)
+    """
+    mode = data.get('mode', default_serving_mode) if isinstance(data, dict) else default_serving_mode
+    if mode not in SERVING_MODES:
+        return None, f'mode must be one of: {", ".join(SERVING_MODES)}'
+    if not serving_mode_available(mode):
+        return None, (f"'{mode}' mode unavailable: its artifacts are not built or are over "
+                      f"their error tolerance (run distill.py)")
+    return mode, None
+
+
+def predict_scenarios(X, mode):
+    """Predictions from the full model or the distilled surrogate"""
+    if mode == 'fast':
+        return surrogate.predict(X)
+    return predictor.predict(X)
+
+
+def warm_up_requests():
+    """One representative request per route and serving mode, for a country the model knows"""
+    country = encoder.classes_[0] if encoder is not None else (
+        history_store.countries[0] if history_store is not None and len(history_store) else 'United States')
+    scenario = {'Country': country, 'Population_Growth_Rate': 1.0, 'Exports_Growth_Rate': 3.0,
+                'Imports_Growth_Rate': 3.0, 'Investment_Growth_Rate': 3.0,
+                'Consumption_Growth_Rate': 2.5, 'Govt_Spend_Growth_Rate': 2.0}
+    warm_requests = [
+        ('GET', '/', {}),
+        ('GET', '/api/countries', {}),
+        ('GET', '/api/history', {'query_string': {'country': country}}),
+        ('GET', '/api/history', {'query_string': {'country': country, 'shape': 'columnar'}}),
+        ('GET', '/api/history/bulk', {'query_string': {'country': country}}),
+        ('GET', '/api/history/all', {'headers': {'Accept-Encoding': 'gzip'}}),
+        ('GET', '/api/baseline', {'query_string': {'country': country}}),
+        ('POST', '/simulate', {'json': {**scenario, 'include_uncertainty': True}}),
+        ('POST', '/simulate/batch', {'json': {'scenarios': [scenario, scenario], 'include_uncertainty': True}}),
+        ('POST', '/simulate/compare', {'json': {'scenarios': [scenario], 'countries': 'all'}}),
+        ('POST', '/explain', {'json': scenario})
+    ]
+    warm_requests += [('POST', '/simulate', {'json': {**scenario, 'mode': mode}})
+                      for mode in SERVING_MODES if mode != 'model' and serving_mode_available(mode)]
+    return warm_requests
 
 
 # Load on startup
@@ -82,12 +287,24 @@ def home():
         'example': 'If exports grow 10% and investment grows 5%, what happens to GDP?',
         'model_loaded': model is not None,
         'encoder_loaded': encoder is not None,
+        'serving_mode': default_serving_mode,
+        'inference_backend': inference_backend,
+        'fast_mode_available': surrogate is not None,
         'data_loaded': not df_history.empty if df_history is not None else False,
         'endpoints': {
             '/': 'GET - API information',
             '/api/countries': 'GET - List all countries',
-            '/api/history': 'GET - Historical data for a country',
-            '/simulate': 'POST - Simulate economic scenario'
+            '/api/history': 'GET - Historical data for a country (params: country, fields, from, to, shape)',
+            '/api/history/bulk': 'GET - Historical data for several countries (repeat param: country)',
+            '/api/history/all': 'GET - Compressed snapshot of the full dataset',
+            '/simulate': 'POST - Simulate economic scenario',
+            '/simulate/batch': 'POST - Simulate a list of scenarios',
+            '/simulate/compare': 'POST - Named scenarios x countries matrix with deltas vs baseline',
+            '/explain': 'POST - Per-feature contributions for one or more scenarios',
+            '/api/baseline': 'GET - Baseline growth rates for a country',
+            '/metrics': 'GET - Admission control and deduplication counters',
+            '/healthz': 'GET - Liveness probe',
+            '/readyz': 'GET - Readiness probe (503 until warm-up has finished)'
         }
     })
 
@@ -106,89 +323,105 @@ def get_countries():
 
 
 @app.route('/api/history', methods=['GET'])
+@single_flight(flight)
 def get_history():
-    """Get historical GDP data for a specific country"""
+    """
+    Get historical GDP data for a specific country
+    
+    Optional query parameters:
+    - fields: comma-separated, e.g. GDP_Growth,Investment_Growth
+      (default GDP_Growth,Exports_Growth,Imports_Growth)
+    - from / to: inclusive year range
+    - shape: records (default) or columnar (one array per field)
+    """
     try:
         country = request.args.get('country')
         
         if not country:
             return jsonify({'error': 'Missing required parameter: country'}), 400
         
+        query, error_msg = parse_history_options(
+            request.args, history_store.fields if history_store is not None else []
+        )
+        if error_msg:
+            return jsonify({'error': 'Invalid parameter', 'message': error_msg}), 400
+        
         if df_history is None or df_history.empty:
             return jsonify({'error': 'Historical data not available'}), 500
         
-        country_data = df_history[df_history['Country'] == country].sort_values('Year')
-        
-        if country_data.empty:
+        body = history_store.country_json(country, query) if history_store is not None else None
+        if body is None:
             return jsonify({'error': f'No data found for country: {country}'}), 404
         
-        data_json = country_data.replace({np.nan: None}).to_dict(orient='records')
-        return jsonify(data_json)
+        return Response(body, mimetype='application/json')
     except Exception as e:
         return jsonify({'error': 'Failed to retrieve historical data', 'details': str(e)}), 500
 
 
-def validate_scenario_input(data):
-    """
-    Validate incoming scenario simulation request
-    
-    Returns: (is_valid, error_message, validated_data)
+@app.route('/api/history/bulk', methods=['GET', 'POST'])
+@single_flight(flight)
+def get_history_bulk():
     """
-    required_fields = [
-        'Country',
-        'Population_Growth_Rate',
-        'Exports_Growth_Rate',
-        'Imports_Growth_Rate',
-        'Investment_Growth_Rate',
-        'Consumption_Growth_Rate',
-        'Govt_Spend_Growth_Rate'
-    ]
+    Historical GDP data for several countries in one response
     
-    # Check if data exists
-    if not data:
-        return False, 'Request body is empty', None
+    GET /api/history/bulk?country=China&country=India
+    POST /api/history/bulk {"countries": ["China", "India"]}
     
-    # Check for missing fields
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return False, f'Missing required fields: {", ".join(missing_fields)}', None
-    
-    validated_data = {}
-    
-    # Validate country
+    Accepts the same fields / from / to / shape query parameters as /api/history.
+    Returns {"series": {country: history}, "missing": [unknown countries]}
+    """
     try:
-        validated_data['Country'] = str(data['Country']).strip()
-        if not validated_data['Country']:
-            return False, 'Country name cannot be empty', None
-    except Exception:
-        return False, 'Invalid Country value', None
-    
-    # Validate numeric fields
-    numeric_fields = [
-        'Population_Growth_Rate',
-        'Exports_Growth_Rate',
-        'Imports_Growth_Rate',
-        'Investment_Growth_Rate',
-        'Consumption_Growth_Rate',
-        'Govt_Spend_Growth_Rate'
-    ]
+        if request.method == 'POST':
+            data = request.get_json(silent=True)
+            countries = data.get('countries') if isinstance(data, dict) else None
+        else:
+            countries = request.args.getlist('country')
+        
+        if not isinstance(countries, list) or not countries or not all(isinstance(c, str) for c in countries):
+            return jsonify({'error': 'Missing required parameter: country (one or more)'}), 400
+        
+        if history_store is None or not len(history_store):
+            return jsonify({'error': 'Historical data not available'}), 500
+        
+        query, error_msg = parse_history_options(request.args, history_store.fields)
+        if error_msg:
+            return jsonify({'error': 'Invalid parameter', 'message': error_msg}), 400
+        
+        body, missing = history_store.bulk_json(countries, query)
+        if len(missing) == len(set(countries)):
+            return jsonify({'error': 'No data found for the requested countries', 'missing': missing}), 404
+        
+        return Response(body, mimetype='application/json')
+    except Exception as e:
+        return jsonify({'error': 'Failed to retrieve historical data', 'details': str(e)}), 500
+
+
+@app.route('/api/history/all', methods=['GET'])
+def get_history_all():
+    """
+    Every country and field as one pre-built snapshot
     
-    for field in numeric_fields:
-        try:
-            value = float(data[field])
-            
-            # Check for reasonable ranges (-100% to +100%)
-            if not -100 <= value <= 100:
-                return False, f'{field} value {value} is outside reasonable range (-100 to 100)', None
-            
-            validated_data[field] = value
-        except (ValueError, TypeError):
-            return False, f'Invalid {field} value: must be a number', None
+    Served gzip-compressed when the client accepts it, with an ETag so
+    unchanged snapshots are answered with 304 Not Modified.
+    """
+    if history_store is None or not len(history_store):
+        return jsonify({'error': 'Historical data not available'}), 500
     
-    return True, None, validated_data
+    if history_store.snapshot_etag in request.if_none_match:
+        response = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        response = Response(history_store.snapshot_gzip, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(history_store.snapshot, mimetype='application/json')
+    
+    response.set_etag(history_store.snapshot_etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 
 @app.route('/simulate', methods=['POST'])
+@single_flight(flight)
 def simulate_scenario():
     """
     Simulate economic scenario
@@ -204,6 +437,12 @@ def simulate_scenario():
         "Govt_Spend_Growth_Rate": 2.0
     }
     
+    Optional: "include_uncertainty": true and "quantiles": [0.05, 0.95]
+    to add the spread of the individual tree predictions
+    
+    Optional: "mode": "fast" (distilled surrogate) instead of the full
+    forest; uncertainty still comes from the forest
+    
     Returns predicted GDP growth rate for this scenario
     """
     try:
@@ -237,6 +476,15 @@ def simulate_scenario():
                 }
             }), 400
         
+        include_uncertainty, quantiles, error_msg = parse_uncertainty_options(data)
+        if error_msg:
+            return jsonify({'error': 'Invalid input', 'message': error_msg}), 400
+        
+        mode, error_msg = resolve_serving_mode(data)
+        if error_msg:
+            return jsonify({'error': 'Invalid input', 'message': error_msg}), 400
+        mark_stage('validate')
+        
         # Check if model is loaded
         if model is None or encoder is None:
             return jsonify({
@@ -264,11 +512,12 @@ def simulate_scenario():
             validated_data['Consumption_Growth_Rate'],
             validated_data['Govt_Spend_Growth_Rate']
         ]
+        mark_stage('encode')
         
         # Make prediction
-        predicted_gdp = model.predict([features])[0]
+        predicted_gdp = float(predict_scenarios(np.array([features]), mode)[0])
         
-        return jsonify({
+        response = {
             'scenario': {
                 'country': validated_data['Country'],
                 'population_growth': validated_data['Population_Growth_Rate'],
@@ -280,14 +529,26 @@ def simulate_scenario():
             },
             'predicted_gdp_growth': round(predicted_gdp, 2),
             'model_type': 'Scenario Simulator (Concurrent Indicators)',
+            'serving_mode': mode,
             'interpretation': f'If these growth rates occur simultaneously, GDP is predicted to grow by {round(predicted_gdp, 2)}%',
             'note': 'This is a sensitivity analysis tool, not a forecast'
-        })
+        }
+        
+        if include_uncertainty:
+            if tree_distribution is None:
+                return jsonify({
+                    'error': 'Uncertainty unavailable',
+                    'message': f'{type(model).__name__} does not provide per-tree predictions'
+                }), 501
+            summary = tree_distribution.summarize([features], quantiles)
+            response['uncertainty'] = tree_distribution.to_json(summary, quantiles)[0]
+        mark_stage('predict')
+        
+        return jsonify(response)
     
     except Exception as e:
-        # Log full error for debugging
-        print(f"❌ Simulation Error: {e}")
-        print(traceback.format_exc())
+        # Log full error for debugging (off the request thread)
+        log_exception(logger, 'Simulation failed', e, endpoint='/simulate')
         
         return jsonify({
             'error': 'Simulation failed',
@@ -296,7 +557,319 @@ def simulate_scenario():
         }), 500
 
 
+@app.route('/simulate/batch', methods=['POST'])
+def simulate_batch():
+    """
+    Simulate many scenarios in one request
+    
+    Expected JSON body:
+    {
+        "scenarios": [ {same fields as /simulate}, ... ],
+        "include_uncertainty": false,
+        "quantiles": [0.05, 0.5, 0.95],
+        "mode": "model" | "fast"
+    }
+    
+    All scenarios are scored with a single model call; with uncertainty enabled
+    the per-tree statistics come from one (trees x rows) prediction matrix.
+    """
+    try:
+        data = request.get_json()
+        scenarios = data.get('scenarios') if isinstance(data, dict) else None
+        
+        if not isinstance(scenarios, list) or not scenarios:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'scenarios must be a non-empty list of scenario requests'
+            }), 400
+        
+        include_uncertainty, quantiles, error_msg = parse_uncertainty_options(data)
+        if error_msg:
+            return jsonify({'error': 'Invalid input', 'message': error_msg}), 400
+        
+        mode, error_msg = resolve_serving_mode(data)
+        if error_msg:
+            return jsonify({'error': 'Invalid input', 'message': error_msg}), 400
+        
+        # Validate every scenario before doing any work
+        validated_rows = []
+        for i, scenario in enumerate(scenarios):
+            is_valid, error_msg, validated_data = validate_scenario_input(scenario)
+            if not is_valid:
+                return jsonify({
+                    'error': 'Invalid input',
+                    'message': f'Scenario {i}: {error_msg}',
+                    'required_fields': SCENARIO_FIELDS
+                }), 400
+            validated_rows.append(validated_data)
+        mark_stage('validate')
+        
+        if model is None or encoder is None:
+            return jsonify({
+                'error': 'Model not loaded',
+                'message': 'Scenario model is not available. Please train the model first.'
+            }), 500
+        
+        X, unknown = build_feature_matrix(validated_rows, SCENARIO_FIELDS, country_code_map(encoder))
+        if unknown:
+            return jsonify({
+                'error': 'Unknown country',
+                'message': f"Country '{validated_rows[unknown[0]]['Country']}' not found in training data",
+                'available_countries': encoder.classes_.tolist()[:10]
+            }), 400
+        mark_stage('encode')
+        
+        predictions = predict_scenarios(X, mode)
+        results = [
+            {'country': row['Country'], 'predicted_gdp_growth': round(float(prediction), 2)}
+            for row, prediction in zip(validated_rows, predictions)
+        ]
+        
+        if include_uncertainty:
+            if tree_distribution is None:
+                return jsonify({
+                    'error': 'Uncertainty unavailable',
+                    'message': f'{type(model).__name__} does not provide per-tree predictions'
+                }), 501
+            summary = tree_distribution.summarize(X, quantiles)
+            for result, uncertainty in zip(results, tree_distribution.to_json(summary, quantiles)):
+                result['uncertainty'] = uncertainty
+        mark_stage('predict')
+        
+        return jsonify({
+            'results': results,
+            'count': len(results),
+            'model_type': 'Scenario Simulator (Concurrent Indicators)',
+            'serving_mode': mode,
+            'note': 'This is a sensitivity analysis tool, not a forecast'
+        })
+    
+    except Exception as e:
+        log_exception(logger, 'Batch simulation failed', e, endpoint='/simulate/batch')
+        
+        return jsonify({
+            'error': 'Simulation failed',
+            'message': 'An unexpected error occurred during batch simulation',
+            'details': str(e)
+        }), 500
+
+
+@app.route('/simulate/compare', methods=['POST'])
+@single_flight(flight)
+def simulate_compare():
+    """
+    Apply several named scenarios to several countries
+    
+    Expected JSON body:
+    {
+        "scenarios": [
+            {"name": "Export boom", "Population_Growth_Rate": 1.0, ...},
+            ...
+        ],
+        "countries": ["United States", "India"] or "all",
+        "mode": "model" | "fast"
+    }
+    
+    Scenarios carry the growth rates of /simulate without a Country. The
+    (scenarios x countries) feature matrix is built by broadcasting and scored
+    in one model call together with each country's baseline (its historical
+    average rates from /api/baseline). Matrices are indexed [scenario][country].
+    """
+    try:
+        data = request.get_json()
+        scenarios = data.get('scenarios') if isinstance(data, dict) else None
+        countries = data.get('countries') if isinstance(data, dict) else None
+        
+        if not isinstance(scenarios, list) or not scenarios:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'scenarios must be a non-empty list of named scenarios'
+            }), 400
+        
+        if len(scenarios) > SCENARIO_COMPARE_MAX_SCENARIOS:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': f'At most {SCENARIO_COMPARE_MAX_SCENARIOS} scenarios per comparison'
+            }), 400
+        
+        if countries != 'all' and (not isinstance(countries, list) or not countries):
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'countries must be a non-empty list of country names or "all"'
+            }), 400
+        
+        mode, error_msg = resolve_serving_mode(data)
+        if error_msg:
+            return jsonify({'error': 'Invalid input', 'message': error_msg}), 400
+        
+        names, rates = [], []
+        for i, scenario in enumerate(scenarios):
+            is_valid, error_msg, validated_rates = validate_scenario_rates(scenario)
+            if not is_valid:
+                return jsonify({
+                    'error': 'Invalid input',
+                    'message': f'Scenario {i}: {error_msg}',
+                    'required_fields': SCENARIO_FIELDS[1:]
+                }), 400
+            names.append(str(scenario.get('name', f'Scenario {i + 1}')))
+            rates.append([validated_rates[field] for field in SCENARIO_FIELDS[1:]])
+        
+        if len(set(names)) != len(names):
+            return jsonify({'error': 'Invalid input', 'message': 'Scenario names must be unique'}), 400
+        mark_stage('validate')
+        
+        if model is None or encoder is None:
+            return jsonify({
+                'error': 'Model not loaded',
+                'message': 'Scenario model is not available. Please train the model first.'
+            }), 500
+        
+        if not baseline_rows:
+            return jsonify({
+                'error': 'Baseline unavailable',
+                'message': 'Historical baseline rates are not loaded'
+            }), 500
+        
+        if countries == 'all':
+            countries = list(baseline_rows)
+        else:
+            countries = list(dict.fromkeys(str(country).strip() for country in countries))
+            unknown = [country for country in countries if country not in baseline_rows]
+            if unknown:
+                return jsonify({
+                    'error': 'Unknown country',
+                    'message': f"Country '{unknown[0]}' not found in training data or has no baseline rates",
+                    'available_countries': list(baseline_rows)[:10]
+                }), 400
+        
+        # (scenarios, countries, features): country codes along one axis, rates along the other
+        baseline_X = baseline_features[[baseline_rows[country] for country in countries]]
+        n_scenarios, n_countries = len(rates), len(countries)
+        X = np.empty((n_scenarios, n_countries, baseline_X.shape[1]))
+        X[:, :, 0] = baseline_X[:, 0]
+        X[:, :, 1:] = np.asarray(rates)[:, None, :]
+        mark_stage('encode')
+        
+        predictions = predict_scenarios(np.vstack([X.reshape(-1, X.shape[2]), baseline_X]), mode)
+        scenario_predictions = predictions[:-n_countries].reshape(n_scenarios, n_countries)
+        baseline_predictions = predictions[-n_countries:]
+        mark_stage('predict')
+        
+        return jsonify({
+            'scenarios': names,
+            'countries': countries,
+            'baseline_gdp_growth': np.round(baseline_predictions, 2).tolist(),
+            'predicted_gdp_growth': np.round(scenario_predictions, 2).tolist(),
+            'delta_vs_baseline': np.round(scenario_predictions - baseline_predictions, 2).tolist(),
+            'model_type': 'Scenario Simulator (Concurrent Indicators)',
+            'serving_mode': mode,
+            'note': 'Rows are scenarios, columns are countries; baselines use historical average rates'
+        })
+    
+    except Exception as e:
+        log_exception(logger, 'Scenario comparison failed', e, endpoint='/simulate/compare')
+        
+        return jsonify({
+            'error': 'Simulation failed',
+            'message': 'An unexpected error occurred during scenario comparison',
+            'details': str(e)
+        }), 500
+
+
+@app.route('/explain', methods=['POST'])
+def explain_scenario():
+    """
+    Explain why a scenario produced its predicted GDP growth
+    
+    Accepts the same body as /simulate, or {"scenarios": [...]} to explain
+    several scenarios at once (e.g. a whole dashboard).
+    
+    Returns per-feature contributions that add up to the prediction:
+    predicted_gdp_growth = base_value + sum(contributions)
+    """
+    try:
+        data = request.get_json()
+        
+        if model is None or encoder is None:
+            return jsonify({
+                'error': 'Model not loaded',
+                'message': 'Scenario model is not available. Please train the model first.'
+            }), 500
+        
+        if explainer is None:
+            return jsonify({
+                'error': 'Explanations unavailable',
+                'message': f'{type(model).__name__} does not support per-feature explanations'
+            }), 501
+        
+        is_batch = isinstance(data, dict) and 'scenarios' in data
+        scenarios = data['scenarios'] if is_batch else [data]
+        
+        if not isinstance(scenarios, list) or not scenarios:
+            return jsonify({
+                'error': 'Invalid input',
+                'message': 'scenarios must be a non-empty list'
+            }), 400
+        
+        # Validate every scenario before doing any work
+        validated_rows = []
+        for i, scenario in enumerate(scenarios):
+            is_valid, error_msg, validated_data = validate_scenario_input(scenario)
+            if not is_valid:
+                return jsonify({
+                    'error': 'Invalid input',
+                    'message': f'Scenario {i}: {error_msg}' if is_batch else error_msg,
+                    'required_fields': SCENARIO_FIELDS
+                }), 400
+            validated_rows.append(validated_data)
+        mark_stage('validate')
+        
+        X, unknown = build_feature_matrix(validated_rows, SCENARIO_FIELDS, country_code_map(encoder))
+        if unknown:
+            return jsonify({
+                'error': 'Unknown country',
+                'message': f"Country '{validated_rows[unknown[0]]['Country']}' not found in training data",
+                'available_countries': encoder.classes_.tolist()[:10]
+            }), 400
+        mark_stage('encode')
+        
+        contributions = explainer.explain(X)
+        predictions = explainer.base_value + contributions.sum(axis=1)
+        mark_stage('predict')
+        
+        explanations = [
+            {
+                'country': row['Country'],
+                'predicted_gdp_growth': round(float(prediction), 2),
+                'base_value': round(explainer.base_value, 4),
+                'contributions': {
+                    name: round(float(value), 4)
+                    for name, value in zip(CONTRIBUTION_NAMES, contribution)
+                }
+            }
+            for row, prediction, contribution in zip(validated_rows, predictions, contributions)
+        ]
+        
+        if not is_batch:
+            return jsonify(explanations[0])
+        
+        return jsonify({
+            'explanations': explanations,
+            'note': 'Contributions are decision-path attributions averaged over all trees'
+        })
+    
+    except Exception as e:
+        log_exception(logger, 'Explanation failed', e, endpoint='/explain')
+        
+        return jsonify({
+            'error': 'Explanation failed',
+            'message': 'An unexpected error occurred while explaining the scenario',
+            'details': str(e)
+        }), 500
+
+
 @app.route('/api/baseline', methods=['GET'])
+@single_flight(flight)
 def get_baseline():
     """
     Get baseline (average) growth rates for a country
@@ -308,24 +881,15 @@ def get_baseline():
         if not country:
             return jsonify({'error': 'Missing required parameter: country'}), 400
         
-        # Load full dataset
-        df = pd.read_csv(DATASET_PATH)
-        country_data = df[df['Country'] == country]
+        # Averages precomputed at startup
+        rates = baseline_table.get(country)
         
-        if country_data.empty:
+        if rates is None:
             return jsonify({'error': f'No data found for country: {country}'}), 404
         
-        # Calculate average growth rates
         baseline = {
             'country': country,
-            'baseline_rates': {
-                'population': round(country_data['Population_Growth_Rate'].mean(), 2),
-                'exports': round(country_data['Exports of goods and services_Growth_Rate'].mean(), 2),
-                'imports': round(country_data['Imports of goods and services_Growth_Rate'].mean(), 2),
-                'investment': round(country_data['Gross capital formation_Growth_Rate'].mean(), 2),
-                'consumption': round(country_data['Final consumption expenditure_Growth_Rate'].mean(), 2),
-                'govt_spend': round(country_data['Government_Expenditure_Growth_Rate'].mean(), 2)
-            },
+            'baseline_rates': rates,
             'note': 'These are historical averages. Use as baseline for scenario simulations.'
         }
         
@@ -335,6 +899,50 @@ def get_baseline():
         return jsonify({'error': 'Failed to calculate baseline', 'details': str(e)}), 500
 
 
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    """Liveness: the process is up and serving"""
+    return jsonify({'status': 'alive', 'uptime_seconds': round(readiness.uptime(), 1)})
+
+
+@app.route('/readyz', methods=['GET'])
+def readyz():
+    """Readiness: models loaded and warm-up finished, so requests are fast"""
+    if not readiness.ready:
+        response = jsonify({'status': 'warming_up'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
+    
+    return jsonify({
+        'status': 'ready',
+        'model_loaded': model is not None,
+        'warm_up': readiness.report
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Admission control counters per endpoint class and single-flight deduplication"""
+    return jsonify({
+        'admission': admission.stats(),
+        'single_flight': flight.stats(),
+        'logging': {'dropped_records': dropped_records(LOGGER_NAME)}
+    })
+
+
+@app.route('/debug/slow', methods=['GET'])
+def debug_slow():
+    """Slowest recent requests with per-stage timings (requires X-Admin-Token)"""
+    if not is_admin_request():
+        return jsonify({
+            'error': 'Endpoint not found',
+            'message': 'The requested endpoint does not exist'
+        }), 404
+    
+    return jsonify(slow_log.report())
+
+
 @app.errorhandler(404)
 def not_found(e):
     """Handle 404 errors"""
@@ -342,7 +950,9 @@ def not_found(e):
         'error': 'Endpoint not found',
         'message': 'The requested endpoint does not exist',
         'available_endpoints': [
-            '/', '/api/countries', '/api/history', '/simulate', '/api/baseline'
+            '/', '/api/countries', '/api/history', '/api/history/bulk', '/api/history/all',
+            '/simulate', '/simulate/batch', '/simulate/compare', '/explain', '/api/baseline', '/metrics',
+            '/healthz', '/readyz'
         ]
     }), 404
 
@@ -356,6 +966,10 @@ def internal_error(e):
     }), 500
 
 
+# Warm every route in the background; /readyz reports when it is done
+start_warm_up(app, warm_up_requests(), readiness)
+
+
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 5000))
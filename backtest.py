@@ -0,0 +1,223 @@
+"""
+Walk-Forward Backtesting for the GDP models
+Evaluates every cutoff year in a range instead of a single split at 2019
+
+For each cutoff year C the model is trained on all years < C and tested on
+years C .. C + horizon - 1. Errors are reported by test year and by country.
+
+- Rows are sorted by year once, so each cutoff's training set is a prefix and
+  its test set a contiguous slice of the same memory-mapped array (no copies)
+- With --incremental, each block of --chain-length consecutive cutoffs shares
+  one forest: warm_start adds --trees-per-step new trees fitted on the
+  extended history instead of refitting all trees from scratch. Blocks are
+  fixed by the cutoff range alone, so results do not depend on --workers or
+  --memory-budget-mb; each fit records the cutoff its chain started at
+- Cutoffs (or chains) run in parallel, with the worker count capped by
+  --memory-budget-mb
+
+Usage:
+    python backtest.py --start 2005 --end 2021
+    python backtest.py --model scenario --incremental --trees-per-step 20 --chain-length 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from config import MODEL_PARAMS, SCENARIO_MODEL_PARAMS
+from hyperparam_search import load_matrices
+
+# Per-worker memory-mapped data, populated once by _init_worker
+_shared = {}
+
+# Approximate in-memory bytes per tree node (node struct + value)
+NODE_BYTES = 72
+
+
+def _init_worker(data_dir):
+    _shared['X'] = np.load(os.path.join(data_dir, 'X.npy'), mmap_mode='r')
+    _shared['y'] = np.load(os.path.join(data_dir, 'y.npy'), mmap_mode='r')
+
+
+def estimate_worker_bytes(n_rows, X_nbytes, params):
+    """
+    Rough peak memory of one worker fitting one forest
+
+    Node count per tree is bounded by both the depth limit and the leaf size;
+    fitting also needs a few working copies of the (bootstrapped) features.
+    """
+    max_depth = params.get('max_depth') or 64
+    min_leaf = params.get('min_samples_leaf', 1)
+    nodes_per_tree = min(2 ** (max_depth + 1), 2 * n_rows // max(min_leaf, 1) + 1)
+    forest_bytes = params.get('n_estimators', 100) * nodes_per_tree * NODE_BYTES
+    return forest_bytes + 4 * X_nbytes
+
+
+def run_chain(chain, params, incremental, trees_per_step):
+    """
+    Backtest a run of consecutive cutoffs in one worker
+
+    Args:
+        chain: list of (cutoff, train_end, test_end) row offsets
+    Returns:
+        list of (cutoff, chain_start, test_start, predictions, fit_seconds, n_trees)
+    """
+    X, y = _shared['X'], _shared['y']
+    results = []
+    model = None
+
+    for cutoff, train_end, test_end in chain:
+        if incremental and model is not None:
+            # Keep the trees already grown and add new ones on the longer history
+            model.n_estimators += trees_per_step
+        else:
+            model = RandomForestRegressor(**{**params, 'n_jobs': 1, 'warm_start': incremental})
+
+        start = time.perf_counter()
+        model.fit(X[:train_end], y[:train_end])
+        fit_seconds = time.perf_counter() - start
+
+        predictions = model.predict(X[train_end:test_end])
+        results.append((cutoff, chain[0][0], train_end, predictions, fit_seconds,
+                        len(model.estimators_)))
+
+    return results
+
+
+def split_chains(folds, chain_length):
+    """Split folds into contiguous runs of chain_length cutoffs (the last may be shorter)"""
+    size = max(1, chain_length)
+    return [folds[i:i + size] for i in range(0, len(folds), size)]
+
+
+def summarize(frame, by):
+    """RMSE, MAE, R² and sample count per group"""
+    def metrics(group):
+        return pd.Series({
+            'n': len(group),
+            'rmse': np.sqrt(mean_squared_error(group['actual'], group['predicted'])),
+            'mae': mean_absolute_error(group['actual'], group['predicted']),
+            'r2': r2_score(group['actual'], group['predicted']) if len(group) > 1 else np.nan
+        })
+    return frame.groupby(by).apply(metrics).reset_index()
+
+
+def run_backtest(kind, start_year, end_year, horizon=1, incremental=False,
+                 trees_per_step=20, workers=None, memory_budget_mb=None, chain_length=5):
+    X, y, years, countries = load_matrices(kind)
+    params = dict(MODEL_PARAMS if kind == 'lagged' else SCENARIO_MODEL_PARAMS)
+
+    folds = []
+    for cutoff in range(start_year, end_year + 1):
+        train_end = int(np.searchsorted(years, cutoff, side='left'))
+        test_end = int(np.searchsorted(years, cutoff + horizon, side='left'))
+        if train_end > 0 and test_end > train_end:
+            folds.append((cutoff, train_end, test_end))
+    if not folds:
+        raise ValueError(f"No usable cutoffs between {start_year} and {end_year}")
+
+    # Worker count limited by the memory budget (data is shared, models are not)
+    workers = workers or os.cpu_count() or 1
+    if memory_budget_mb:
+        per_worker = estimate_worker_bytes(len(X), X.nbytes, params)
+        available = memory_budget_mb * 1e6 - X.nbytes - y.nbytes
+        workers = max(1, min(workers, int(available // per_worker)))
+        print(f"   ~{per_worker / 1e6:.0f}MB per worker -> {workers} worker(s) "
+              f"within {memory_budget_mb}MB")
+
+    if incremental:
+        # Each chain starts at the configured forest size and grows step by step;
+        # the layout depends only on the cutoffs, never on the worker count
+        chains = split_chains(folds, chain_length)
+    else:
+        chains = [[fold] for fold in folds]
+
+    mode = f"incremental, {len(chains)} chain(s) of up to {chain_length}" if incremental else 'full refit'
+    print(f"\n🔁 {len(folds)} cutoffs ({folds[0][0]}-{folds[-1][0]}), horizon {horizon}y, "
+          f"{mode}, {workers} worker(s)")
+
+    rows = []
+    fit_log = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        np.save(os.path.join(data_dir, 'X.npy'), X)
+        np.save(os.path.join(data_dir, 'y.npy'), y)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(data_dir,)) as pool:
+            futures = [pool.submit(run_chain, chain, params, incremental, trees_per_step)
+                       for chain in chains]
+            for future in futures:
+                for cutoff, chain_start, test_start, predictions, fit_seconds, n_trees in future.result():
+                    test_end = test_start + len(predictions)
+                    rows.append(pd.DataFrame({
+                        'cutoff': cutoff,
+                        'year': years[test_start:test_end],
+                        'country': countries[test_start:test_end],
+                        'actual': y[test_start:test_end],
+                        'predicted': predictions
+                    }))
+                    fit_log.append({'cutoff': cutoff, 'chain_start': chain_start,
+                                    'fit_seconds': fit_seconds, 'n_trees': n_trees})
+                    print(f"   ✅ cutoff {cutoff}: {len(predictions)} test rows, "
+                          f"{n_trees} trees, fit {fit_seconds:.2f}s")
+
+    predictions = pd.concat(rows, ignore_index=True)
+    return predictions, pd.DataFrame(fit_log).sort_values('cutoff')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of the GDP models')
+    parser.add_argument('--model', choices=['lagged', 'scenario'], default='lagged')
+    parser.add_argument('--start', type=int, default=2000, help='First cutoff year')
+    parser.add_argument('--end', type=int, default=2021, help='Last cutoff year')
+    parser.add_argument('--horizon', type=int, default=1, help='Test years after each cutoff')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Grow one forest per chain of cutoffs with warm_start')
+    parser.add_argument('--trees-per-step', type=int, default=20,
+                        help='Trees added per cutoff in incremental mode')
+    parser.add_argument('--chain-length', type=int, default=5,
+                        help='Consecutive cutoffs sharing one forest in incremental mode')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--memory-budget-mb', type=float, default=None,
+                        help='Cap parallel workers to fit this memory budget')
+    parser.add_argument('--output-prefix', default='backtest')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"WALK-FORWARD BACKTEST - {args.model.upper()} MODEL")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    predictions, fit_log = run_backtest(
+        args.model, args.start, args.end, args.horizon, args.incremental,
+        args.trees_per_step, args.workers, args.memory_budget_mb, args.chain_length
+    )
+
+    by_year = summarize(predictions, 'year')
+    by_country = summarize(predictions, 'country').sort_values('rmse', ascending=False)
+
+    print("\n📈 Error by year:")
+    print(by_year.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    print("\n🌍 Countries with the largest errors:")
+    print(by_country.head(10).to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+
+    predictions.to_csv(f"{args.output_prefix}_predictions.csv", index=False)
+    by_year.to_csv(f"{args.output_prefix}_by_year.csv", index=False)
+    by_country.to_csv(f"{args.output_prefix}_by_country.csv", index=False)
+    fit_log.to_csv(f"{args.output_prefix}_fits.csv", index=False)
+
+    print(f"\n💾 Saved {args.output_prefix}_by_year.csv, {args.output_prefix}_by_country.csv, "
+          f"{args.output_prefix}_predictions.csv, {args.output_prefix}_fits.csv")
+    print(f"⏱️ Total fit time {fit_log['fit_seconds'].sum():.1f}s, "
+          f"wall time {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
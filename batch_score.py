@@ -0,0 +1,218 @@
+"""
+Offline Batch Scorer for the GDP models
+Applies gdp_model.pkl (lagged) or gdp_scenario_model.pkl (scenario) to large
+input files without going through the HTTP API
+
+- Reads the input CSV in chunks (constant memory)
+- Scores chunks on a process pool, model loaded once per worker
+- Uses the same validation and country encoding as the APIs (validation.py),
+  so offline and online results match exactly
+- Writes columnar output (Parquet when pyarrow is available, else CSV)
+
+Usage:
+    python batch_score.py --model scenario --input scenarios.csv --output scores.parquet
+    python batch_score.py --model lagged --input inputs.csv --output scores.csv --workers 4
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from config import (
+    MODEL_PATH, ENCODER_PATH,
+    SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH
+)
+from validation import (
+    PREDICTION_FIELDS, SCENARIO_FIELDS,
+    validate_prediction_input, validate_scenario_input,
+    country_code_map, build_feature_matrix
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+
+# Model kind -> (model path, encoder path, request fields, validator)
+MODEL_KINDS = {
+    'lagged': (MODEL_PATH, ENCODER_PATH, PREDICTION_FIELDS, validate_prediction_input),
+    'scenario': (SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH, SCENARIO_FIELDS, validate_scenario_input)
+}
+
+# Per-worker state, populated once by _init_worker
+_worker = {}
+
+
+def _init_worker(kind):
+    """Load model and encoder once per worker process"""
+    model_path, encoder_path, fields, validator = MODEL_KINDS[kind]
+    model = joblib.load(model_path)
+    # Batch scoring is already parallel across processes
+    if hasattr(model, 'n_jobs'):
+        model.n_jobs = 1
+    _worker['model'] = model
+    _worker['code_map'] = country_code_map(joblib.load(encoder_path))
+    _worker['fields'] = fields
+    _worker['validator'] = validator
+
+
+def score_chunk(chunk):
+    """
+    Validate, encode and score one chunk of input rows
+
+    Returns a DataFrame with one output row per input row, in input order.
+    Invalid rows get a NaN prediction and the same error message the API returns.
+    """
+    model = _worker['model']
+    fields = _worker['fields']
+    validator = _worker['validator']
+
+    records = chunk.to_dict(orient='records')
+    errors = [None] * len(records)
+    countries = [None] * len(records)
+    valid_rows = []
+    valid_positions = []
+
+    for i, record in enumerate(records):
+        # CSV blanks arrive as NaN; the API would see them as missing keys
+        record = {k: v for k, v in record.items() if not (isinstance(v, float) and np.isnan(v))}
+        is_valid, error_msg, validated_data = validator(record)
+        if not is_valid:
+            errors[i] = error_msg
+            continue
+        countries[i] = validated_data['Country']
+        valid_rows.append(validated_data)
+        valid_positions.append(i)
+
+    predictions = np.full(len(records), np.nan)
+
+    if valid_rows:
+        X, unknown = build_feature_matrix(valid_rows, fields, _worker['code_map'])
+        for j in unknown:
+            errors[valid_positions[j]] = f"Country '{valid_rows[j]['Country']}' not found in training data"
+
+        known = np.ones(len(valid_rows), dtype=bool)
+        known[unknown] = False
+        if known.any():
+            positions = np.asarray(valid_positions)[known]
+            predictions[positions] = model.predict(X[known])
+
+    return pd.DataFrame({
+        'row_id': chunk.index.to_numpy(),
+        'Country': countries,
+        'prediction': np.round(predictions, 2),
+        'error': errors
+    })
+
+
+class ColumnarWriter:
+    """Append scored chunks to Parquet (pyarrow) or CSV"""
+
+    def __init__(self, path):
+        self.path = path
+        self.use_parquet = path.endswith('.parquet')
+        if self.use_parquet and pq is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self._writer = None
+        self._header_written = False
+
+    def write(self, df):
+        if self.use_parquet:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='a' if self._header_written else 'w',
+                      header=not self._header_written, index=False)
+            self._header_written = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run(kind, input_path, output_path, chunksize=50000, workers=None):
+    """
+    Score input_path in chunks across a process pool
+
+    Returns:
+        dict with row counts, elapsed time and rows per second
+    """
+    workers = workers or os.cpu_count() or 1
+    reader = pd.read_csv(input_path, chunksize=chunksize)
+    writer = ColumnarWriter(output_path)
+
+    total_rows = 0
+    failed_rows = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(kind,)) as pool:
+        # Keep a bounded number of chunks in flight so memory stays flat
+        # and results are written back in input order
+        pending = deque()
+
+        def drain_one():
+            nonlocal total_rows, failed_rows
+            result = pending.popleft().result()
+            writer.write(result)
+            total_rows += len(result)
+            failed_rows += int(result['error'].notna().sum())
+            elapsed = time.perf_counter() - start
+            print(f"   Scored {total_rows} rows ({total_rows / elapsed:,.0f} rows/s)")
+
+        for chunk in reader:
+            pending.append(pool.submit(score_chunk, chunk))
+            if len(pending) >= workers * 2:
+                drain_one()
+
+        while pending:
+            drain_one()
+
+    writer.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'rows': total_rows,
+        'failed_rows': failed_rows,
+        'seconds': elapsed,
+        'rows_per_second': total_rows / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline batch scoring for the GDP models')
+    parser.add_argument('--model', choices=sorted(MODEL_KINDS), default='scenario',
+                        help='Which model to apply (default: scenario)')
+    parser.add_argument('--input', required=True, help='Input CSV with the API request fields as columns')
+    parser.add_argument('--output', required=True, help='Output file (.parquet or .csv)')
+    parser.add_argument('--chunksize', type=int, default=50000, help='Rows per chunk (default: 50000)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GDP MODEL - OFFLINE BATCH SCORING")
+    print("=" * 60)
+    print(f"\n📂 Input: {args.input}")
+    print(f"🤖 Model: {MODEL_KINDS[args.model][0]}")
+    print(f"   Required columns: {', '.join(MODEL_KINDS[args.model][2])}")
+
+    stats = run(args.model, args.input, args.output, args.chunksize, args.workers)
+
+    print(f"\n💾 Output written to: {args.output}")
+    print(f"   Rows scored: {stats['rows']} ({stats['failed_rows']} rejected by validation)")
+    print(f"   Elapsed: {stats['seconds']:.2f}s")
+    print(f"   Throughput: {stats['rows_per_second']:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
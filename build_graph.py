@@ -0,0 +1,362 @@
+"""
+Content-Hashed Build Graph for derived training artifacts
+
+Every derived artifact (lagged feature table, encoded matrices, split indices,
+baseline table, trained models) is a stage in a small dependency graph.
+A stage's cache key is the hash of:
+- the content of its input files
+- its parameters
+- the source code of its build function and of the modules it calls into
+  (e.g. feature_engine, train_model) plus the project modules those import
+  (config, estimators, ...), so editing a callee or a constant makes it stale
+- the keys of the stages it depends on
+
+Stages whose key already exists in the cache are loaded instead of rebuilt,
+and a cached stage never needs its dependencies loaded at all, so repeat runs
+are near-instant and only stale stages rebuild after a change.
+Given a StageProfiler, every stage that is built or loaded is timed as its
+own profiler stage, flagged cached or rebuilt.
+
+train_model.py, train_scenario_model.py, evaluate_80_20_split.py and
+retrain_model.py get their matrices, encoders and models from this graph.
+
+Usage:
+    python build_graph.py                    # build all targets
+    python build_graph.py lagged_model       # build one target (and what it needs)
+    python build_graph.py --status           # show which stages are fresh / stale
+    python build_graph.py --install          # also write models to the config.py paths
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import time
+from contextlib import nullcontext
+
+import joblib
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from config import (
+    DATASET_PATH, MODEL_PATH, ENCODER_PATH,
+    SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH,
+    TEMPORAL_SPLIT_YEAR, MODEL_ESTIMATOR, SCENARIO_MODEL_ESTIMATOR,
+    ARTIFACT_CACHE_DIR
+)
+from estimators import ESTIMATORS, LAGGED_PARAMS, SCENARIO_PARAMS
+from hashing import file_digest
+
+
+class Stage:
+    """One node of the build graph"""
+
+    def __init__(self, name, func, deps=(), files=None, params=None, modules=()):
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.files = dict(files or {})
+        self.params = dict(params or {})
+        self.modules = sorted(modules)
+
+
+class BuildGraph:
+    """
+    Dependency graph of cached, content-addressed artifacts
+
+    A stage function is called as func(*dep_values, **files, **params),
+    where files maps keyword -> path and params are JSON-serializable.
+    modules names the modules the function calls into; their source files,
+    and those of the modules they import from the same directory, are part
+    of the key. They are given by name and located without being imported,
+    so the training scripts can import this module.
+    """
+
+    def __init__(self, cache_dir=ARTIFACT_CACHE_DIR, profiler=None):
+        self.cache_dir = cache_dir
+        self.profiler = profiler
+        self.stages = {}
+        self._keys = {}
+        self._values = {}
+        self._file_digests = {}
+        self._module_files = {}
+
+    def add(self, name, func, deps=(), files=None, params=None, modules=()):
+        for dep in deps:
+            if dep not in self.stages:
+                raise KeyError(f"Stage '{name}' depends on unknown stage '{dep}'")
+        self.stages[name] = Stage(name, func, deps, files, params, modules)
+
+    def _file_digest(self, path):
+        # Hash each input file once per run
+        if path not in self._file_digests:
+            self._file_digests[path] = file_digest(path)
+        return self._file_digests[path]
+
+    def _module_file(self, module_name):
+        if module_name not in self._module_files:
+            spec = importlib.util.find_spec(module_name)
+            if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+                raise ImportError(f"Cannot locate the source of module '{module_name}'")
+            self._module_files[module_name] = spec.origin
+        return self._module_files[module_name]
+
+    def _module_digests(self, module_names):
+        """Digests of the given modules and, transitively, of the modules they
+        import from their own directory (stdlib and site-packages are skipped)"""
+        digests = {}
+        pending = list(module_names)
+        while pending:
+            name = pending.pop()
+            if name in digests:
+                continue
+            path = self._module_file(name)
+            digests[name] = self._file_digest(path)
+            with open(path, 'rb') as f:
+                tree = ast.parse(f.read(), filename=path)
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    imported = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                    imported = [node.module]
+                else:
+                    continue
+                for full_name in imported:
+                    top = full_name.split('.')[0]
+                    if top in digests:
+                        continue
+                    try:
+                        spec = importlib.util.find_spec(top)
+                    except (ImportError, ValueError):
+                        continue
+                    if (spec is not None and spec.origin and os.path.isfile(spec.origin)
+                            and os.path.dirname(spec.origin) == os.path.dirname(path)):
+                        self._module_files.setdefault(top, spec.origin)
+                        pending.append(top)
+        return digests
+
+    def key(self, name):
+        """Cache key of a stage (recursive over its dependencies)"""
+        if name not in self._keys:
+            stage = self.stages[name]
+            try:
+                code = inspect.getsource(stage.func)
+            except (OSError, TypeError):
+                code = stage.func.__qualname__
+            payload = {
+                'name': name,
+                'code': hashlib.sha256(code.encode()).hexdigest(),
+                'params': stage.params,
+                'files': {k: self._file_digest(p) for k, p in sorted(stage.files.items())},
+                'modules': self._module_digests(stage.modules),
+                'deps': [self.key(dep) for dep in stage.deps]
+            }
+            blob = json.dumps(payload, sort_keys=True, default=str).encode()
+            self._keys[name] = hashlib.sha256(blob).hexdigest()
+        return self._keys[name]
+
+    def path(self, name):
+        return os.path.join(self.cache_dir, f"{name}-{self.key(name)[:16]}.joblib")
+
+    def is_fresh(self, name):
+        return os.path.exists(self.path(name))
+
+    def _timed(self, name, cached):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(name, cached=cached)
+
+    def build(self, name, force=False):
+        """Return the value of a stage, rebuilding only if its key is not cached"""
+        if name in self._values and not force:
+            return self._values[name]
+
+        path = self.path(name)
+        if os.path.exists(path) and not force:
+            start = time.perf_counter()
+            with self._timed(name, cached=True):
+                value = joblib.load(path)
+            print(f"   ✅ {name}: cached ({time.perf_counter() - start:.2f}s to load)")
+        else:
+            stage = self.stages[name]
+            dep_values = [self.build(dep) for dep in stage.deps]
+            start = time.perf_counter()
+            with self._timed(name, cached=False):
+                value = stage.func(*dep_values, **stage.files, **stage.params)
+
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = path + '.tmp'
+                joblib.dump(value, tmp_path)
+                os.replace(tmp_path, path)
+            print(f"   🔨 {name}: rebuilt in {time.perf_counter() - start:.2f}s")
+
+        self._values[name] = value
+        return value
+
+    def status(self):
+        """(name, key prefix, fresh) for every stage in declaration order"""
+        return [(name, self.key(name)[:16], self.is_fresh(name)) for name in self.stages]
+
+
+# ========================================
+# Stage functions
+# ========================================
+
+def row_keys(df, X):
+    """(Country, Year) of the rows of df that ended up in the feature matrix X"""
+    return df.loc[X.index, ['Country', 'Year']].values.tolist()
+
+
+def load_dataset(dataset_path):
+    return pd.read_csv(dataset_path)
+
+
+def lagged_feature_table(df):
+    from feature_engine import create_lagged_features
+    return create_lagged_features(df)
+
+
+def temporal_split_indices(lagged, split_year):
+    from train_model import temporal_train_test_split
+    train_df, test_df = temporal_train_test_split(lagged.reset_index(drop=True), split_year)
+    return {
+        'train': train_df.index.to_numpy(),
+        'test': test_df.index.to_numpy()
+    }
+
+
+def lagged_matrices(lagged, split):
+    from train_model import prepare_features
+    train_df = lagged.iloc[split['train']].copy()
+    test_df = lagged.iloc[split['test']].copy()
+    X_train, y_train, encoder = prepare_features(train_df, fit_encoder=True)
+    X_test, y_test, _ = prepare_features(test_df, encoder=encoder, fit_encoder=False)
+    return {
+        'X_train': X_train, 'y_train': y_train,
+        'X_test': X_test, 'y_test': y_test,
+        'encoder': encoder, 'train_keys': row_keys(train_df, X_train)
+    }
+
+
+def random_split_matrices(lagged, test_size, random_state):
+    """Lagged features with a shuffled split instead of the temporal one (evaluate_80_20_split.py)"""
+    from train_model import prepare_features
+    X, y, encoder = prepare_features(lagged.copy(), fit_encoder=True)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, shuffle=True
+    )
+    return {
+        'X_train': X_train, 'y_train': y_train,
+        'X_test': X_test, 'y_test': y_test,
+        'encoder': encoder, 'train_keys': row_keys(lagged, X_train)
+    }
+
+
+def scenario_matrices(df, test_size, random_state):
+    from train_scenario_model import prepare_features
+    X, y, encoder, feature_columns = prepare_features(df.copy(), fit_encoder=True)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, shuffle=True
+    )
+    return {
+        'X_train': X_train, 'y_train': y_train,
+        'X_test': X_test, 'y_test': y_test,
+        'encoder': encoder, 'feature_columns': feature_columns,
+        'train_keys': row_keys(df, X_train)
+    }
+
+
+def baseline_table(df):
+    """Per-country historical averages (same numbers as /api/baseline)"""
+    columns = {
+        'Population_Growth_Rate': 'population',
+        'Exports of goods and services_Growth_Rate': 'exports',
+        'Imports of goods and services_Growth_Rate': 'imports',
+        'Gross capital formation_Growth_Rate': 'investment',
+        'Final consumption expenditure_Growth_Rate': 'consumption',
+        'Government_Expenditure_Growth_Rate': 'govt_spend'
+    }
+    return df.groupby('Country')[list(columns)].mean().rename(columns=columns)
+
+
+def train_estimator(matrices, estimator, model_params):
+    model = ESTIMATORS[estimator](**model_params)
+    model.fit(matrices['X_train'], matrices['y_train'])
+    if 'train_keys' in matrices:
+        # Rows the model has seen, read by incremental_update.py
+        model.trained_keys_ = matrices['train_keys']
+    return model
+
+
+def default_graph(cache_dir=ARTIFACT_CACHE_DIR, profiler=None):
+    """The training artifact graph shared by the training and evaluation scripts"""
+    graph = BuildGraph(cache_dir, profiler=profiler)
+    graph.add('dataset', load_dataset, files={'dataset_path': DATASET_PATH})
+    graph.add('lagged_features', lagged_feature_table, deps=['dataset'],
+              modules=['feature_engine'])
+    graph.add('temporal_split', temporal_split_indices, deps=['lagged_features'],
+              params={'split_year': TEMPORAL_SPLIT_YEAR}, modules=['train_model'])
+    graph.add('lagged_matrices', lagged_matrices, deps=['lagged_features', 'temporal_split'],
+              modules=['train_model'])
+    graph.add('lagged_random_split_matrices', random_split_matrices, deps=['lagged_features'],
+              params={'test_size': 0.2, 'random_state': 42}, modules=['train_model'])
+    graph.add('scenario_matrices', scenario_matrices, deps=['dataset'],
+              params={'test_size': 0.2, 'random_state': 42}, modules=['train_scenario_model'])
+    graph.add('baseline_table', baseline_table, deps=['dataset'])
+    lagged_model = {'estimator': MODEL_ESTIMATOR, 'model_params': LAGGED_PARAMS[MODEL_ESTIMATOR]}
+    graph.add('lagged_model', train_estimator, deps=['lagged_matrices'],
+              params=lagged_model, modules=['estimators'])
+    graph.add('lagged_random_split_model', train_estimator, deps=['lagged_random_split_matrices'],
+              params=lagged_model, modules=['estimators'])
+    graph.add('scenario_model', train_estimator, deps=['scenario_matrices'],
+              params={'estimator': SCENARIO_MODEL_ESTIMATOR,
+                      'model_params': SCENARIO_PARAMS[SCENARIO_MODEL_ESTIMATOR]},
+              modules=['estimators'])
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build cached training artifacts')
+    parser.add_argument('targets', nargs='*', help='Stages to build (default: all)')
+    parser.add_argument('--status', action='store_true', help='Show fresh/stale stages and exit')
+    parser.add_argument('--force', action='store_true', help='Rebuild the targets even if cached')
+    parser.add_argument('--install', action='store_true',
+                        help='Write trained models and encoders to the config.py paths')
+    args = parser.parse_args()
+
+    graph = default_graph()
+
+    if args.status:
+        print(f"{'Stage':<20} {'Key':<18} Status")
+        for name, key, fresh in graph.status():
+            print(f"{name:<20} {key:<18} {'✅ fresh' if fresh else '❌ stale'}")
+        return
+
+    targets = args.targets or list(graph.stages)
+    unknown = [t for t in targets if t not in graph.stages]
+    if unknown:
+        parser.error(f"Unknown stage(s): {', '.join(unknown)}. Available: {', '.join(graph.stages)}")
+
+    print("=" * 60)
+    print("BUILDING TRAINING ARTIFACTS")
+    print("=" * 60)
+    start = time.perf_counter()
+    for target in targets:
+        graph.build(target, force=args.force)
+    print(f"\n⏱️ Done in {time.perf_counter() - start:.2f}s (cache: {graph.cache_dir})")
+
+    if args.install:
+        print("\n💾 Installing models...")
+        joblib.dump(graph.build('lagged_model'), MODEL_PATH)
+        joblib.dump(graph.build('lagged_matrices')['encoder'], ENCODER_PATH)
+        joblib.dump(graph.build('scenario_model'), SCENARIO_MODEL_PATH)
+        joblib.dump(graph.build('scenario_matrices')['encoder'], SCENARIO_ENCODER_PATH)
+        print(f"   {MODEL_PATH}, {ENCODER_PATH}")
+        print(f"   {SCENARIO_MODEL_PATH}, {SCENARIO_ENCODER_PATH}")
+
+
+if __name__ == "__main__":
+    main()
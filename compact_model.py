@@ -0,0 +1,327 @@
+"""
+Latency vs accuracy trade-off of compacted random forests
+
+Both forests serve 100 trees (max_depth 10 for the lagged model, 15 for the
+scenario model). This tool builds compacted variants of a trained forest and
+measures what each one costs and saves:
+
+- Tree subsets: the k trees with the lowest out-of-bag error
+- Depth truncation: every tree cut at a maximum depth; the cut nodes become
+  leaves predicting the mean of their training samples (no refit)
+- Cost-complexity pruning: the forest refit with ccp_alpha
+
+Every candidate is scored on the temporal test set (years >= TEMPORAL_SPLIT_YEAR)
+for R² and RMSE, joblib artifact size and single-row p99 latency. Candidates
+that no other candidate beats on all three of R², size and p99 form the
+Pareto front; pick one and write it out with --export.
+
+By default the reference forest is fit with the config.py parameters on the
+years before TEMPORAL_SPLIT_YEAR. --from-artifact compacts the saved model
+instead; its test R² is optimistic if it was trained on the test years, and
+pruning is skipped because refits on the training years would not be
+comparable with it.
+
+Usage:
+    python compact_model.py
+    python compact_model.py --model scenario --trees 10 25 50 --depths 6 8 10 12
+    python compact_model.py --model scenario --export depth=10 --export-path gdp_scenario_model_compact.pkl
+"""
+
+import argparse
+import copy
+import os
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.tree import DecisionTreeRegressor
+
+from config import (
+    DATASET_PATH, TEMPORAL_SPLIT_YEAR, MODEL_PATH, SCENARIO_MODEL_PATH,
+    MODEL_PARAMS, SCENARIO_MODEL_PARAMS
+)
+from compare_estimators import temporal_matrices
+from hyperparam_search import single_row_latency
+
+MODEL_PATHS = {'lagged': MODEL_PATH, 'scenario': SCENARIO_MODEL_PATH}
+BASE_PARAMS = {'lagged': MODEL_PARAMS, 'scenario': SCENARIO_MODEL_PARAMS}
+
+# sklearn's markers for leaf nodes in Tree.nodes
+TREE_LEAF = -1
+TREE_UNDEFINED = -2
+
+
+def in_bag_indices(forest, n_samples):
+    """
+    Bootstrap sample indices of each tree, or None if they cannot be recovered
+
+    scikit-learn >= 1.4 exposes them as estimators_samples_; older versions
+    (requirements.txt pins 1.3) draw them from each tree's random_state with
+    the same private helper, so they are regenerated here.
+    """
+    samples = getattr(forest, 'estimators_samples_', None)
+    if samples is not None:
+        return samples
+
+    try:
+        from sklearn.ensemble._forest import _generate_sample_indices, _get_n_samples_bootstrap
+    except ImportError:
+        return None
+    n_bootstrap = _get_n_samples_bootstrap(n_samples, forest.max_samples)
+    return [_generate_sample_indices(tree.random_state, n_samples, n_bootstrap)
+            for tree in forest.estimators_]
+
+
+def oob_ranking(forest, X_train, y_train):
+    """
+    Tree indices ordered by out-of-bag MSE, best first
+
+    X_train must be the data the forest was fit on; without bootstrap (or
+    when the bootstrap samples cannot be recovered) the fit order is kept.
+    """
+    samples = in_bag_indices(forest, len(X_train)) if forest.bootstrap else None
+    if samples is None:
+        return np.arange(len(forest.estimators_))
+
+    errors = np.empty(len(forest.estimators_))
+    for i, (tree, in_bag) in enumerate(zip(forest.estimators_, samples)):
+        oob = np.ones(len(X_train), dtype=bool)
+        oob[in_bag] = False
+        if not oob.any():
+            errors[i] = np.inf
+            continue
+        errors[i] = mean_squared_error(y_train[oob], tree.predict(X_train[oob]))
+    return np.argsort(errors, kind='stable')
+
+
+def tree_subset(forest, indices):
+    """Forest serving only the given trees (shares the tree objects)"""
+    subset = copy.copy(forest)
+    subset.estimators_ = [forest.estimators_[i] for i in indices]
+    subset.n_estimators = len(subset.estimators_)
+    return subset
+
+
+def truncate_tree(estimator, max_depth):
+    """
+    Copy of a fitted tree cut at max_depth
+
+    Nodes at max_depth become leaves; their stored value is already the mean
+    target of their training samples. Nodes below are dropped so the artifact
+    shrinks too.
+    """
+    state = estimator.tree_.__getstate__()
+    nodes = state['nodes']
+
+    # The builder numbers children after their parent, so one pass assigns depths
+    left_child, right_child = nodes['left_child'], nodes['right_child']
+    depth = np.zeros(len(nodes), dtype=np.intp)
+    for i in range(len(nodes)):
+        if left_child[i] != TREE_LEAF:
+            depth[left_child[i]] = depth[right_child[i]] = depth[i] + 1
+
+    keep = depth <= max_depth
+    new_index = np.cumsum(keep) - 1
+    new_nodes = nodes[keep]
+    is_split = new_nodes['left_child'] != TREE_LEAF
+    cut = is_split & (depth[keep] == max_depth)
+    remap = is_split & ~cut
+
+    new_nodes['left_child'][remap] = new_index[new_nodes['left_child'][remap]]
+    new_nodes['right_child'][remap] = new_index[new_nodes['right_child'][remap]]
+    new_nodes['left_child'][cut] = TREE_LEAF
+    new_nodes['right_child'][cut] = TREE_LEAF
+    new_nodes['feature'][cut] = TREE_UNDEFINED
+    new_nodes['threshold'][cut] = TREE_UNDEFINED
+
+    state.update({
+        'nodes': np.ascontiguousarray(new_nodes),
+        'values': np.ascontiguousarray(state['values'][keep]),
+        'node_count': int(keep.sum()),
+        'max_depth': int(min(max_depth, state['max_depth']))
+    })
+
+    truncated = copy.deepcopy(estimator)
+    truncated.tree_.__setstate__(state)
+    truncated.max_depth = state['max_depth']
+    return truncated
+
+
+def truncate_forest(forest, max_depth):
+    truncated = copy.copy(forest)
+    truncated.estimators_ = [truncate_tree(tree, max_depth) for tree in forest.estimators_]
+    truncated.max_depth = max_depth
+    return truncated
+
+
+def default_ccp_alphas(forest, X_train, y_train, quantiles=(0.5, 0.8, 0.9, 0.95)):
+    """Alphas at quantiles of the pruning path of one tree grown like the forest's"""
+    params = forest.get_params()
+    tree = DecisionTreeRegressor(max_depth=params['max_depth'],
+                                 min_samples_split=params['min_samples_split'],
+                                 min_samples_leaf=params['min_samples_leaf'],
+                                 random_state=params['random_state'])
+    alphas = tree.cost_complexity_pruning_path(X_train, y_train).ccp_alphas
+    alphas = alphas[alphas > 0]
+    if len(alphas) == 0:
+        return []
+    return sorted({float(f"{a:.3g}") for a in np.quantile(alphas, quantiles)})
+
+
+def evaluate(model, X_test, y_test):
+    """Temporal-test accuracy and serving cost of one candidate"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.pkl')
+        joblib.dump(model, path)
+        size_mb = os.path.getsize(path) / 1e6
+
+    latency_median, latency_p99 = single_row_latency(model, X_test[:1])
+    y_pred = model.predict(X_test)
+    return {
+        'trees': len(model.estimators_),
+        'nodes': int(sum(tree.tree_.node_count for tree in model.estimators_)),
+        'temporal_test_r2': r2_score(y_test, y_pred),
+        'temporal_test_rmse': float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        'artifact_mb': size_mb,
+        'single_row_ms_median': latency_median,
+        'single_row_ms_p99': latency_p99
+    }
+
+
+def pareto_front(report):
+    """True for candidates no other candidate matches or beats on R², size and p99 (strictly on one)"""
+    r2 = report['temporal_test_r2'].to_numpy()
+    size = report['artifact_mb'].to_numpy()
+    p99 = report['single_row_ms_p99'].to_numpy()
+
+    front = np.ones(len(report), dtype=bool)
+    for i in range(len(report)):
+        no_worse = (r2 >= r2[i]) & (size <= size[i]) & (p99 <= p99[i])
+        better = (r2 > r2[i]) | (size < size[i]) | (p99 < p99[i])
+        front[i] = not (no_worse & better).any()
+    return front
+
+
+def build_candidates(forest, X_train, y_train, trees, depths, ccp_alphas, fit_on_train=True):
+    """
+    Yield (name, family, model) for the reference forest and each compaction
+
+    fit_on_train: whether forest was fit on X_train; otherwise tree subsets
+    keep fit order, since the out-of-bag rows are unknown
+    """
+    yield 'full', 'reference', forest
+
+    if fit_on_train:
+        ranking = oob_ranking(forest, X_train, y_train)
+    else:
+        ranking = np.arange(len(forest.estimators_))
+    for k in sorted(t for t in trees if t < len(forest.estimators_)):
+        yield f'trees={k}', 'tree subset', tree_subset(forest, ranking[:k])
+
+    full_depth = max(tree.tree_.max_depth for tree in forest.estimators_)
+    for depth in sorted(d for d in depths if d < full_depth):
+        yield f'depth={depth}', 'depth truncation', truncate_forest(forest, depth)
+
+    for alpha in ccp_alphas:
+        pruned = RandomForestRegressor(**{**forest.get_params(), 'ccp_alpha': alpha})
+        pruned.fit(X_train, y_train)
+        yield f'ccp_alpha={alpha:g}', 'cost-complexity pruning', pruned
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compact a random forest and report the latency/accuracy trade-off')
+    parser.add_argument('--model', choices=['lagged', 'scenario'], default='lagged')
+    parser.add_argument('--from-artifact', action='store_true',
+                        help='Compact the saved model instead of refitting on the temporal training years')
+    parser.add_argument('--trees', type=int, nargs='+', default=[10, 25, 50, 75],
+                        help='Tree subset sizes (best out-of-bag trees first)')
+    parser.add_argument('--depths', type=int, nargs='+', default=[4, 6, 8, 10, 12],
+                        help='Truncation depths (deeper than the forest are skipped)')
+    parser.add_argument('--ccp-alphas', type=float, nargs='*', default=None,
+                        help='Pruning strengths (default: quantiles of a tree pruning path; none to skip)')
+    parser.add_argument('--export', metavar='CANDIDATE', help="Write this candidate, e.g. 'depth=8'")
+    parser.add_argument('--export-path', default=None,
+                        help='Where to write the exported model (default: <model>_compact.pkl)')
+    parser.add_argument('--output', default=None,
+                        help='Report file (default: compaction_<model>.txt, plus a .csv)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"MODEL COMPACTION - {args.model.upper()} MODEL")
+    print("=" * 60)
+
+    X_train, y_train, X_test, y_test = temporal_matrices(args.model, pd.read_csv(DATASET_PATH))
+
+    if args.from_artifact:
+        forest = joblib.load(MODEL_PATHS[args.model])
+        if not isinstance(forest, RandomForestRegressor):
+            raise SystemExit(f"❌ {MODEL_PATHS[args.model]} is a {type(forest).__name__}, not a random forest")
+        print(f"\n📂 Loaded {MODEL_PATHS[args.model]} ({len(forest.estimators_)} trees)")
+        print("   ⚠️ Test R² is optimistic if this model was trained on the test years")
+    else:
+        print(f"\n🌲 Fitting reference forest on years < {TEMPORAL_SPLIT_YEAR} ({len(X_train)} rows)...")
+        forest = RandomForestRegressor(**BASE_PARAMS[args.model])
+        forest.fit(X_train, y_train)
+
+    ccp_alphas = args.ccp_alphas
+    pruning_note = None
+    if args.from_artifact:
+        # Refits would train on years < TEMPORAL_SPLIT_YEAR only, unlike the artifact
+        ccp_alphas = []
+        pruning_note = ("Cost-complexity pruning skipped: it refits on the training years, "
+                        "while the saved artifact may have seen every year")
+        print(f"   ℹ️ {pruning_note}")
+    elif ccp_alphas is None:
+        ccp_alphas = default_ccp_alphas(forest, X_train, y_train)
+
+    rows, models = [], {}
+    for name, family, model in build_candidates(forest, X_train, y_train,
+                                                args.trees, args.depths, ccp_alphas,
+                                                fit_on_train=not args.from_artifact):
+        result = evaluate(model, X_test, y_test)
+        rows.append({'candidate': name, 'family': family, **result})
+        if name == args.export:
+            models[name] = model
+        print(f"   {name:<20} R²={result['temporal_test_r2']:.4f}  size={result['artifact_mb']:.2f}MB  "
+              f"p99={result['single_row_ms_p99']:.2f}ms")
+
+    report = pd.DataFrame(rows)
+    report['pareto'] = pareto_front(report)
+    table = report.to_string(index=False, float_format=lambda v: f"{v:.4f}")
+    front = report[report['pareto']].sort_values('single_row_ms_p99')
+    front_table = front[['candidate', 'temporal_test_r2', 'artifact_mb', 'single_row_ms_p99']].to_string(
+        index=False, float_format=lambda v: f"{v:.4f}")
+
+    print("\n" + "=" * 60)
+    print(table)
+    print("\n🏆 Pareto front (fastest first):")
+    print(front_table)
+
+    output = args.output or f"compaction_{args.model}.txt"
+    with open(output, 'w') as f:
+        f.write(f"MODEL COMPACTION - {args.model.upper()} MODEL\n")
+        f.write("=" * 60 + "\n")
+        f.write(f"Temporal split: train < {TEMPORAL_SPLIT_YEAR}, test >= {TEMPORAL_SPLIT_YEAR}\n")
+        f.write(f"Reference: {'saved artifact' if args.from_artifact else 'refit with config.py parameters'}\n")
+        if pruning_note:
+            f.write(pruning_note + "\n")
+        f.write("\n")
+        f.write(table + "\n\nPareto front (fastest first):\n" + front_table + "\n")
+    report.to_csv(os.path.splitext(output)[0] + '.csv', index=False)
+    print(f"\n💾 Report saved as '{output}'")
+
+    if args.export:
+        if args.export not in models:
+            raise SystemExit(f"❌ Unknown candidate '{args.export}'. "
+                             f"Choose from: {', '.join(report['candidate'])}")
+        export_path = args.export_path or f"{os.path.splitext(MODEL_PATHS[args.model])[0]}_compact.pkl"
+        joblib.dump(models[args.export], export_path)
+        print(f"💾 Exported '{args.export}' to: {export_path}")
+        print("   Serve it by pointing MODEL_PATH / SCENARIO_MODEL_PATH in config.py at this file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Compare the Random Forest against Histogram Gradient Boosting
+for both the lagged (forecast) model and the scenario model
+
+Both estimators are trained on the same temporal split (TEMPORAL_SPLIT_YEAR)
+and compared on:
+- artifact size on disk (joblib)
+- training time
+- single-row latency (median / p99) and batch latency
+- temporal-test R² and RMSE
+
+Usage:
+    python compare_estimators.py
+    python compare_estimators.py --output estimator_comparison.txt
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error, r2_score
+
+from config import DATASET_PATH, TEMPORAL_SPLIT_YEAR
+from estimators import ESTIMATORS, LAGGED_PARAMS, SCENARIO_PARAMS, make_estimator
+from feature_engine import create_lagged_features
+from hyperparam_search import single_row_latency
+
+
+def temporal_matrices(kind, df):
+    """Train/test matrices split at TEMPORAL_SPLIT_YEAR"""
+    if kind == 'lagged':
+        from train_model import prepare_features
+        df = create_lagged_features(df)
+        X, y, _ = prepare_features(df, fit_encoder=True)
+    else:
+        from train_scenario_model import prepare_features
+        df = df.copy()
+        X, y, _, _ = prepare_features(df, fit_encoder=True)
+
+    train = (df['Year'] < TEMPORAL_SPLIT_YEAR).to_numpy()
+    X = X.to_numpy(dtype=np.float64)
+    y = y.to_numpy(dtype=np.float64)
+    return X[train], y[train], X[~train], y[~train]
+
+
+def benchmark(model, X_train, y_train, X_test, y_test, batch_repeats=20):
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.pkl')
+        joblib.dump(model, path)
+        size_mb = os.path.getsize(path) / 1e6
+
+    latency_median, latency_p99 = single_row_latency(model, X_test[:1])
+
+    batch_timings = []
+    for _ in range(batch_repeats):
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        batch_timings.append(time.perf_counter() - start)
+
+    return {
+        'artifact_mb': size_mb,
+        'train_seconds': fit_seconds,
+        'single_row_ms_median': latency_median,
+        'single_row_ms_p99': latency_p99,
+        'batch_ms': float(np.median(batch_timings) * 1000),
+        'batch_rows': len(X_test),
+        'temporal_test_r2': r2_score(y_test, y_pred),
+        'temporal_test_rmse': float(np.sqrt(mean_squared_error(y_test, y_pred)))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare forest vs histogram gradient boosting')
+    parser.add_argument('--output', default='estimator_comparison.txt')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ESTIMATOR COMPARISON: RANDOM FOREST vs HIST GRADIENT BOOSTING")
+    print("=" * 60)
+
+    df = pd.read_csv(DATASET_PATH)
+    rows = []
+
+    for kind, params_by_estimator in [('lagged', LAGGED_PARAMS), ('scenario', SCENARIO_PARAMS)]:
+        X_train, y_train, X_test, y_test = temporal_matrices(kind, df)
+        for estimator in ESTIMATORS:
+            print(f"\n🤖 {kind} / {estimator}...")
+            result = benchmark(make_estimator(estimator, params_by_estimator),
+                               X_train, y_train, X_test, y_test)
+            rows.append({'model': kind, 'estimator': estimator, **result})
+            print(f"   R²={result['temporal_test_r2']:.4f}  size={result['artifact_mb']:.2f}MB  "
+                  f"train={result['train_seconds']:.2f}s  p99={result['single_row_ms_p99']:.2f}ms")
+
+    report = pd.DataFrame(rows)
+    table = report.to_string(index=False, float_format=lambda v: f"{v:.4f}")
+
+    print("\n" + "=" * 60)
+    print(table)
+
+    with open(args.output, 'w') as f:
+        f.write("ESTIMATOR COMPARISON: RANDOM FOREST vs HIST GRADIENT BOOSTING\n")
+        f.write("=" * 60 + "\n")
+        f.write(f"Temporal split: train < {TEMPORAL_SPLIT_YEAR}, test >= {TEMPORAL_SPLIT_YEAR}\n\n")
+        f.write(table + "\n")
+    report.to_csv(os.path.splitext(args.output)[0] + '.csv', index=False)
+
+    print(f"\n💾 Report saved as '{args.output}'")
+    print("   Switch estimators with MODEL_ESTIMATOR / SCENARIO_MODEL_ESTIMATOR in config.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@ Configuration file for GDP Growth Prediction Model
 Ensures consistency across training and deployment
 """
 
+import os
+
 # Data paths
 DATASET_PATH = "final_data_with_year.csv"
 
@@ -10,6 +12,11 @@ DATASET_PATH = "final_data_with_year.csv"
 MODEL_PATH = "gdp_model.pkl"
 ENCODER_PATH = "country_encoder.pkl"
 
+# Scenario simulator model paths
+SCENARIO_MODEL_PATH = "gdp_scenario_model.pkl"
+SCENARIO_ENCODER_PATH = "country_encoder_scenario.pkl"
+SCENARIO_FEATURE_INFO_PATH = "feature_info_scenario.pkl"
+
 # Feature columns (for reference)
 FEATURE_COLUMNS = [
     'Country_Encoded',
@@ -35,3 +42,107 @@ MODEL_PARAMS = {
     'random_state': 42,
     'n_jobs': -1
 }
+
+# Scenario simulator hyperparameters (concurrent indicators, deeper trees)
+SCENARIO_MODEL_PARAMS = {
+    'n_estimators': 100,
+    'max_depth': 15,
+    'min_samples_split': 5,
+    'min_samples_leaf': 2,
+    'random_state': 42,
+    'n_jobs': -1
+}
+
+# Quantiles reported when a request asks for prediction uncertainty
+UNCERTAINTY_QUANTILES = [0.05, 0.5, 0.95]
+
+# Estimator used by each model: 'random_forest' or 'hist_gradient_boosting'
+MODEL_ESTIMATOR = 'random_forest'
+SCENARIO_MODEL_ESTIMATOR = 'random_forest'
+
+# Histogram gradient boosting hyperparameters (Country_Encoded is categorical)
+HGB_PARAMS = {
+    'max_iter': 300,
+    'learning_rate': 0.05,
+    'max_leaf_nodes': 31,
+    'min_samples_leaf': 20,
+    'l2_regularization': 0.1,
+    'categorical_features': [0],
+    'random_state': 42
+}
+
+SCENARIO_HGB_PARAMS = {
+    'max_iter': 500,
+    'learning_rate': 0.05,
+    'max_leaf_nodes': 63,
+    'min_samples_leaf': 10,
+    'l2_regularization': 0.1,
+    'categorical_features': [0],
+    'random_state': 42
+}
+
+# Cache directory for content-hashed training artifacts (build_graph.py)
+ARTIFACT_CACHE_DIR = ".artifacts"
+
+# Versioned model artifacts (model_registry.py)
+MODEL_REGISTRY_DIR = "models"
+
+# Validated dataset with compact dtypes, written by ingest.py
+# (.pkl always works, .parquet needs pyarrow)
+CANONICAL_STORE_PATH = "gdp_canonical.pkl"
+
+# Distilled surrogate of the scenario model (distill.py)
+SCENARIO_SURROGATE_PATH = "gdp_scenario_surrogate.pkl"
+# Surrogates whose p99 |error| vs the model (GDP growth points, worst of the
+# held-out synthetic and real-row checks) exceeds this are not written, and
+# fast mode stays off
+SCENARIO_FAST_MAX_P99_ERROR = 1.0
+
+# How /simulate answers when the request has no "mode": 'model' (full forest)
+# or 'fast' (distilled surrogate)
+SCENARIO_SERVING_MODE = os.environ.get('SCENARIO_SERVING_MODE', 'model')
+
+# Most scenarios per /simulate/compare request (each is applied to every country)
+SCENARIO_COMPARE_MAX_SCENARIOS = 20
+
+# ONNX exports of the two models (export_onnx.py)
+MODEL_ONNX_PATH = "gdp_model.onnx"
+SCENARIO_ONNX_PATH = "gdp_scenario_model.onnx"
+
+# Serving inference backend: 'sklearn' or 'onnx' (needs requirements-onnx.txt)
+INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'sklearn')
+
+# Admission control per endpoint class (admission.py), per process:
+# concurrent requests, queued requests, and seconds a request may wait
+# for a slot before it is shed with 503 + Retry-After
+ADMISSION_LIMITS = {
+    'cheap': {'max_concurrent': 32, 'max_queue': 64, 'timeout_seconds': 0.5},
+    'predict': {'max_concurrent': 8, 'max_queue': 32, 'timeout_seconds': 1.0},
+    'expensive': {'max_concurrent': 2, 'max_queue': 4, 'timeout_seconds': 2.0}
+}
+
+# Representative requests replayed per route at startup (warmup.py)
+WARMUP_REPEATS = 3
+
+# Structured logging (structured_logging.py)
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+LOG_QUEUE_SIZE = 10000
+# Share of successful requests written to the access log (errors are always kept)
+LOG_SUCCESS_SAMPLE_RATE = float(os.environ.get('LOG_SUCCESS_SAMPLE_RATE', '0.01'))
+# At most one full traceback per distinct error per this many seconds
+LOG_ERROR_TRACE_INTERVAL = 60
+
+# Token for admin-only features (X-Profile-Token / X-Admin-Token headers);
+# unset disables them
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN') or None
+
+# On-demand request profiling (request_profiler.py), folded-stack output
+REQUEST_PROFILING = os.environ.get('REQUEST_PROFILING') == '1'
+REQUEST_PROFILE_SAMPLE_RATE = float(os.environ.get('REQUEST_PROFILE_SAMPLE_RATE', '0.05'))
+REQUEST_PROFILE_INTERVAL = 0.002
+REQUEST_PROFILE_DIR = "profiles"
+REQUEST_PROFILE_ENDPOINTS = ['predict', 'simulate_scenario', 'get_history', 'get_baseline']
+
+# Slow-request ring buffer behind /debug/slow (slow_requests.py)
+SLOW_REQUEST_THRESHOLD_MS = float(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', '100'))
+SLOW_REQUEST_BUFFER_SIZE = 200
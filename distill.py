@@ -0,0 +1,260 @@
+"""
+Distill the scenario forest into a lightweight surrogate for fast scoring
+
+The growth calculator sends a request on every slider move; a 100-tree forest
+is more than that needs. This script:
+
+1. Draws dense synthetic scenarios per country around its historical range
+   (half uniform over the padded range, half jittered historical rows)
+2. Labels them with the teacher, gdp_scenario_model.pkl
+3. Fits a per-country piecewise-linear surrogate (surrogate.py) by ridge
+   least squares on those labels
+4. Reports fidelity to the teacher on held-out synthetic scenarios and on the
+   real dataset rows, plus single-row latency of both models
+
+The surrogate is only written when its worst p99 |error| vs the teacher is
+within SCENARIO_FAST_MAX_P99_ERROR; the report travels in its metadata and
+app_scenario.py checks it again at load. It then serves the surrogate when the
+serving mode is 'fast' (SCENARIO_SERVING_MODE, or "mode": "fast" in the request
+body); the full forest stays the default.
+
+Usage:
+    python distill.py
+    python distill.py --samples-per-country 4000 --knots 6
+"""
+
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import r2_score
+
+from config import (
+    DATASET_PATH, SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH,
+    SCENARIO_SURROGATE_PATH, SCENARIO_FAST_MAX_P99_ERROR
+)
+from feature_engine import INDICATOR_COLUMNS
+from hyperparam_search import single_row_latency
+from surrogate import PiecewiseLinearSurrogate, design_matrix
+
+# validate_scenario_input accepts growth rates in this range
+INPUT_RANGE = (-100.0, 100.0)
+
+
+def country_ranges(df, encoder, pad):
+    """
+    Per-country sampling box: 1st-99th percentile of history, padded
+
+    Returns:
+        tuple: (lower, upper) arrays of shape (countries, indicators), rows in
+        encoder code order
+    """
+    global_lower = df[INDICATOR_COLUMNS].quantile(0.01).to_numpy()
+    global_upper = df[INDICATOR_COLUMNS].quantile(0.99).to_numpy()
+
+    grouped = df.groupby('Country')[INDICATOR_COLUMNS]
+    lower = grouped.quantile(0.01).reindex(encoder.classes_).to_numpy()
+    upper = grouped.quantile(0.99).reindex(encoder.classes_).to_numpy()
+
+    # Countries or indicators without history fall back to the global range
+    lower = np.where(np.isnan(lower), global_lower, lower)
+    upper = np.where(np.isnan(upper), global_upper, upper)
+
+    span = np.maximum(upper - lower, 1.0)
+    lower = np.clip(lower - pad * span, *INPUT_RANGE)
+    upper = np.clip(upper + pad * span, *INPUT_RANGE)
+    return lower, upper
+
+
+def sample_country(rng, history, lower, upper, n):
+    """n synthetic indicator rows for one country"""
+    n_uniform = n // 2
+    uniform = rng.uniform(lower, upper, size=(n_uniform, len(lower)))
+
+    if len(history):
+        base = history[rng.integers(0, len(history), size=n - n_uniform)]
+    else:
+        base = rng.uniform(lower, upper, size=(n - n_uniform, len(lower)))
+    jittered = base + rng.normal(0.0, 0.1 * (upper - lower), size=base.shape)
+
+    return np.clip(np.vstack([uniform, jittered]), lower, upper)
+
+
+def fit_country(Z, y, knots, ridge):
+    """Ridge least-squares weights of one country's basis expansion"""
+    basis = design_matrix(Z, knots)
+    gram = basis.T @ basis
+    penalty = ridge * len(Z) * np.eye(len(gram))
+    penalty[0, 0] = 0.0   # leave the intercept unpenalized
+    return np.linalg.solve(gram + penalty, basis.T @ y)
+
+
+def fidelity(teacher_pred, student_pred):
+    errors = np.abs(teacher_pred - student_pred)
+    return {
+        'r2_vs_teacher': float(r2_score(teacher_pred, student_pred)),
+        'mae_vs_teacher': float(errors.mean()),
+        'p99_abs_error': float(np.percentile(errors, 99)),
+        'max_abs_error': float(errors.max())
+    }
+
+
+def distill(teacher, encoder, df, samples_per_country=2000, n_knots=5,
+            ridge=1e-3, pad=0.1, holdout=0.2, seed=42):
+    """
+    Fit the surrogate and measure its fidelity
+
+    Returns:
+        tuple: (surrogate, report dict)
+    """
+    rng = np.random.default_rng(seed)
+    df = df.dropna(subset=['Country', 'GDP_Growth_Rate'] + INDICATOR_COLUMNS)
+    df = df[df['Country'].isin(encoder.classes_)]
+    lower, upper = country_ranges(df, encoder, pad)
+    n_countries, n_features = lower.shape
+
+    # Interior knots evenly spaced over each country's box
+    steps = np.arange(1, n_knots + 1) / (n_knots + 1)
+    knots = lower[:, :, None] + (upper - lower)[:, :, None] * steps
+
+    # 1-2. Synthetic scenarios labelled by the teacher in one predict call
+    n_total = int(samples_per_country / (1 - holdout))
+    histories = {c: g[INDICATOR_COLUMNS].to_numpy() for c, g in df.groupby('Country')}
+    blocks, codes = [], []
+    for code, country in enumerate(encoder.classes_):
+        blocks.append(sample_country(rng, histories.get(country, np.empty((0, n_features))),
+                                     lower[code], upper[code], n_total))
+        codes.append(np.full(n_total, code))
+    Z = np.vstack(blocks)
+    codes = np.concatenate(codes)
+    X = np.column_stack([codes, Z])
+
+    start = time.perf_counter()
+    y_teacher = teacher.predict(X)
+    label_seconds = time.perf_counter() - start
+
+    # 3. Per-country ridge fit on the training part of each country's block
+    is_train = np.tile(np.arange(n_total) < samples_per_country, n_countries)
+    weights = np.empty((n_countries, 1 + n_features * (n_knots + 1)))
+    start = time.perf_counter()
+    for code in range(n_countries):
+        rows = slice(code * n_total, code * n_total + samples_per_country)
+        weights[code] = fit_country(Z[rows], y_teacher[rows], knots[code], ridge)
+    fit_seconds = time.perf_counter() - start
+
+    surrogate = PiecewiseLinearSurrogate(lower, upper, knots, weights, metadata={
+        'teacher': SCENARIO_MODEL_PATH,
+        'samples_per_country': samples_per_country,
+        'knots': n_knots,
+        'ridge': ridge,
+        'pad': pad
+    })
+
+    # 4. Fidelity on held-out synthetic scenarios and on the real rows
+    X_real = np.column_stack([encoder.transform(df['Country']), df[INDICATOR_COLUMNS].to_numpy()])
+    teacher_real = teacher.predict(X_real)
+    student_real = surrogate.predict(X_real)
+    y_real = df['GDP_Growth_Rate'].to_numpy()
+
+    row = X_real[:1]
+    teacher_median, teacher_p99 = single_row_latency(teacher, row)
+    student_median, student_p99 = single_row_latency(surrogate, row, repeats=2000)
+
+    report = {
+        'countries': n_countries,
+        'synthetic_rows': len(X),
+        'label_seconds': label_seconds,
+        'fit_seconds': fit_seconds,
+        'holdout': fidelity(y_teacher[~is_train], surrogate.predict(X[~is_train])),
+        'dataset': fidelity(teacher_real, student_real),
+        'dataset_r2_vs_actual': {
+            'teacher': float(r2_score(y_real, teacher_real)),
+            'surrogate': float(r2_score(y_real, student_real))
+        },
+        'single_row_ms': {
+            'teacher_median': teacher_median, 'teacher_p99': teacher_p99,
+            'surrogate_median': student_median, 'surrogate_p99': student_p99
+        }
+    }
+    surrogate.metadata['report'] = report
+    return surrogate, report
+
+
+def format_report(report):
+    lines = [
+        f"Countries: {report['countries']}, synthetic rows: {report['synthetic_rows']}",
+        f"Teacher labelling {report['label_seconds']:.2f}s, surrogate fit {report['fit_seconds']:.2f}s",
+        "",
+        f"{'Fidelity to teacher':<28}{'R²':>8}{'MAE':>10}{'p99 |err|':>12}{'max |err|':>12}"
+    ]
+    for name in ['holdout', 'dataset']:
+        f = report[name]
+        label = 'held-out synthetic' if name == 'holdout' else 'real dataset rows'
+        lines.append(f"{label:<28}{f['r2_vs_teacher']:>8.4f}{f['mae_vs_teacher']:>10.4f}"
+                     f"{f['p99_abs_error']:>12.4f}{f['max_abs_error']:>12.4f}")
+    accuracy = report['dataset_r2_vs_actual']
+    latency = report['single_row_ms']
+    lines += [
+        "",
+        f"R² vs actual GDP growth:   teacher {accuracy['teacher']:.4f}, surrogate {accuracy['surrogate']:.4f}",
+        f"Single-row latency median: teacher {latency['teacher_median'] * 1000:.0f}µs, "
+        f"surrogate {latency['surrogate_median'] * 1000:.0f}µs "
+        f"({latency['teacher_median'] / max(latency['surrogate_median'], 1e-9):.0f}x faster)",
+        f"Single-row latency p99:    teacher {latency['teacher_p99'] * 1000:.0f}µs, "
+        f"surrogate {latency['surrogate_p99'] * 1000:.0f}µs"
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Distill the scenario model into a fast surrogate')
+    parser.add_argument('--samples-per-country', type=int, default=2000)
+    parser.add_argument('--knots', type=int, default=5, help='Hinge knots per indicator')
+    parser.add_argument('--ridge', type=float, default=1e-3)
+    parser.add_argument('--pad', type=float, default=0.1,
+                        help='Widen each country range by this fraction on both sides')
+    parser.add_argument('--output', default=SCENARIO_SURROGATE_PATH)
+    parser.add_argument('--report', default='distill_report.txt')
+    parser.add_argument('--tolerance', type=float, default=SCENARIO_FAST_MAX_P99_ERROR,
+                        help='Do not write the surrogate when p99 |error| vs the model exceeds this')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SCENARIO MODEL DISTILLATION")
+    print("=" * 60)
+
+    teacher = joblib.load(SCENARIO_MODEL_PATH)
+    encoder = joblib.load(SCENARIO_ENCODER_PATH)
+    df = pd.read_csv(DATASET_PATH)
+
+    print(f"\n🧪 Sampling {args.samples_per_country} scenarios per country "
+          f"for {len(encoder.classes_)} countries...")
+    surrogate, report = distill(teacher, encoder, df, args.samples_per_country,
+                                args.knots, args.ridge, args.pad)
+
+    text = format_report(report)
+    print("\n📊 Fidelity Report:")
+    print("=" * 60)
+    print(text)
+    print("=" * 60)
+
+    with open(args.report, 'w') as f:
+        f.write("SCENARIO MODEL DISTILLATION\n")
+        f.write("=" * 60 + "\n")
+        f.write(text + "\n")
+    print(f"\n💾 Report saved as '{args.report}'")
+
+    if not surrogate.p99_error <= args.tolerance:
+        print(f"\n❌ p99 |error| {surrogate.p99_error:.4f} exceeds the tolerance of {args.tolerance} - "
+              f"surrogate not written (try more --knots or --samples-per-country)")
+        raise SystemExit(1)
+
+    joblib.dump(surrogate, args.output)
+    print(f"💾 Surrogate saved to: {args.output}")
+    print("   Serve it with SCENARIO_SERVING_MODE=fast or \"mode\": \"fast\" in /simulate requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Estimator factory for the GDP models
+Lets config.py choose between the random forest and histogram gradient boosting
+"""
+
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+
+from config import (
+    MODEL_PARAMS, SCENARIO_MODEL_PARAMS,
+    HGB_PARAMS, SCENARIO_HGB_PARAMS
+)
+
+
+ESTIMATORS = {
+    'random_forest': RandomForestRegressor,
+    'hist_gradient_boosting': HistGradientBoostingRegressor
+}
+
+# Default hyperparameters per estimator, for each model
+LAGGED_PARAMS = {
+    'random_forest': MODEL_PARAMS,
+    'hist_gradient_boosting': HGB_PARAMS
+}
+
+SCENARIO_PARAMS = {
+    'random_forest': SCENARIO_MODEL_PARAMS,
+    'hist_gradient_boosting': SCENARIO_HGB_PARAMS
+}
+
+# Human-readable names used in API responses
+ESTIMATOR_LABELS = {
+    'RandomForestRegressor': 'Random Forest',
+    'HistGradientBoostingRegressor': 'Histogram Gradient Boosting'
+}
+
+
+def make_estimator(name, params_by_estimator=LAGGED_PARAMS):
+    """
+    Create an unfitted estimator
+    
+    Args:
+        name: key of ESTIMATORS (config.MODEL_ESTIMATOR / SCENARIO_MODEL_ESTIMATOR)
+        params_by_estimator: LAGGED_PARAMS or SCENARIO_PARAMS
+    """
+    if name not in ESTIMATORS:
+        raise ValueError(f"Unknown estimator '{name}'. Choose from: {', '.join(ESTIMATORS)}")
+    return ESTIMATORS[name](**params_by_estimator[name])
+
+
+def describe(model):
+    """Display name of a fitted model of any supported type"""
+    name = type(model).__name__
+    return ESTIMATOR_LABELS.get(name, name)
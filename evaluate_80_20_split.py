@@ -1,85 +1,22 @@
 """
 Evaluate GDP Prediction Model using 80/20 Train-Test Split
 Compares temporal split vs random split performance
+
+Both splits, their encoders and models come from the cached build graph
+(build_graph.py), so a rerun only rebuilds what changed. Both models use
+MODEL_ESTIMATOR with its config.py parameters.
 """
 
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error, mean_absolute_percentage_error
-import joblib
 import matplotlib.pyplot as plt
 import warnings
 warnings.filterwarnings('ignore')
 
-from config import DATASET_PATH, MODEL_PARAMS
-
-
-def create_lagged_features(df):
-    """Create lagged features (T-1) to predict GDP at time T"""
-    print("\n📊 Creating lagged features (T-1)...")
-    df = df.sort_values(['Country', 'Year']).reset_index(drop=True)
-    
-    lagged_features = [
-        'Population_Growth_Rate',
-        'Exports of goods and services_Growth_Rate',
-        'Imports of goods and services_Growth_Rate',
-        'Gross capital formation_Growth_Rate',
-        'Final consumption expenditure_Growth_Rate',
-        'Government_Expenditure_Growth_Rate'
-    ]
-    
-    for feature in lagged_features:
-        df[f'{feature}_Lag1'] = df.groupby('Country')[feature].shift(1)
-    
-    rows_before = len(df)
-    df = df.dropna()
-    rows_after = len(df)
-    print(f"   Dropped {rows_before - rows_after} rows with NaN values")
-    print(f"   Remaining samples: {rows_after}")
-    
-    return df
-
-
-def prepare_features(df, encoder=None, fit_encoder=False):
-    """Prepare features for training/prediction"""
-    if encoder is None:
-        encoder = LabelEncoder()
-        fit_encoder = True
-    
-    if fit_encoder:
-        df['Country_Encoded'] = encoder.fit_transform(df['Country'])
-    else:
-        df['Country_Encoded'] = encoder.transform(df['Country'])
-    
-    # Rename lagged features
-    feature_mapping = {
-        'Population_Growth_Rate_Lag1': 'Population_Growth_Rate_Lag1',
-        'Exports of goods and services_Growth_Rate_Lag1': 'Exports_Growth_Rate_Lag1',
-        'Imports of goods and services_Growth_Rate_Lag1': 'Imports_Growth_Rate_Lag1',
-        'Gross capital formation_Growth_Rate_Lag1': 'Investment_Growth_Rate_Lag1',
-        'Final consumption expenditure_Growth_Rate_Lag1': 'Consumption_Growth_Rate_Lag1',
-        'Government_Expenditure_Growth_Rate_Lag1': 'Govt_Spend_Growth_Rate_Lag1'
-    }
-    
-    df = df.rename(columns=feature_mapping)
-    
-    feature_columns = [
-        'Country_Encoded',
-        'Population_Growth_Rate_Lag1',
-        'Exports_Growth_Rate_Lag1',
-        'Imports_Growth_Rate_Lag1',
-        'Investment_Growth_Rate_Lag1',
-        'Consumption_Growth_Rate_Lag1',
-        'Govt_Spend_Growth_Rate_Lag1'
-    ]
-    
-    X = df[feature_columns]
-    y = df['GDP_Growth_Rate']
-    
-    return X, y, encoder
+from config import DATASET_PATH, TEMPORAL_SPLIT_YEAR
+from build_graph import default_graph
+from estimators import describe
 
 
 def evaluate_model(model, X_train, y_train, X_test, y_test, split_name):
@@ -176,15 +113,8 @@ def main():
     print("GDP PREDICTION MODEL - 80/20 SPLIT EVALUATION")
     print("=" * 60)
     
-    # Load data
-    print(f"\n📂 Loading data from: {DATASET_PATH}")
-    df = pd.read_csv(DATASET_PATH)
-    print(f"   Loaded {len(df)} samples")
-    print(f"   Countries: {df['Country'].nunique()}")
-    print(f"   Years: {df['Year'].min()} - {df['Year'].max()}")
-    
-    # Create lagged features
-    df = create_lagged_features(df)
+    graph = default_graph()
+    print(f"\n📂 Building features from: {DATASET_PATH}")
     
     # ========================================
     # METHOD 1: 80/20 Random Split
@@ -193,26 +123,17 @@ def main():
     print("METHOD 1: 80/20 RANDOM SPLIT")
     print("=" * 60)
     
-    # Prepare features
-    X, y, encoder_80_20 = prepare_features(df.copy(), fit_encoder=True)
-    
-    # 80/20 split with shuffle
-    X_train_80, X_test_80, y_train_80, y_test_80 = train_test_split(
-        X, y, 
-        test_size=0.2, 
-        random_state=42,
-        shuffle=True
-    )
+    random_split = graph.build('lagged_random_split_matrices')
+    X_train_80, y_train_80 = random_split['X_train'], random_split['y_train']
+    X_test_80, y_test_80 = random_split['X_test'], random_split['y_test']
     
     print(f"\n📊 Data Split:")
     print(f"   Training: {len(X_train_80)} samples (80%)")
     print(f"   Test: {len(X_test_80)} samples (20%)")
     
     # Train model
-    print(f"\n🤖 Training Random Forest...")
-    model_80_20 = RandomForestRegressor(**MODEL_PARAMS)
-    model_80_20.fit(X_train_80, y_train_80)
-    print(f"   ✅ Training complete!")
+    model_80_20 = graph.build('lagged_random_split_model')
+    print(f"   ✅ {describe(model_80_20)} ready!")
     
     # Evaluate
     results_80_20 = evaluate_model(
@@ -224,26 +145,20 @@ def main():
     # METHOD 2: Temporal Split (for comparison)
     # ========================================
     print("\n" + "=" * 60)
-    print("METHOD 2: TEMPORAL SPLIT (2019+)")
+    print(f"METHOD 2: TEMPORAL SPLIT ({TEMPORAL_SPLIT_YEAR}+)")
     print("=" * 60)
     
-    # Temporal split
-    train_df = df[df['Year'] < 2019].copy()
-    test_df = df[df['Year'] >= 2019].copy()
+    temporal = graph.build('lagged_matrices')
+    X_train_temp, y_train_temp = temporal['X_train'], temporal['y_train']
+    X_test_temp, y_test_temp = temporal['X_test'], temporal['y_test']
     
     print(f"\n📊 Data Split:")
-    print(f"   Training: {len(train_df)} samples (years < 2019)")
-    print(f"   Test: {len(test_df)} samples (years >= 2019)")
-    
-    # Prepare features
-    X_train_temp, y_train_temp, encoder_temp = prepare_features(train_df, fit_encoder=True)
-    X_test_temp, y_test_temp, _ = prepare_features(test_df, encoder=encoder_temp, fit_encoder=False)
+    print(f"   Training: {len(X_train_temp)} samples (years < {TEMPORAL_SPLIT_YEAR})")
+    print(f"   Test: {len(X_test_temp)} samples (years >= {TEMPORAL_SPLIT_YEAR})")
     
     # Train model
-    print(f"\n🤖 Training Random Forest...")
-    model_temporal = RandomForestRegressor(**MODEL_PARAMS)
-    model_temporal.fit(X_train_temp, y_train_temp)
-    print(f"   ✅ Training complete!")
+    model_temporal = graph.build('lagged_model')
+    print(f"   ✅ {describe(model_temporal)} ready!")
     
     # Evaluate
     results_temporal = evaluate_model(
@@ -0,0 +1,155 @@
+"""
+Export the GDP models to ONNX and verify them against scikit-learn
+
+For each model (gdp_model.pkl, gdp_scenario_model.pkl):
+1. Convert with skl2onnx (float32 input, one row per scenario), recording
+   the sha256 of the source .pkl in the ONNX metadata so the APIs can tell
+   when the export is stale
+2. Parity check: predict every row of the full dataset with both runtimes
+   and compare (max / mean absolute difference, and how many responses
+   would change at the 2-decimal rounding the APIs return)
+3. Benchmark single-row (median / p99) and full-dataset batch latency
+
+Serve the exports with INFERENCE_BACKEND=onnx. Needs requirements-onnx.txt.
+
+Usage:
+    python export_onnx.py
+    python export_onnx.py --model scenario --tolerance 1e-4
+"""
+
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from config import (
+    DATASET_PATH, MODEL_PATH, ENCODER_PATH, MODEL_ONNX_PATH,
+    SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH, SCENARIO_ONNX_PATH
+)
+from feature_engine import create_lagged_features
+from hashing import file_digest
+from hyperparam_search import single_row_latency
+from onnx_backend import OnnxPredictor, SOURCE_DIGEST_KEY
+
+# Model kind -> (sklearn model path, encoder path, ONNX output path)
+MODEL_KINDS = {
+    'lagged': (MODEL_PATH, ENCODER_PATH, MODEL_ONNX_PATH),
+    'scenario': (SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH, SCENARIO_ONNX_PATH)
+}
+
+
+def convert(model, n_features, path, target_opset=None, metadata=None):
+    """Write model to path as ONNX, with metadata as string metadata_props"""
+    from onnx.helper import set_model_props
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    onnx_model = convert_sklearn(model, initial_types=[('input', FloatTensorType([None, n_features]))],
+                                 target_opset=target_opset)
+    if metadata:
+        set_model_props(onnx_model, {key: str(value) for key, value in metadata.items()})
+    with open(path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+
+
+def dataset_matrix(kind, df, encoder):
+    """Model feature matrix for every usable row of the dataset"""
+    df = df[df['Country'].isin(encoder.classes_)]
+    if kind == 'lagged':
+        from train_model import prepare_features
+        X, _, _ = prepare_features(create_lagged_features(df), encoder=encoder, fit_encoder=False)
+    else:
+        from train_scenario_model import prepare_features
+        X, _, _, _ = prepare_features(df.dropna().copy(), encoder=encoder, fit_encoder=False)
+    return X.to_numpy(dtype=np.float64)
+
+
+def batch_latency(model, X, repeats=10):
+    """Median seconds to predict all of X"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def export_and_check(kind, df, target_opset=None):
+    model_path, encoder_path, onnx_path = MODEL_KINDS[kind]
+    source_digest = file_digest(model_path)
+    model = joblib.load(model_path)
+    encoder = joblib.load(encoder_path)
+    X = dataset_matrix(kind, df, encoder)
+
+    print(f"\n🔄 Converting {model_path} -> {onnx_path}...")
+    convert(model, X.shape[1], onnx_path, target_opset,
+            metadata={SOURCE_DIGEST_KEY: source_digest, 'source_path': model_path})
+    predictor = OnnxPredictor(onnx_path)
+
+    expected = model.predict(X)
+    actual = predictor.predict(X)
+    diff = np.abs(expected - actual)
+    sklearn_single = single_row_latency(model, X[:1])
+    onnx_single = single_row_latency(predictor, X[:1])
+
+    return {
+        'model': kind,
+        'rows': len(X),
+        'max_abs_diff': float(diff.max()),
+        'mean_abs_diff': float(diff.mean()),
+        'rounded_mismatches': int((np.round(expected, 2) != np.round(actual, 2)).sum()),
+        'sklearn_single_ms_median': sklearn_single[0],
+        'sklearn_single_ms_p99': sklearn_single[1],
+        'onnx_single_ms_median': onnx_single[0],
+        'onnx_single_ms_p99': onnx_single[1],
+        'sklearn_batch_ms': batch_latency(model, X) * 1000,
+        'onnx_batch_ms': batch_latency(predictor, X) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the GDP models to ONNX and check parity')
+    parser.add_argument('--model', choices=['lagged', 'scenario', 'all'], default='all')
+    parser.add_argument('--tolerance', type=float, default=1e-3,
+                        help='Fail when any prediction differs from scikit-learn by more than this')
+    parser.add_argument('--target-opset', type=int, default=None)
+    parser.add_argument('--output', default='onnx_report.txt')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ONNX EXPORT & PARITY CHECK")
+    print("=" * 60)
+
+    df = pd.read_csv(DATASET_PATH)
+    kinds = list(MODEL_KINDS) if args.model == 'all' else [args.model]
+    results = []
+    for kind in kinds:
+        result = export_and_check(kind, df, args.target_opset)
+        results.append(result)
+        status = '✅' if result['max_abs_diff'] <= args.tolerance else '❌'
+        print(f"   {status} {kind}: max |diff| {result['max_abs_diff']:.2e} over {result['rows']} rows, "
+              f"{result['rounded_mismatches']} rounded response(s) differ")
+        print(f"   Single row: sklearn {result['sklearn_single_ms_median']:.3f}ms -> "
+              f"onnx {result['onnx_single_ms_median']:.3f}ms | "
+              f"Batch: sklearn {result['sklearn_batch_ms']:.1f}ms -> onnx {result['onnx_batch_ms']:.1f}ms")
+
+    report = pd.DataFrame(results)
+    table = report.to_string(index=False, float_format=lambda v: f"{v:.4g}")
+    with open(args.output, 'w') as f:
+        f.write("ONNX EXPORT & PARITY CHECK\n")
+        f.write("=" * 60 + "\n")
+        f.write(f"Dataset: {DATASET_PATH}, tolerance {args.tolerance}\n\n")
+        f.write(table + "\n")
+    print(f"\n💾 Report saved as '{args.output}'")
+
+    failed = [r['model'] for r in results if r['max_abs_diff'] > args.tolerance]
+    if failed:
+        print(f"❌ Parity check failed for: {', '.join(failed)} - keep INFERENCE_BACKEND=sklearn")
+        raise SystemExit(1)
+    print("✅ Parity check passed - serve with INFERENCE_BACKEND=onnx")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Vectorized Feature Engine for per-country time series
+Shared by the training and evaluation scripts
+
+The data is sorted by (Country, Year) once. Country boundaries become integer
+offsets, so every lag / rolling feature for every indicator is a whole-array
+NumPy operation on a (rows x indicators) matrix - no groupby per feature:
+
+- Lag L:            shift the matrix down L rows, blank the first L rows of each country
+- Rolling mean w:   difference of cumulative sums, blank the first rows of each country
+- Rolling std w:    same trick on cumulative sums of squares (sample std, ddof=1)
+
+Rolling windows end at t-shift (default 1), so like Lag1 they only use
+information available before year t. Any NaN inside a window gives NaN,
+matching pandas rolling(w).mean() / .std().
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# The six economic indicators used by both models
+INDICATOR_COLUMNS = [
+    'Population_Growth_Rate',
+    'Exports of goods and services_Growth_Rate',
+    'Imports of goods and services_Growth_Rate',
+    'Gross capital formation_Growth_Rate',
+    'Final consumption expenditure_Growth_Rate',
+    'Government_Expenditure_Growth_Rate'
+]
+
+
+def country_offsets(countries):
+    """
+    Group structure of a (Country, Year)-sorted column
+
+    Returns:
+        tuple: (starts, position) - first row of each country, and each row's
+        position within its own country (0 for the first year)
+    """
+    countries = np.asarray(countries)
+    is_start = np.ones(len(countries), dtype=bool)
+    is_start[1:] = countries[1:] != countries[:-1]
+    starts = np.flatnonzero(is_start)
+    group = np.cumsum(is_start) - 1
+    position = np.arange(len(countries)) - starts[group]
+    return starts, position
+
+
+def _lag(values, position, lag):
+    out = np.full_like(values, np.nan)
+    out[lag:] = values[:-lag]
+    out[position < lag] = np.nan
+    return out
+
+
+def _window_sums(values, window, shift):
+    """Sum and NaN count of each window of `window` rows ending at row i - shift"""
+    n = len(values)
+    nan_mask = np.isnan(values)
+    cumsum = np.zeros((n + 1, values.shape[1]))
+    cumsum[1:] = np.cumsum(np.where(nan_mask, 0.0, values), axis=0)
+    cumsq = np.zeros((n + 1, values.shape[1]))
+    cumsq[1:] = np.cumsum(np.where(nan_mask, 0.0, values ** 2), axis=0)
+    cumnan = np.zeros((n + 1, values.shape[1]))
+    cumnan[1:] = np.cumsum(nan_mask, axis=0)
+
+    # Window covers rows [i - shift - window + 1, i - shift]
+    end = np.arange(n) - shift + 1
+    begin = end - window
+    valid_index = begin >= 0
+    end = np.clip(end, 0, n)
+    begin = np.clip(begin, 0, n)
+
+    sums = cumsum[end] - cumsum[begin]
+    sumsq = cumsq[end] - cumsq[begin]
+    nans = cumnan[end] - cumnan[begin]
+    return sums, sumsq, nans, valid_index
+
+
+def compute_features(df, indicators=None, lags=(1,), rolling_windows=(),
+                     volatility_windows=(), rolling_shift=1):
+    """
+    Compute lag, rolling-mean and rolling-volatility features in one pass
+
+    Args:
+        df: DataFrame with Country, Year and the indicator columns
+        indicators: columns to derive features from (default: INDICATOR_COLUMNS)
+        lags: lags to compute, e.g. (1, 2, 3) -> {indicator}_Lag1 ...
+        rolling_windows: window sizes for {indicator}_RollMean{w}
+        volatility_windows: window sizes for {indicator}_RollStd{w}
+        rolling_shift: rolling windows end at year t - rolling_shift
+
+    Returns:
+        DataFrame sorted by (Country, Year) with a fresh index and the new
+        columns appended (rows are not dropped)
+    """
+    indicators = INDICATOR_COLUMNS if indicators is None else list(indicators)
+
+    df = df.sort_values(['Country', 'Year'], kind='mergesort').reset_index(drop=True)
+    values = df[indicators].to_numpy(dtype=np.float64)
+    _, position = country_offsets(df['Country'].to_numpy())
+
+    blocks = []
+    names = []
+
+    for lag in lags:
+        blocks.append(_lag(values, position, lag))
+        names += [f'{name}_Lag{lag}' for name in indicators]
+
+    for window in sorted(set(rolling_windows) | set(volatility_windows)):
+        sums, sumsq, nans, valid_index = _window_sums(values, window, rolling_shift)
+        # First full window of each country starts at position shift + window - 1
+        invalid = (~valid_index | (position < rolling_shift + window - 1))[:, None] | (nans > 0)
+
+        if window in rolling_windows:
+            mean = sums / window
+            mean[invalid] = np.nan
+            blocks.append(mean)
+            names += [f'{name}_RollMean{window}' for name in indicators]
+
+        if window in volatility_windows:
+            if window < 2:
+                raise ValueError("Volatility windows must be at least 2 years")
+            variance = (sumsq - sums ** 2 / window) / (window - 1)
+            std = np.sqrt(np.clip(variance, 0.0, None))
+            std[invalid] = np.nan
+            blocks.append(std)
+            names += [f'{name}_RollStd{window}' for name in indicators]
+
+    if not blocks:
+        return df
+
+    features = pd.DataFrame(np.hstack(blocks), columns=names, index=df.index)
+    return pd.concat([df, features], axis=1)
+
+
+def create_lagged_features(df):
+    """
+    Create lagged features (T-1) to predict GDP at time T
+    This prevents data leakage by using previous year's data
+
+    Args:
+        df: DataFrame with columns [Country, Year, features...]
+
+    Returns:
+        DataFrame with lagged features
+    """
+    print("\n📊 Creating lagged features (T-1)...")
+
+    # Lags are computed within each country, so data doesn't bleed between countries
+    df = compute_features(df, INDICATOR_COLUMNS, lags=(1,))
+
+    # Drop rows with NaN values created by shifting
+    # (first year for each country will have NaN)
+    rows_before = len(df)
+    df = df.dropna()
+    rows_after = len(df)
+    print(f"   Dropped {rows_before - rows_after} rows with NaN values from lagging")
+    print(f"   Remaining samples: {rows_after}")
+
+    return df
@@ -73,6 +73,31 @@ export async function fetchHistoricalData(country: string): Promise<HistoricalDa
   return data;
 }
 
+export interface BulkHistoryResponse {
+  series: Record<string, HistoricalDataPoint[]>;
+  missing: string[];
+}
+
+/**
+ * Fetch historical GDP data for several countries in one request
+ * @param countries - Names of the countries
+ * @returns Promise with each country's data points and any unknown countries
+ */
+export async function fetchHistoricalDataBulk(countries: string[]): Promise<BulkHistoryResponse> {
+  const params = new URLSearchParams();
+  countries.forEach((country) => params.append('country', country));
+  const url = `${API_BASE_URL}/api/history/bulk?${params.toString()}`;
+  
+  const response = await fetch(url);
+  
+  if (!response.ok) {
+    throw new Error(`Failed to fetch historical data: ${response.statusText}`);
+  }
+  
+  const data = await response.json();
+  return data;
+}
+
 /**
  * Submit scenario simulation request with economic indicators
  * @param data - Scenario simulation request payload
@@ -0,0 +1,18 @@
+"""
+Content hashes of files
+
+Shared by the training side (build_graph.py, ingest.py, export_onnx.py) and
+the serving side (onnx_backend.py). It depends on the standard library only,
+so importing it does not pull training code into the API processes.
+"""
+
+import hashlib
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,184 @@
+"""
+Precomputed historical data for the /api/history endpoints
+Shared by app.py and app_scenario.py
+
+Built once at startup from the dataset:
+- per-country slices, already serialized as JSON records, so /api/history
+  and the bulk endpoint never filter the full table per request
+- one snapshot of the full dataset (every country, every field), serialized
+  and gzip-compressed once and served as-is by /api/history/all
+
+Requests may narrow a response with query parameters (parse_history_options):
+fields=GDP_Growth,Investment_Growth selects fields, from=2000&to=2010
+selects a year range (a binary search on each country's sorted years) and
+shape=columnar returns one array per field instead of records that repeat
+every key. Non-default queries are serialized once and cached.
+"""
+
+import gzip
+import hashlib
+import json
+from functools import lru_cache
+
+import numpy as np
+
+# API field name -> dataset column
+FIELD_COLUMNS = {
+    'GDP_Growth': 'GDP_Growth_Rate',
+    'Exports_Growth': 'Exports of goods and services_Growth_Rate',
+    'Imports_Growth': 'Imports of goods and services_Growth_Rate',
+    'Population_Growth': 'Population_Growth_Rate',
+    'Investment_Growth': 'Gross capital formation_Growth_Rate',
+    'Consumption_Growth': 'Final consumption expenditure_Growth_Rate',
+    'Govt_Spend_Growth': 'Government_Expenditure_Growth_Rate'
+}
+
+# Fields returned when a request does not ask for specific ones
+DEFAULT_FIELDS = ['GDP_Growth', 'Exports_Growth', 'Imports_Growth']
+
+# Response shapes: one dict per year, or one array per field
+SHAPES = ['records', 'columnar']
+
+
+def _dumps(obj):
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def _records(country, years, columns, fields):
+    """Row-oriented records with NaN as null"""
+    return [
+        {'Country': country, 'Year': int(year),
+         **{field: (None if np.isnan(columns[field][i]) else float(columns[field][i])) for field in fields}}
+        for i, year in enumerate(years)
+    ]
+
+
+def _columnar(country, years, columns, fields):
+    """One array per field with NaN as null"""
+    return {
+        'Country': country,
+        'Year': years.tolist(),
+        **{field: [None if v != v else v for v in columns[field].tolist()] for field in fields}
+    }
+
+
+def parse_history_options(args, available_fields):
+    """
+    Read the fields / from / to / shape query parameters
+
+    Returns:
+        tuple: (query, error_message) - query is None when the request uses
+        the defaults, else a hashable (fields, year_from, year_to, shape) tuple
+    """
+    raw_fields = args.get('fields')
+    raw_from, raw_to = args.get('from'), args.get('to')
+    shape = args.get('shape', 'records')
+
+    if raw_fields is None and raw_from is None and raw_to is None and shape == 'records':
+        return None, None
+
+    fields = tuple(DEFAULT_FIELDS)
+    if raw_fields is not None:
+        fields = tuple(dict.fromkeys(f.strip() for f in raw_fields.split(',') if f.strip()))
+        unknown = [f for f in fields if f not in available_fields]
+        if not fields or unknown:
+            return None, f'fields must be a comma-separated list of: {", ".join(available_fields)}'
+
+    try:
+        year_from = int(raw_from) if raw_from is not None else None
+        year_to = int(raw_to) if raw_to is not None else None
+    except ValueError:
+        return None, 'from and to must be integer years'
+    if year_from is not None and year_to is not None and year_from > year_to:
+        return None, 'from must not be after to'
+
+    if shape not in SHAPES:
+        return None, f'shape must be one of: {", ".join(SHAPES)}'
+
+    return (fields, year_from, year_to, shape), None
+
+
+class HistoryStore:
+    """Per-country historical series with pre-serialized responses"""
+
+    def __init__(self, df):
+        fields = [field for field, column in FIELD_COLUMNS.items() if column in df.columns]
+        df = df.sort_values(['Country', 'Year'])
+
+        self.fields = fields
+        self.default_fields = [field for field in DEFAULT_FIELDS if field in fields]
+        self.year_range = (int(df['Year'].min()), int(df['Year'].max())) if len(df) else (None, None)
+
+        # Per-country arrays: {country: (years, {field: values})}
+        self._series = {}
+        for country, group in df.groupby('Country', sort=True):
+            self._series[country] = (
+                group['Year'].to_numpy(dtype=np.int64),
+                {field: group[FIELD_COLUMNS[field]].to_numpy(dtype=np.float64) for field in fields}
+            )
+        self.countries = list(self._series)
+
+        # Default-field records per country, serialized once
+        self._default_json = {
+            country: _dumps(_records(country, years, columns, self.default_fields))
+            for country, (years, columns) in self._series.items()
+        }
+
+        # Full-dataset snapshot, gzip-compressed once
+        snapshot = '{"fields":' + _dumps(fields) + ',"series":{' + ','.join(
+            _dumps(country) + ':' + _dumps(_records(country, years, columns, fields))
+            for country, (years, columns) in self._series.items()
+        ) + '}}'
+        self.snapshot = snapshot.encode()
+        self.snapshot_gzip = gzip.compress(self.snapshot, compresslevel=9)
+        self.snapshot_etag = hashlib.sha256(self.snapshot).hexdigest()[:32]
+
+        self._query_json = lru_cache(maxsize=4096)(self._serialize_query)
+
+    def __contains__(self, country):
+        return country in self._series
+
+    def __len__(self):
+        return len(self._series)
+
+    def _serialize_query(self, country, query):
+        fields, year_from, year_to, shape = query
+        years, columns = self._series[country]
+
+        start = np.searchsorted(years, year_from, side='left') if year_from is not None else 0
+        stop = np.searchsorted(years, year_to, side='right') if year_to is not None else len(years)
+        columns = {field: columns[field][start:stop] for field in fields}
+
+        if shape == 'columnar':
+            return _dumps(_columnar(country, years[start:stop], columns, fields))
+        return _dumps(_records(country, years[start:stop], columns, fields))
+
+    def country_json(self, country, query=None):
+        """
+        Serialized history of one country, or None if unknown
+
+        Args:
+            query: output of parse_history_options; None for default-field records
+        """
+        if country not in self._series:
+            return None
+        if query is None:
+            return self._default_json[country]
+        return self._query_json(country, query)
+
+    def bulk_json(self, countries, query=None):
+        """
+        Serialized {"series": {country: history}, "missing": [...]} for many
+        countries, assembled from the per-country slices
+
+        Returns:
+            tuple: (json string, list of unknown countries)
+        """
+        found, missing = [], []
+        for country in dict.fromkeys(countries):   # de-duplicate, keep order
+            (found if country in self._series else missing).append(country)
+
+        body = '{"series":{' + ','.join(
+            _dumps(country) + ':' + self.country_json(country, query) for country in found
+        ) + '},"missing":' + _dumps(missing) + '}'
+        return body, missing
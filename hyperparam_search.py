@@ -0,0 +1,236 @@
+"""
+Parallel Time-Series Hyperparameter Search
+Evaluates RandomForest parameter grids (or random samples of them) with
+time-aware cross-validation and records the serving cost of every candidate
+
+Folds are expanding windows: for each cutoff year the model trains on all
+years before the cutoff and is validated on the following `horizon` years,
+the same idea as TEMPORAL_SPLIT_YEAR applied at several points in time.
+
+Fits run on a process pool. The feature matrix is written once to .npy files
+and memory-mapped read-only by every worker, and rows are sorted by year so
+each fold's train / validation sets are contiguous slices (views, not copies).
+
+For every candidate we record:
+- mean / per-fold validation R² and RMSE
+- fit time
+- pickled model size
+- single-row inference latency (median and p99)
+
+Usage:
+    python hyperparam_search.py
+    python hyperparam_search.py --model scenario --n-iter 20 --latency-budget-ms 5
+    python hyperparam_search.py --grid grid.json --cutoffs 2010 2013 2016 2019
+"""
+
+import argparse
+import itertools
+import json
+import os
+import pickle
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error, r2_score
+
+from config import DATASET_PATH, TEMPORAL_SPLIT_YEAR, MODEL_PARAMS, SCENARIO_MODEL_PARAMS
+from feature_engine import create_lagged_features
+
+
+DEFAULT_GRID = {
+    'n_estimators': [50, 100, 200],
+    'max_depth': [6, 10, 15, None],
+    'min_samples_split': [2, 5, 10],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': [1.0, 0.6, 'sqrt']
+}
+
+# Per-worker memory-mapped data, populated once by _init_worker
+_shared = {}
+
+
+def load_matrices(kind):
+    """Feature matrix, target, year and country for the lagged or scenario model, sorted by year"""
+    df = pd.read_csv(DATASET_PATH)
+
+    if kind == 'lagged':
+        from train_model import prepare_features
+        df = create_lagged_features(df)
+        X, y, _ = prepare_features(df, fit_encoder=True)
+    else:
+        from train_scenario_model import prepare_features
+        X, y, _, _ = prepare_features(df, fit_encoder=True)
+
+    order = np.argsort(df['Year'].to_numpy(), kind='mergesort')
+    # Trees work in float32 internally; converting once avoids a copy per fit
+    X = np.ascontiguousarray(X.to_numpy(dtype=np.float32)[order])
+    y = np.ascontiguousarray(y.to_numpy(dtype=np.float64)[order])
+    years = df['Year'].to_numpy()[order]
+    countries = df['Country'].to_numpy()[order]
+    return X, y, years, countries
+
+
+def make_folds(years, cutoffs, horizon):
+    """(cutoff, train_end, val_end) row offsets for each cutoff on year-sorted data"""
+    folds = []
+    for cutoff in cutoffs:
+        train_end = int(np.searchsorted(years, cutoff, side='left'))
+        val_end = int(np.searchsorted(years, cutoff + horizon, side='left'))
+        if train_end == 0 or val_end == train_end:
+            print(f"   ⚠️ Skipping cutoff {cutoff}: empty train or validation window")
+            continue
+        folds.append((cutoff, train_end, val_end))
+    return folds
+
+
+def candidate_params(grid, n_iter=None, seed=42):
+    """All grid combinations, or a reproducible random sample of n_iter of them"""
+    keys = sorted(grid)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    if n_iter is not None and n_iter < len(combos):
+        combos = random.Random(seed).sample(combos, n_iter)
+    return combos
+
+
+def _init_worker(data_dir):
+    """Memory-map the shared arrays once per worker (no per-task copies)"""
+    _shared['X'] = np.load(os.path.join(data_dir, 'X.npy'), mmap_mode='r')
+    _shared['y'] = np.load(os.path.join(data_dir, 'y.npy'), mmap_mode='r')
+
+
+def single_row_latency(model, row, repeats=200):
+    """Median and p99 latency (ms) of model.predict on one row"""
+    model.predict(row)  # warm-up
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        model.predict(row)
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1000), float(np.percentile(timings, 99) * 1000)
+
+
+def evaluate_candidate(params, base_params, folds):
+    """Fit one configuration on every fold and measure its serving cost"""
+    X, y = _shared['X'], _shared['y']
+    fold_r2, fold_rmse, fit_times = [], [], []
+    model = None
+
+    for _, train_end, val_end in folds:
+        model = RandomForestRegressor(**{**base_params, **params, 'n_jobs': 1})
+        start = time.perf_counter()
+        model.fit(X[:train_end], y[:train_end])
+        fit_times.append(time.perf_counter() - start)
+
+        y_pred = model.predict(X[train_end:val_end])
+        fold_r2.append(r2_score(y[train_end:val_end], y_pred))
+        fold_rmse.append(float(np.sqrt(mean_squared_error(y[train_end:val_end], y_pred))))
+
+    # Serving cost measured on the last fold's model (largest training set)
+    size_bytes = len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    latency_median, latency_p99 = single_row_latency(model, np.asarray(X[:1]))
+
+    return {
+        'params': json.dumps(params, sort_keys=True),
+        'mean_r2': float(np.mean(fold_r2)),
+        'std_r2': float(np.std(fold_r2)),
+        'mean_rmse': float(np.mean(fold_rmse)),
+        'fold_r2': json.dumps([round(v, 4) for v in fold_r2]),
+        'fit_seconds': float(np.mean(fit_times)),
+        'model_mb': size_bytes / 1e6,
+        'latency_ms_median': latency_median,
+        'latency_ms_p99': latency_p99
+    }
+
+
+def run_search(kind, grid, cutoffs, horizon=3, n_iter=None, workers=None, seed=42):
+    """Run the search and return a DataFrame of results sorted by mean R²"""
+    X, y, years, _ = load_matrices(kind)
+    folds = make_folds(years, cutoffs, horizon)
+    if not folds:
+        raise ValueError("No usable folds for the given cutoffs")
+
+    base_params = MODEL_PARAMS if kind == 'lagged' else SCENARIO_MODEL_PARAMS
+    candidates = candidate_params(grid, n_iter, seed)
+
+    print(f"\n🔍 {len(candidates)} candidates x {len(folds)} folds "
+          f"(cutoffs: {', '.join(str(f[0]) for f in folds)}, horizon {horizon}y)")
+
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        np.save(os.path.join(data_dir, 'X.npy'), X)
+        np.save(os.path.join(data_dir, 'y.npy'), y)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(data_dir,)) as pool:
+            futures = [pool.submit(evaluate_candidate, params, base_params, folds)
+                       for params in candidates]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                results.append(result)
+                print(f"   [{done}/{len(candidates)}] R²={result['mean_r2']:.4f} "
+                      f"p99={result['latency_ms_p99']:.2f}ms {result['params']}")
+
+    return pd.DataFrame(results).sort_values('mean_r2', ascending=False).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time-series hyperparameter search')
+    parser.add_argument('--model', choices=['lagged', 'scenario'], default='lagged')
+    parser.add_argument('--grid', help='JSON file mapping parameter -> list of values')
+    parser.add_argument('--n-iter', type=int, default=None,
+                        help='Randomly sample this many grid points (default: full grid)')
+    parser.add_argument('--cutoffs', type=int, nargs='+',
+                        default=[TEMPORAL_SPLIT_YEAR - 9, TEMPORAL_SPLIT_YEAR - 6,
+                                 TEMPORAL_SPLIT_YEAR - 3, TEMPORAL_SPLIT_YEAR],
+                        help='Fold cutoff years (train on years before each cutoff)')
+    parser.add_argument('--horizon', type=int, default=3, help='Validation years per fold')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--latency-budget-ms', type=float, default=None,
+                        help='Mark candidates whose p99 single-row latency fits this budget')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='hyperparam_results.csv')
+    args = parser.parse_args()
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid) as f:
+            grid = json.load(f)
+
+    print("=" * 60)
+    print(f"HYPERPARAMETER SEARCH - {args.model.upper()} MODEL")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    results = run_search(args.model, grid, args.cutoffs, args.horizon,
+                         args.n_iter, args.workers, args.seed)
+
+    if args.latency_budget_ms is not None:
+        results['within_budget'] = results['latency_ms_p99'] <= args.latency_budget_ms
+
+    results.to_csv(args.output, index=False)
+
+    print("\n🏆 Top candidates:")
+    columns = ['mean_r2', 'mean_rmse', 'fit_seconds', 'model_mb', 'latency_ms_p99', 'params']
+    if 'within_budget' in results:
+        columns.insert(-1, 'within_budget')
+    print(results[columns].head(10).to_string(index=False))
+
+    if 'within_budget' in results:
+        within = results[results['within_budget']]
+        if within.empty:
+            print(f"\n⚠️ No candidate meets the {args.latency_budget_ms}ms p99 budget")
+        else:
+            best = within.iloc[0]
+            print(f"\n✅ Best within {args.latency_budget_ms}ms budget: R²={best['mean_r2']:.4f} {best['params']}")
+
+    print(f"\n💾 Results saved to: {args.output}")
+    print(f"⏱️ Search took {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
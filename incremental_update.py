@@ -0,0 +1,298 @@
+"""
+Incremental Model Update when a new year of data arrives
+Avoids rerunning train_model.py / train_scenario_model.py over the full history
+
+Steps:
+1. Detect (Country, Year) rows in the new dataset later than the last year
+   the deployed model was trained on for that country
+2. Compute features only for the affected tail: the recent window of each
+   country (plus the rows its lags need), not the whole history
+3. Measure drift: RMSE of the deployed model on the new rows relative to its
+   reference RMSE
+4. Below the drift threshold: keep every existing tree and add --add-trees
+   new trees (warm_start) fitted on the refreshed recent window.
+   Above it, for unseen countries, or past --max-trees: full refit
+5. Save a new versioned artifact (model_registry.py) and report the time
+   saved compared with a full retrain
+
+Usage:
+    python incremental_update.py --data final_data_with_year_2022.csv
+    python incremental_update.py --model scenario --data new.csv --drift-threshold 1.3
+    python incremental_update.py --data new.csv --install
+"""
+
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error
+
+from config import (
+    DATASET_PATH, MODEL_PATH, ENCODER_PATH,
+    SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH,
+    MODEL_ESTIMATOR, SCENARIO_MODEL_ESTIMATOR, TEMPORAL_SPLIT_YEAR
+)
+from estimators import make_estimator, LAGGED_PARAMS, SCENARIO_PARAMS
+from feature_engine import INDICATOR_COLUMNS, compute_features
+from model_registry import save_version, load_version
+
+# Model kind -> (registry name, deployed model path, encoder path, estimator, params)
+MODEL_KINDS = {
+    'lagged': ('gdp_model', MODEL_PATH, ENCODER_PATH, MODEL_ESTIMATOR, LAGGED_PARAMS),
+    'scenario': ('gdp_scenario_model', SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH,
+                 SCENARIO_MODEL_ESTIMATOR, SCENARIO_PARAMS)
+}
+
+# Lags needed before the first row of a tail (lagged model uses Lag1)
+MAX_LAG = 1
+
+
+def load_deployed(kind, previous_data):
+    """
+    Latest registry version, or the flat deployed files on first use
+
+    The flat model carries the (Country, Year) rows it was fitted on as
+    model.trained_keys_ (set by the training scripts). Models saved before
+    that are assumed to have seen previous_data, restricted to the years
+    before TEMPORAL_SPLIT_YEAR for the lagged model.
+
+    Returns:
+        tuple: (model, encoder, metadata) - metadata['trained_keys'] lists the
+        (Country, Year) rows the model has seen
+    """
+    name, model_path, encoder_path, _, _ = MODEL_KINDS[kind]
+    loaded = load_version(name)
+    if loaded is not None:
+        return loaded
+
+    model = joblib.load(model_path)
+    trained_keys = getattr(model, 'trained_keys_', None)
+    if trained_keys is not None:
+        print(f"   No registry version yet - using {model_path} ({len(trained_keys)} training rows recorded)")
+    else:
+        previous = pd.read_csv(previous_data, usecols=['Country', 'Year'])
+        if kind == 'lagged':
+            # train_model.py fits on years before the temporal split only
+            previous = previous[previous['Year'] < TEMPORAL_SPLIT_YEAR]
+        print(f"   ⚠️ {model_path} has no recorded training rows - assuming the "
+              f"{len(previous)} {kind} training rows of {previous_data}")
+        trained_keys = previous[['Country', 'Year']].values.tolist()
+
+    metadata = {'version': None, 'trained_keys': trained_keys}
+    return model, joblib.load(encoder_path), metadata
+
+
+def find_new_rows(df, trained_keys):
+    """
+    Rows of df after the last trained year of their country (every row of an unseen country)
+
+    Earlier rows missing from trained_keys are not new data: e.g. each
+    country's first year has no lag, and the scenario model's held-out rows.
+    """
+    last_year = pd.DataFrame(trained_keys, columns=['Country', 'Year']).groupby('Country')['Year'].max()
+    cutoff = df['Country'].map(last_year)
+    return df[(cutoff.isna() | (df['Year'] > cutoff)).to_numpy()]
+
+
+def tail_features(kind, df, tail_countries, since_year, encoder):
+    """
+    Features for rows with Year >= since_year in the affected countries only
+
+    The lagged model needs MAX_LAG earlier rows per country to compute lags,
+    so those are included in the computation and dropped afterwards.
+    """
+    tail = df[df['Country'].isin(tail_countries) & (df['Year'] >= since_year - MAX_LAG)]
+
+    if kind == 'lagged':
+        from train_model import prepare_features
+        tail = compute_features(tail, INDICATOR_COLUMNS, lags=(1,))
+        tail = tail[tail['Year'] >= since_year].dropna()
+        X, y, _ = prepare_features(tail, encoder=encoder, fit_encoder=False)
+    else:
+        from train_scenario_model import prepare_features
+        tail = tail[tail['Year'] >= since_year].dropna().copy()
+        X, y, _, _ = prepare_features(tail, encoder=encoder, fit_encoder=False)
+
+    return X, y, tail
+
+
+def full_features(kind, df):
+    """Features and a freshly fitted encoder over the whole history"""
+    if kind == 'lagged':
+        from train_model import prepare_features
+        from feature_engine import create_lagged_features
+        X, y, encoder = prepare_features(create_lagged_features(df), fit_encoder=True)
+    else:
+        from train_scenario_model import prepare_features
+        X, y, encoder, _ = prepare_features(df.copy(), fit_encoder=True)
+    return X, y, encoder
+
+
+def reference_rmse(model, metadata, kind, df, encoder, new_years):
+    """RMSE the model is expected to have: stored value, or its fit on the latest known years"""
+    if metadata.get('reference_rmse'):
+        return float(metadata['reference_rmse'])
+
+    known = df[(df['Year'] < min(new_years)) & df['Country'].isin(encoder.classes_)]
+    recent_years = sorted(known['Year'].unique())[-3:]
+    X, y, _ = tail_features(kind, known, known['Country'].unique(), recent_years[0], encoder)
+    return float(np.sqrt(mean_squared_error(y, model.predict(X))))
+
+
+def run_update(kind, data_path, previous_data, add_trees=20, drift_threshold=1.5,
+               window_years=10, max_trees=300, measure_full=False):
+    name, _, _, estimator, params_by_estimator = MODEL_KINDS[kind]
+    params = params_by_estimator[estimator]
+    start = time.perf_counter()
+
+    model, encoder, metadata = load_deployed(kind, previous_data)
+    df = pd.read_csv(data_path)
+
+    # 1. Detect new rows
+    new_rows = find_new_rows(df, metadata['trained_keys'])
+    if new_rows.empty:
+        print("\n✅ No new (Country, Year) rows - model is up to date")
+        return None
+
+    new_years = sorted(new_rows['Year'].unique())
+    new_countries = sorted(new_rows['Country'].unique())
+    unseen = sorted(set(new_countries) - set(encoder.classes_))
+    print(f"\n🆕 {len(new_rows)} new rows: years {new_years[0]}-{new_years[-1]}, "
+          f"{len(new_countries)} countries")
+
+    # 2. Drift on the new rows (only countries the encoder knows)
+    known_new = [c for c in new_countries if c not in unseen]
+    X_new, y_new, _ = tail_features(kind, df, known_new, new_years[0], encoder)
+    ref_rmse = reference_rmse(model, metadata, kind, df, encoder, new_years)
+    new_rmse = float(np.sqrt(mean_squared_error(y_new, model.predict(X_new)))) if len(X_new) else ref_rmse
+    drift = new_rmse / ref_rmse if ref_rmse > 0 else np.inf
+    print(f"📉 RMSE on new rows {new_rmse:.4f} vs reference {ref_rmse:.4f} (drift x{drift:.2f})")
+
+    n_existing = len(getattr(model, 'estimators_', []))
+    reasons = []
+    if unseen:
+        reasons.append(f"unseen countries: {', '.join(unseen[:5])}")
+    if drift > drift_threshold:
+        reasons.append(f"drift x{drift:.2f} > x{drift_threshold}")
+    if n_existing + add_trees > max_trees:
+        reasons.append(f"forest would exceed {max_trees} trees")
+    if not hasattr(model, 'estimators_'):
+        reasons.append(f"{type(model).__name__} cannot grow incrementally")
+
+    full_seconds = metadata.get('full_fit_seconds')
+    full_rows = metadata.get('full_fit_rows')
+
+    if reasons:
+        # 3a. Full refit over the whole history
+        print(f"\n🔁 Full refit ({'; '.join(reasons)})")
+        X, y, encoder = full_features(kind, df)
+        model = make_estimator(estimator, params_by_estimator)
+        fit_start = time.perf_counter()
+        model.fit(X, y)
+        fit_seconds = time.perf_counter() - fit_start
+        mode = 'full_refit'
+        full_seconds, full_rows = fit_seconds, len(X)
+    else:
+        # 3b. Keep existing trees, add new ones trained on the refreshed recent window
+        window_start = new_years[-1] - window_years + 1
+        X_win, y_win, _ = tail_features(kind, df, df['Country'].unique(), window_start, encoder)
+        print(f"\n🌱 Adding {add_trees} trees fitted on {len(X_win)} rows "
+              f"({window_start}-{new_years[-1]})")
+
+        model.set_params(warm_start=True, n_estimators=n_existing + add_trees)
+        fit_start = time.perf_counter()
+        model.fit(X_win, y_win)
+        fit_seconds = time.perf_counter() - fit_start
+        model.set_params(warm_start=False)
+        mode = 'incremental'
+
+        if measure_full:
+            print("   ⏱️ Measuring a full retrain for comparison...")
+            X_full, y_full, _ = full_features(kind, df)
+            timing_start = time.perf_counter()
+            make_estimator(estimator, params_by_estimator).fit(X_full, y_full)
+            full_seconds, full_rows = time.perf_counter() - timing_start, len(X_full)
+        elif not full_seconds:
+            # Estimate: per-tree cost scales roughly with rows x log(rows)
+            per_tree = fit_seconds / add_trees
+            full_rows = len(df)
+            scale = (full_rows * np.log(full_rows)) / (len(X_win) * np.log(max(len(X_win), 2)))
+            full_seconds = per_tree * scale * params.get('n_estimators', 100)
+
+    elapsed = time.perf_counter() - start
+    trained_keys = metadata['trained_keys'] + new_rows[['Country', 'Year']].values.tolist()
+    if mode == 'full_refit':
+        trained_keys = df[['Country', 'Year']].values.tolist()
+    model.trained_keys_ = trained_keys
+
+    version, version_dir = save_version(name, model, encoder, {
+        'parent_version': metadata.get('version'),
+        'mode': mode,
+        'n_estimators': len(getattr(model, 'estimators_', [])),
+        'new_rows': len(new_rows),
+        'new_years': [int(y) for y in new_years],
+        'drift_ratio': drift,
+        'reference_rmse': ref_rmse if mode == 'incremental' else None,
+        'fit_seconds': fit_seconds,
+        'update_seconds': elapsed,
+        'full_fit_seconds': full_seconds,
+        'full_fit_rows': full_rows,
+        'trained_keys': trained_keys
+    })
+
+    return {
+        'mode': mode,
+        'version': version,
+        'version_dir': version_dir,
+        'model': model,
+        'encoder': encoder,
+        'elapsed': elapsed,
+        'full_seconds': full_seconds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally update a deployed GDP model')
+    parser.add_argument('--model', choices=sorted(MODEL_KINDS), default='lagged')
+    parser.add_argument('--data', default=DATASET_PATH, help='Dataset including the new year(s)')
+    parser.add_argument('--previous-data', default=DATASET_PATH,
+                        help='Dataset the deployed model was trained on (first run only)')
+    parser.add_argument('--add-trees', type=int, default=20, help='Trees to add per update')
+    parser.add_argument('--drift-threshold', type=float, default=1.5,
+                        help='Full refit when new-row RMSE exceeds reference RMSE by this factor')
+    parser.add_argument('--window-years', type=int, default=10,
+                        help='Recent years used to fit the added trees')
+    parser.add_argument('--max-trees', type=int, default=300, help='Full refit beyond this forest size')
+    parser.add_argument('--measure-full', action='store_true',
+                        help='Time an actual full retrain instead of estimating it')
+    parser.add_argument('--install', action='store_true',
+                        help='Also write the updated model to the config.py serving paths')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"INCREMENTAL UPDATE - {args.model.upper()} MODEL")
+    print("=" * 60)
+
+    result = run_update(args.model, args.data, args.previous_data, args.add_trees,
+                        args.drift_threshold, args.window_years, args.max_trees, args.measure_full)
+    if result is None:
+        return
+
+    print(f"\n💾 Saved version {result['version']} ({result['mode']}) to: {result['version_dir']}")
+    print(f"⏱️ Update took {result['elapsed']:.2f}s")
+    if result['mode'] == 'incremental' and result['full_seconds']:
+        saved = result['full_seconds'] - result['elapsed']
+        print(f"   Full retrain: ~{result['full_seconds']:.2f}s -> saved ~{saved:.2f}s "
+              f"({result['full_seconds'] / max(result['elapsed'], 1e-9):.1f}x faster)")
+
+    if args.install:
+        _, model_path, encoder_path, _, _ = MODEL_KINDS[args.model]
+        joblib.dump(result['model'], model_path)
+        joblib.dump(result['encoder'], encoder_path)
+        print(f"💾 Installed to: {model_path}, {encoder_path}")
+
+
+if __name__ == "__main__":
+    main()
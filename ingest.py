@@ -0,0 +1,220 @@
+"""
+Typed Ingestion Pipeline - one canonical store for the GDP dataset
+
+The repository root holds many overlapping CSV variants, and every consumer
+parses them as float64 with an object Country column. This script:
+
+1. Validates a chosen source CSV against the declared SCHEMA (required
+   columns, integer years in range, numeric indicators, no infinities,
+   unique (Country, Year) rows)
+2. Converts it to compact dtypes: float32 indicators, categorical Country
+   (categories sorted, so category codes match the LabelEncoder codes),
+   int16 Year
+3. Writes it to CANONICAL_STORE_PATH (.parquet needs pyarrow, .pkl always
+   works) with a metadata sidecar recording the source and its sha256
+4. Reports the memory saved and the load-time speedup over the CSV
+
+Consumers load the store with load_canonical().
+
+Usage:
+    python ingest.py
+    python ingest.py --source final_data_with_year.csv --output gdp_canonical.pkl
+    python ingest.py --check-only --source fully_corrected_data.csv
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import DATASET_PATH, CANONICAL_STORE_PATH
+from feature_engine import INDICATOR_COLUMNS
+from hashing import file_digest
+
+SCHEMA_VERSION = 1
+
+# Column -> dtype and constraints. Columns not listed here are dropped.
+SCHEMA = {
+    'Country': {'dtype': 'category', 'nullable': False},
+    'Year': {'dtype': 'int16', 'nullable': False, 'min': 1900, 'max': 2100},
+    **{col: {'dtype': 'float32', 'nullable': True} for col in INDICATOR_COLUMNS},
+    'GDP_Growth_Rate': {'dtype': 'float32', 'nullable': False}
+}
+
+KEY_COLUMNS = ['Country', 'Year']
+
+
+class SchemaError(ValueError):
+    """Source data does not match SCHEMA"""
+
+    def __init__(self, source, problems):
+        self.problems = problems
+        super().__init__(f"{source} failed schema validation:\n  - " + "\n  - ".join(problems))
+
+
+def validate(df, source='source'):
+    """
+    Check df against SCHEMA and return it converted to compact dtypes
+
+    Raises:
+        SchemaError: listing every problem found, not just the first
+    """
+    problems = []
+
+    missing = [col for col in SCHEMA if col not in df.columns]
+    if missing:
+        raise SchemaError(source, [f"missing column(s): {', '.join(missing)}"])
+
+    out = {}
+    for col, spec in SCHEMA.items():
+        values = df[col]
+
+        if spec['dtype'] == 'category':
+            values = values.astype('string').str.strip()
+            empty = values.isna() | (values == '')
+            if empty.any():
+                problems.append(f"{col}: {int(empty.sum())} empty value(s)")
+            out[col] = pd.Categorical(values.astype(object), categories=sorted(values.dropna().unique()))
+            continue
+
+        numeric = pd.to_numeric(values, errors='coerce')
+        unparsable = numeric.isna() & values.notna()
+        if unparsable.any():
+            examples = ', '.join(repr(v) for v in values[unparsable].unique()[:3])
+            problems.append(f"{col}: {int(unparsable.sum())} non-numeric value(s), e.g. {examples}")
+
+        if not spec['nullable'] and numeric.isna().any():
+            problems.append(f"{col}: {int(numeric.isna().sum())} missing value(s)")
+
+        if np.isinf(numeric).any():
+            problems.append(f"{col}: {int(np.isinf(numeric).sum())} infinite value(s)")
+
+        if spec['dtype'].startswith('int'):
+            fractional = numeric.notna() & (numeric != np.floor(numeric))
+            if fractional.any():
+                problems.append(f"{col}: {int(fractional.sum())} non-integer value(s)")
+            out_of_range = (numeric < spec['min']) | (numeric > spec['max'])
+            if out_of_range.any():
+                problems.append(f"{col}: {int(out_of_range.sum())} value(s) outside "
+                                f"{spec['min']}-{spec['max']}")
+
+        out[col] = numeric
+
+    if problems:
+        raise SchemaError(source, problems)
+
+    compact = pd.DataFrame({
+        col: out[col] if SCHEMA[col]['dtype'] == 'category' else out[col].astype(SCHEMA[col]['dtype'])
+        for col in SCHEMA
+    })
+
+    duplicated = compact.duplicated(KEY_COLUMNS)
+    if duplicated.any():
+        examples = compact.loc[duplicated, KEY_COLUMNS].head(3).values.tolist()
+        raise SchemaError(source, [f"{int(duplicated.sum())} duplicate (Country, Year) row(s), "
+                                   f"e.g. {examples}"])
+
+    return compact.sort_values(KEY_COLUMNS, ignore_index=True)
+
+
+def write_store(df, path, metadata):
+    """Write the canonical frame and its metadata sidecar (<path>.json)"""
+    if path.endswith('.parquet'):
+        df.to_parquet(path, index=False)   # needs pyarrow
+    else:
+        df.to_pickle(path)
+
+    with open(path + '.json', 'w') as f:
+        json.dump({'schema_version': SCHEMA_VERSION,
+                   'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+                   **metadata}, f, indent=2)
+
+
+def load_canonical(path=CANONICAL_STORE_PATH):
+    """Canonical dataset with compact dtypes (run ingest.py first)"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def store_metadata(path=CANONICAL_STORE_PATH):
+    """Sidecar metadata of the store, or None if it has not been built"""
+    try:
+        with open(path + '.json') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def median_load_seconds(load, repeats=5):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        load()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a dataset CSV and write the canonical store')
+    parser.add_argument('--source', default=DATASET_PATH)
+    parser.add_argument('--output', default=CANONICAL_STORE_PATH,
+                        help='.pkl, or .parquet (needs pyarrow)')
+    parser.add_argument('--check-only', action='store_true', help='Validate without writing the store')
+    parser.add_argument('--repeats', type=int, default=5, help='Load timings per format')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GDP DATASET INGESTION")
+    print("=" * 60)
+
+    print(f"\n📂 Reading: {args.source}")
+    raw = pd.read_csv(args.source)
+    dropped = [col for col in raw.columns if col not in SCHEMA]
+    if dropped:
+        print(f"   Dropping {len(dropped)} column(s) not in the schema: {', '.join(dropped[:5])}"
+              f"{' ...' if len(dropped) > 5 else ''}")
+
+    try:
+        compact = validate(raw, args.source)
+    except SchemaError as e:
+        print(f"\n❌ {e}")
+        raise SystemExit(1)
+
+    print(f"✅ Schema valid: {len(compact)} rows, {compact['Country'].nunique()} countries, "
+          f"years {compact['Year'].min()} - {compact['Year'].max()}")
+    if args.check_only:
+        return
+
+    metadata = {
+        'source': args.source,
+        'source_sha256': file_digest(args.source),
+        'rows': len(compact),
+        'countries': int(compact['Country'].nunique()),
+        'years': [int(compact['Year'].min()), int(compact['Year'].max())]
+    }
+    write_store(compact, args.output, metadata)
+    print(f"💾 Canonical store written to: {args.output} (+ {args.output}.json)")
+
+    # Memory: the float64/object frame every consumer builds vs the compact one
+    raw_bytes = raw[list(SCHEMA)].memory_usage(deep=True).sum()
+    compact_bytes = compact.memory_usage(deep=True).sum()
+    csv_seconds = median_load_seconds(lambda: pd.read_csv(args.source), args.repeats)
+    store_seconds = median_load_seconds(lambda: load_canonical(args.output), args.repeats)
+
+    print("\n📊 Report:")
+    print("=" * 60)
+    print(f"In-memory size:  CSV frame {raw_bytes / 1e6:.2f} MB -> canonical {compact_bytes / 1e6:.2f} MB "
+          f"({100 * (1 - compact_bytes / raw_bytes):.0f}% saved)")
+    print(f"On disk:         CSV {os.path.getsize(args.source) / 1e6:.2f} MB -> "
+          f"store {os.path.getsize(args.output) / 1e6:.2f} MB")
+    print(f"Load time:       read_csv {csv_seconds * 1000:.1f} ms -> store {store_seconds * 1000:.1f} ms "
+          f"({csv_seconds / max(store_seconds, 1e-9):.1f}x faster)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Versioned model artifacts
+Each saved version is a directory models/<name>/<version>/ holding its
+artifacts (e.g. model.pkl, encoder.pkl) and metadata.json, so deployments can
+be traced and rolled back. The flat config.py paths stay the serving default.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import joblib
+
+from config import MODEL_REGISTRY_DIR
+
+
+def new_version():
+    """Sortable UTC timestamp version id"""
+    return datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')
+
+
+def save_bundle(name, artifacts, metadata, version=None, registry_dir=MODEL_REGISTRY_DIR):
+    """
+    Write a set of artifacts ({filename: object}) and metadata as one version
+
+    Returns:
+        tuple: (version, version_dir)
+    """
+    version = version or new_version()
+    version_dir = os.path.join(registry_dir, name, version)
+    os.makedirs(version_dir, exist_ok=True)
+
+    for filename, obj in artifacts.items():
+        joblib.dump(obj, os.path.join(version_dir, filename))
+
+    metadata = {'name': name, 'version': version, 'artifacts': sorted(artifacts), **metadata}
+    with open(os.path.join(version_dir, 'metadata.json'), 'w') as f:
+        json.dump(metadata, f, indent=2, default=str)
+
+    return version, version_dir
+
+
+def save_version(name, model, encoder, metadata, version=None, registry_dir=MODEL_REGISTRY_DIR):
+    """
+    Write model, encoder and metadata as a new version
+
+    Returns:
+        tuple: (version, version_dir)
+    """
+    return save_bundle(name, {'model.pkl': model, 'encoder.pkl': encoder},
+                       metadata, version, registry_dir)
+
+
+def list_versions(name, registry_dir=MODEL_REGISTRY_DIR):
+    """Version ids of a model, oldest first"""
+    model_dir = os.path.join(registry_dir, name)
+    if not os.path.isdir(model_dir):
+        return []
+    return sorted(
+        v for v in os.listdir(model_dir)
+        if os.path.exists(os.path.join(model_dir, v, 'metadata.json'))
+    )
+
+
+def load_version(name, version=None, registry_dir=MODEL_REGISTRY_DIR):
+    """
+    Load a version (latest when version is None)
+
+    Returns:
+        tuple: (model, encoder, metadata), or None if no version exists
+    """
+    if version is None:
+        versions = list_versions(name, registry_dir)
+        if not versions:
+            return None
+        version = versions[-1]
+
+    version_dir = os.path.join(registry_dir, name, version)
+    with open(os.path.join(version_dir, 'metadata.json')) as f:
+        metadata = json.load(f)
+
+    model = joblib.load(os.path.join(version_dir, 'model.pkl'))
+    encoder = joblib.load(os.path.join(version_dir, 'encoder.pkl'))
+    return model, encoder, metadata
@@ -0,0 +1,78 @@
+"""
+ONNX Runtime inference backend for the serving APIs
+
+With INFERENCE_BACKEND=onnx, app.py and app_scenario.py score requests with
+the ONNX exports written by export_onnx.py instead of the scikit-learn
+models. onnxruntime is optional (requirements-onnx.txt); without it, or
+without the exported file, the APIs fall back to scikit-learn.
+
+The scikit-learn models are still loaded: per-tree uncertainty and /explain
+read their tree structures directly. Each export records the sha256 of the
+.pkl it was converted from; if the .pkl has since been retrained, the stale
+export is not served and the APIs fall back to scikit-learn.
+"""
+
+import numpy as np
+
+from config import INFERENCE_BACKEND
+from hashing import file_digest
+
+# ONNX metadata_props key holding the sha256 of the source .pkl
+SOURCE_DIGEST_KEY = 'source_sha256'
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+
+class OnnxPredictor:
+    """model.predict-compatible wrapper around an onnxruntime session"""
+
+    def __init__(self, path, threads=1):
+        if ort is None:
+            raise ImportError("onnxruntime is not installed (pip install -r requirements-onnx.txt)")
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.path = path
+        self.metadata = dict(self.session.get_modelmeta().custom_metadata_map)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        return self.session.run(None, {self.input_name: X})[0].ravel().astype(np.float64)
+
+
+def load_predictor(model, onnx_path, model_path, backend=INFERENCE_BACKEND):
+    """
+    Object whose predict() the serving path calls
+
+    Args:
+        model: the scikit-learn model loaded from model_path
+        onnx_path: its ONNX export
+        model_path: the .pkl the export must have been converted from
+
+    Returns:
+        tuple: (predictor, backend name) - an OnnxPredictor when the onnx
+        backend is selected, available and exported from model_path's current
+        content, otherwise the scikit-learn model
+    """
+    if model is None or backend != 'onnx':
+        return model, 'sklearn'
+
+    try:
+        predictor = OnnxPredictor(onnx_path)
+        exported_from = predictor.metadata.get(SOURCE_DIGEST_KEY)
+        if exported_from != file_digest(model_path):
+            print(f"⚠️ {onnx_path} was not exported from the current {model_path} "
+                  f"(re-run export_onnx.py) - using scikit-learn")
+            return model, 'sklearn'
+        print(f"✅ ONNX Runtime backend loaded from: {onnx_path}")
+        return predictor, 'onnx'
+    except Exception as e:
+        print(f"⚠️ ONNX backend unavailable ({e}) - using scikit-learn")
+        return model, 'sklearn'
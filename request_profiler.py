@@ -0,0 +1,141 @@
+"""
+On-demand sampling profiler for individual API requests
+
+While a selected request runs, a background thread samples the stack of the
+request thread every REQUEST_PROFILE_INTERVAL seconds. When the request ends,
+the samples are written to REQUEST_PROFILE_DIR in folded-stack format
+("frame;frame;frame count" per line). That format feeds flamegraph.pl,
+speedscope or inferno directly.
+
+Which requests are profiled:
+- REQUEST_PROFILING=1: a REQUEST_PROFILE_SAMPLE_RATE share of requests to the
+  selected endpoints (REQUEST_PROFILE_ENDPOINTS)
+- ADMIN_TOKEN set: any request to those endpoints sent with a matching
+  X-Profile-Token header; the file name is returned in the X-Profile-File
+  response header
+
+With neither variable set, no request hooks are registered at all, so the
+disabled profiler costs nothing.
+"""
+
+import hmac
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import g, request
+
+from config import (
+    ADMIN_TOKEN, REQUEST_PROFILING, REQUEST_PROFILE_SAMPLE_RATE,
+    REQUEST_PROFILE_INTERVAL, REQUEST_PROFILE_DIR, REQUEST_PROFILE_ENDPOINTS
+)
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval"""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.samples
+
+
+def write_folded(samples, path):
+    with open(path, 'w') as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+class RequestProfiler:
+    """Decides which requests to profile and writes their folded stacks"""
+
+    def __init__(self, enabled=REQUEST_PROFILING, token=ADMIN_TOKEN,
+                 sample_rate=REQUEST_PROFILE_SAMPLE_RATE, interval=REQUEST_PROFILE_INTERVAL,
+                 output_dir=REQUEST_PROFILE_DIR, endpoints=REQUEST_PROFILE_ENDPOINTS):
+        self.enabled = enabled
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.output_dir = output_dir
+        self.endpoints = set(endpoints)
+        self.profiles_written = 0
+        self._sequence = itertools.count()
+
+    @property
+    def active(self):
+        return bool(self.enabled or self.token)
+
+    def init_app(self, app):
+        """Register request hooks only when profiling can be triggered"""
+        if not self.active:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+
+    def _selected(self):
+        if request.endpoint not in self.endpoints:
+            return False, False
+        header = request.headers.get('X-Profile-Token')
+        if self.token and header and hmac.compare_digest(header, self.token):
+            return True, True
+        return self.enabled and random.random() < self.sample_rate, False
+
+    def _start(self):
+        selected, by_token = self._selected()
+        if not selected:
+            return None
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        g.profile = (sampler, time.perf_counter(), by_token)
+        sampler.start()
+        return None
+
+    def _stop(self):
+        profile = g.pop('profile', None)
+        if profile is None:
+            return None
+        sampler, start, by_token = profile
+        samples = sampler.stop()
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        filename = (f"{time.strftime('%Y%m%d-%H%M%S')}_{request.endpoint}_{duration_ms:.0f}ms_"
+                    f"{os.getpid()}-{next(self._sequence)}.folded")
+        write_folded(samples, os.path.join(self.output_dir, filename))
+        self.profiles_written += 1
+        return filename, by_token
+
+    def _finish(self, response):
+        written = self._stop()
+        if written is not None and written[1]:
+            response.headers['X-Profile-File'] = written[0]
+        return response
+
+    def _teardown(self, exc=None):
+        # Requests that ended in an unhandled exception skip after_request
+        self._stop()
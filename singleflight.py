@@ -0,0 +1,113 @@
+"""
+Single-flight deduplication of identical concurrent requests
+
+Dashboards with many viewers send the same /api/history or /simulate request
+at the same moment. With @single_flight(flight) on a route, the first such
+request computes the response; identical requests that arrive while it is
+in flight wait for it and reuse its body, status and headers instead of
+repeating the work. Nothing is cached once the leader finishes, so responses
+never go stale.
+
+Requests are identical when they have the same endpoint, query parameters
+(order-independent) and JSON body (key-order-independent).
+"""
+
+import json
+import threading
+from functools import wraps
+
+from flask import Response, current_app, request
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs one computation per key at a time; concurrent callers share it"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn):
+        """
+        Result of fn(), computed once for all concurrent callers with this key
+
+        Returns:
+            tuple: (result, shared) - shared is True when another caller computed it
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        with self._lock:
+            total = self.executed + self.shared
+            return {
+                'executed': self.executed,
+                'deduplicated': self.shared,
+                'in_flight': len(self._calls),
+                'dedup_ratio': self.shared / total if total else 0.0
+            }
+
+
+def request_key():
+    """Canonical identity of the current request, or None if it has an unreadable body"""
+    args = tuple(sorted(request.args.items(multi=True)))
+    body = None
+    if request.method in ('POST', 'PUT'):
+        data = request.get_json(silent=True)
+        if data is None and request.get_data():
+            return None
+        body = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return (request.endpoint, request.method, args, body)
+
+
+def single_flight(flight):
+    """Route decorator sharing one response among identical concurrent requests"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request_key()
+            if key is None:
+                return view(*args, **kwargs)
+
+            def compute():
+                response = current_app.make_response(view(*args, **kwargs))
+                return response.get_data(), response.status_code, list(response.headers.items())
+
+            # Each request gets its own Response object (after_request hooks mutate it)
+            (body, status, headers), _ = flight.do(key, compute)
+            return Response(body, status=status, headers=headers)
+        return wrapper
+    return decorator
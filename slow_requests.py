@@ -0,0 +1,114 @@
+"""
+Slow-request ring buffer with per-stage timings
+
+Every request carries a StageTimer. Prediction views mark the end of each
+stage with mark_stage('validate' / 'encode' / 'predict'); whatever follows
+the last mark (building the JSON response) is recorded as 'serialize', and
+the wait before the view started (admission queue) as 'queue'.
+
+Requests slower than SLOW_REQUEST_THRESHOLD_MS are appended to a fixed-size
+ring buffer (SLOW_REQUEST_BUFFER_SIZE, oldest dropped first) with their
+route, status, a hash of the canonical payload and the stage breakdown.
+GET /debug/slow returns them slowest first; it requires the X-Admin-Token
+header to match ADMIN_TOKEN and does not exist when no token is configured.
+"""
+
+import hashlib
+import hmac
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+from flask import g, request
+
+from config import ADMIN_TOKEN, SLOW_REQUEST_THRESHOLD_MS, SLOW_REQUEST_BUFFER_SIZE
+from singleflight import request_key
+
+
+class StageTimer:
+    """Accumulates the time between consecutive marks under stage names"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self._last = self.start
+        self.stages = {}
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.stages[name] = self.stages.get(name, 0.0) + (now - self._last)
+        self._last = now
+
+    def finish(self, name):
+        """Close the remaining time under name and return the total"""
+        self.mark(name)
+        return self._last - self.start
+
+
+def mark_stage(name):
+    """End the current stage of this request (no-op outside a timed request)"""
+    timer = g.get('stage_timer')
+    if timer is not None:
+        timer.mark(name)
+
+
+def is_admin_request():
+    header = request.headers.get('X-Admin-Token')
+    return bool(ADMIN_TOKEN and header and hmac.compare_digest(header, ADMIN_TOKEN))
+
+
+class SlowRequestLog:
+    """Keeps the most recent requests above the latency threshold"""
+
+    def __init__(self, threshold_ms=SLOW_REQUEST_THRESHOLD_MS, size=SLOW_REQUEST_BUFFER_SIZE):
+        self.threshold_ms = threshold_ms
+        self.size = size
+        self._entries = deque(maxlen=size)
+        self.recorded = 0
+
+    def init_app(self, app):
+        """
+        Register the timing hooks
+
+        Register after admission control so queue wait shows up as its own
+        stage (measured from the access log's request start, if present).
+        """
+        app.before_request(self._start)
+        app.after_request(self._finish)
+
+    def _start(self):
+        g.stage_timer = StageTimer()
+
+    def _finish(self, response):
+        timer = g.pop('stage_timer', None)
+        if timer is None:
+            return response
+
+        handler = timer.finish('serialize' if timer.stages else 'handler')
+        request_start = g.get('request_start', timer.start)
+        queue = timer.start - request_start
+        duration_ms = (handler + queue) * 1000
+        if duration_ms < self.threshold_ms:
+            return response
+
+        stages = {'queue': queue, **timer.stages}
+        key = request_key()
+        self._entries.append({
+            'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule else request.path,
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 3),
+            'payload_hash': hashlib.sha256(repr(key).encode()).hexdigest()[:16] if key else None,
+            'stages_ms': {name: round(seconds * 1000, 3) for name, seconds in stages.items()}
+        })
+        self.recorded += 1
+        return response
+
+    def report(self):
+        entries = sorted(list(self._entries), key=lambda e: e['duration_ms'], reverse=True)
+        return {
+            'threshold_ms': self.threshold_ms,
+            'buffer_size': self.size,
+            'recorded_total': self.recorded,
+            'requests': entries
+        }
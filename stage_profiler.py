@@ -0,0 +1,165 @@
+"""
+Training Pipeline Stage Profiler
+Records wall time, CPU time and peak resident memory for each named stage
+
+Usage in a pipeline:
+    profiler = StageProfiler(profile=args.profile)
+    with profiler.stage('load_csv'):
+        df = pd.read_csv(...)
+    ...
+    profiler.print_summary()
+    profiler.write_json('training_profile.json')
+    profiler.dump_slowest_profile('training_profile')   # only with profile=True
+
+Peak RSS is sampled from /proc/self/statm by a background thread while a stage
+runs (Linux). Elsewhere it falls back to the process high-water mark from
+resource.getrusage, or is reported as unavailable (e.g. Windows).
+With profile=True every stage runs under cProfile and the profile of the
+slowest stage is kept for dumping.
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_STATM_PATH = '/proc/self/statm'
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss_bytes():
+    """Resident set size now, or None when the platform doesn't expose it"""
+    try:
+        with open(_STATM_PATH) as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def max_rss_bytes():
+    """Process-lifetime peak RSS from getrusage, or None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class _RssSampler(threading.Thread):
+    """Tracks the highest RSS seen while a stage runs"""
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_bytes()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            rss = current_rss_bytes()
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+        return self.peak
+
+
+class StageProfiler:
+    """Collects per-stage timings and memory for one pipeline run"""
+
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.stages = []
+        self._slowest_profile = None
+        self._slowest_wall = -1.0
+        self._slowest_name = None
+
+    @contextmanager
+    def stage(self, name, **details):
+        """Time a stage; details (e.g. cached=True) are stored with its record"""
+        sampler = _RssSampler() if current_rss_bytes() is not None else None
+        if sampler is not None:
+            sampler.start()
+        profiler = cProfile.Profile() if self.profile else None
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            peak = sampler.stop() if sampler is not None else max_rss_bytes()
+
+            self.stages.append({
+                'stage': name,
+                'wall_seconds': wall,
+                'cpu_seconds': cpu,
+                'peak_rss_mb': peak / 1e6 if peak is not None else None,
+                **details
+            })
+
+            if profiler is not None and wall > self._slowest_wall:
+                self._slowest_wall = wall
+                self._slowest_name = name
+                self._slowest_profile = profiler
+
+    def total_wall(self):
+        return sum(s['wall_seconds'] for s in self.stages)
+
+    def print_summary(self):
+        total = self.total_wall() or 1e-9
+        print("\n⏱️ Stage Profile:")
+        print("=" * 70)
+        print(f"{'Stage':<32}{'Wall (s)':>10}{'CPU (s)':>10}{'% Wall':>8}{'Peak RSS':>12}")
+        for s in self.stages:
+            peak = f"{s['peak_rss_mb']:.0f} MB" if s['peak_rss_mb'] is not None else 'n/a'
+            label = s['stage']
+            if 'cached' in s:
+                label += ' (cached)' if s['cached'] else ' (rebuilt)'
+            print(f"{label:<32}{s['wall_seconds']:>10.3f}{s['cpu_seconds']:>10.3f}"
+                  f"{100 * s['wall_seconds'] / total:>7.1f}%{peak:>12}")
+        print(f"{'TOTAL':<32}{self.total_wall():>10.3f}")
+        print("=" * 70)
+
+    def write_json(self, path):
+        with open(path, 'w') as f:
+            json.dump({
+                'total_wall_seconds': self.total_wall(),
+                'stages': self.stages
+            }, f, indent=2)
+        print(f"💾 Stage report saved to: {path}")
+
+    def dump_slowest_profile(self, prefix, top=15):
+        """Write the cProfile dump of the slowest stage and print its hot spots"""
+        if self._slowest_profile is None:
+            return None
+
+        path = f"{prefix}_{self._slowest_name}.prof"
+        self._slowest_profile.dump_stats(path)
+
+        stream = io.StringIO()
+        pstats.Stats(self._slowest_profile, stream=stream).sort_stats('cumulative').print_stats(top)
+        print(f"\n🔬 Slowest stage: {self._slowest_name} ({self._slowest_wall:.3f}s)")
+        print(stream.getvalue())
+        print(f"💾 Profile saved to: {path} (open with snakeviz or python -m pstats)")
+        return path
@@ -0,0 +1,184 @@
+"""
+Non-blocking structured logging for the Flask APIs
+
+- Records are written as JSON lines by a background QueueListener thread.
+  The request thread only puts the record on a bounded queue; if the queue
+  is full the record is dropped and counted, never waited on. Tracebacks are
+  formatted on the listener thread as well.
+- Access log: one record per request (method, path, status, duration).
+  Successful requests are sampled (LOG_SUCCESS_SAMPLE_RATE); 4xx/5xx are
+  always kept.
+- Repeated error traces are rate-limited: a full traceback per distinct
+  (exception type, origin) at most once every LOG_ERROR_TRACE_INTERVAL
+  seconds. In between, the error is logged without the traceback, and the
+  next traced record carries the number of traces that were suppressed.
+
+Usage:
+    logger = configure_logging('gdp-api')
+    init_request_logging(app, logger)
+    ...
+    except Exception as e:
+        log_exception(logger, 'Prediction failed', e, endpoint='/predict')
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, request
+
+from config import LOG_LEVEL, LOG_QUEUE_SIZE, LOG_SUCCESS_SAMPLE_RATE, LOG_ERROR_TRACE_INTERVAL
+
+# Standard LogRecord attributes; anything else passed via extra= is a field
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listeners = {}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update({key: value for key, value in vars(record).items()
+                      if key not in _RESERVED and not key.startswith('_')})
+        if record.exc_info:
+            entry['traceback'] = ''.join(traceback.format_exception(*record.exc_info))
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller: full queue -> drop and count"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Defer message and traceback formatting to the listener thread
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class ErrorTraceLimiter(logging.Filter):
+    """Keep one full traceback per (exception type, origin) per interval"""
+
+    def __init__(self, interval_seconds):
+        super().__init__()
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._last_traced = {}
+        self._suppressed = {}
+
+    def filter(self, record):
+        if not record.exc_info or record.exc_info[1] is None:
+            return True
+
+        exc_type, exc, tb = record.exc_info
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        origin = (tb.tb_frame.f_code.co_filename, tb.tb_lineno) if tb is not None else None
+        key = (exc_type.__name__, origin)
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_traced.get(key, -self.interval_seconds) >= self.interval_seconds:
+                self._last_traced[key] = now
+                suppressed = self._suppressed.pop(key, 0)
+                if suppressed:
+                    record.suppressed_traces = suppressed
+                return True
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+
+        # Still logged, just without the traceback
+        record.exc_info = None
+        record.error = f'{exc_type.__name__}: {exc}'
+        record.trace_rate_limited = True
+        return True
+
+
+def configure_logging(name, stream=None):
+    """
+    Logger writing JSON lines through a background thread
+
+    Idempotent per name; the listener is flushed and stopped at exit.
+    """
+    logger = logging.getLogger(name)
+    if name in _listeners:
+        return logger
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    listener = QueueListener(log_queue, output, respect_handler_level=False)
+
+    handler = DroppingQueueHandler(log_queue)
+    logger.addHandler(handler)
+    logger.addFilter(ErrorTraceLimiter(LOG_ERROR_TRACE_INTERVAL))
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+
+    listener.start()
+    atexit.register(listener.stop)
+    _listeners[name] = (listener, handler)
+    return logger
+
+
+def dropped_records(name):
+    """Records dropped because the queue was full"""
+    entry = _listeners.get(name)
+    return entry[1].dropped if entry else 0
+
+
+def log_exception(logger, message, exc, **fields):
+    """Error record with (rate-limited) traceback for exc"""
+    logger.error(message, exc_info=(type(exc), exc, exc.__traceback__), extra=fields)
+
+
+def init_request_logging(app, logger, sample_rate=LOG_SUCCESS_SAMPLE_RATE):
+    """
+    Sampled access log for every request
+
+    Register before other before_request hooks (e.g. admission control) so
+    shed requests are timed and logged too.
+    """
+    @app.before_request
+    def _start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def _access_log(response):
+        start = g.get('request_start')
+        if start is None:
+            return response
+        status = response.status_code
+        if status < 400 and random.random() >= sample_rate:
+            return response
+
+        logger.info('request', extra={
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': status,
+            'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+            'sample_rate': 1.0 if status >= 400 else sample_rate
+        })
+        return response
@@ -0,0 +1,61 @@
+"""
+Per-country piecewise-linear surrogate of the scenario model
+
+A drop-in replacement for model.predict on the scenario feature matrix
+(Country_Encoded first, then the six growth rates), built by distill.py.
+
+For each country the prediction is an additive piecewise-linear function of
+the six indicators: intercept + linear terms + hinge terms max(0, x - knot)
+at a few knots per indicator. Inputs are clamped to the range the surrogate
+was distilled on, which matches the forest being flat outside its data.
+
+Scoring is a clamp, a broadcast subtraction and one dot product per row
+instead of walking every tree of the forest.
+"""
+
+import numpy as np
+
+
+def design_matrix(Z, knots):
+    """
+    Basis expansion [1, z, max(0, z - knot)...] for rows of indicator values
+
+    Args:
+        Z: (n, features) indicator values
+        knots: (features, K) or per-row (n, features, K) knot positions
+    Returns:
+        (n, 1 + features * (K + 1)) basis matrix
+    """
+    n = len(Z)
+    hinges = np.maximum(0.0, Z[:, :, None] - knots)
+    return np.hstack([np.ones((n, 1), dtype=Z.dtype), Z, hinges.reshape(n, -1)])
+
+
+class PiecewiseLinearSurrogate:
+    """Per-country additive piecewise-linear model with clamped inputs"""
+
+    def __init__(self, lower, upper, knots, weights, metadata=None):
+        self.lower = np.asarray(lower, dtype=np.float64)        # (countries, features)
+        self.upper = np.asarray(upper, dtype=np.float64)        # (countries, features)
+        self.knots = np.asarray(knots, dtype=np.float64)        # (countries, features, K)
+        self.weights = np.asarray(weights, dtype=np.float64)    # (countries, basis)
+        self.metadata = metadata or {}
+
+    @property
+    def n_countries(self):
+        return len(self.weights)
+
+    @property
+    def p99_error(self):
+        """Worst p99 |error| vs the teacher in the distillation report (nan if missing)"""
+        report = self.metadata.get('report', {})
+        errors = [report[check]['p99_abs_error'] for check in ('holdout', 'dataset') if check in report]
+        return max(errors) if errors else float('nan')
+
+    def predict(self, X):
+        """Predictions for a scenario feature matrix, like model.predict"""
+        X = np.asarray(X, dtype=np.float64)
+        codes = X[:, 0].astype(np.intp)
+        Z = np.clip(X[:, 1:], self.lower[codes], self.upper[codes])
+        basis = design_matrix(Z, self.knots[codes])
+        return np.einsum('ij,ij->i', basis, self.weights[codes])
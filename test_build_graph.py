@@ -0,0 +1,159 @@
+"""
+Test script for the content-hashed build graph (build_graph.py)
+Checks that editing a module a stage calls into, or a module that one
+imports, invalidates its cache key, and that force=True rebuilds
+"""
+
+import os
+import sys
+import tempfile
+
+from build_graph import BuildGraph
+
+DEP_MODULE = 'build_graph_test_dependency'
+CONST_MODULE = 'build_graph_test_constants'
+
+
+def doubled(value):
+    import build_graph_test_dependency
+    return build_graph_test_dependency.scale(value)
+
+
+def plus_one(value):
+    return value + 1
+
+
+def write_dependency(directory, body, module=DEP_MODULE):
+    with open(os.path.join(directory, f'{module}.py'), 'w') as f:
+        f.write(body)
+
+
+def make_graph(cache_dir):
+    graph = BuildGraph(cache_dir)
+    graph.add('doubled', doubled, params={'value': 21}, modules=[DEP_MODULE])
+    graph.add('plus_one', plus_one, deps=['doubled'])
+    return graph
+
+
+def test_dependency_edit_makes_stage_stale():
+    """Editing a listed module changes the stage key and its dependents' keys"""
+    print("\n" + "="*60)
+    print("TEST 1: Editing a Stage Dependency")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        try:
+            write_dependency(tmp, "def scale(x):\n    return x * 2\n")
+            graph = make_graph(os.path.join(tmp, 'cache'))
+            assert graph.build('plus_one') == 43
+            assert graph.is_fresh('doubled') and graph.is_fresh('plus_one')
+
+            # Unchanged code: a new run finds both stages cached
+            graph = make_graph(os.path.join(tmp, 'cache'))
+            assert graph.is_fresh('doubled') and graph.is_fresh('plus_one')
+
+            write_dependency(tmp, "def scale(x):\n    return x * 3\n")
+            graph = make_graph(os.path.join(tmp, 'cache'))
+            print(f"Status after edit: {graph.status()}")
+            assert not graph.is_fresh('doubled')
+            assert not graph.is_fresh('plus_one')
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop(DEP_MODULE, None)
+
+
+def test_imported_module_edit_makes_stage_stale():
+    """Editing a module imported by a listed module (like config.py) is seen too"""
+    print("\n" + "="*60)
+    print("TEST 2: Editing a Transitively Imported Module")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        try:
+            write_dependency(tmp, "FACTOR = 2\n", module=CONST_MODULE)
+            write_dependency(tmp, f"from {CONST_MODULE} import FACTOR\n\n"
+                                  "def scale(x):\n    return x * FACTOR\n")
+            graph = make_graph(os.path.join(tmp, 'cache'))
+            assert graph.build('plus_one') == 43
+
+            write_dependency(tmp, "FACTOR = 3\n", module=CONST_MODULE)
+            graph = make_graph(os.path.join(tmp, 'cache'))
+            print(f"Status after edit: {graph.status()}")
+            assert not graph.is_fresh('doubled')
+            assert not graph.is_fresh('plus_one')
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop(DEP_MODULE, None)
+            sys.modules.pop(CONST_MODULE, None)
+
+
+def test_force_rebuilds():
+    """force=True reruns the stage even after it was built in this run"""
+    print("\n" + "="*60)
+    print("TEST 3: Forced Rebuild")
+    print("="*60)
+
+    calls = []
+
+    def counted(value):
+        calls.append(value)
+        return value
+
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = BuildGraph(tmp)
+        graph.add('counted', counted, params={'value': 1})
+        graph.build('counted')
+        graph.build('counted')
+        assert len(calls) == 1
+        graph.build('counted', force=True)
+        assert len(calls) == 2
+
+
+def test_unknown_module():
+    """A module that cannot be located is an error, not a silently fresh stage"""
+    print("\n" + "="*60)
+    print("TEST 4: Unknown Dependency Module")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        graph = BuildGraph(tmp)
+        graph.add('broken', plus_one, params={'value': 1}, modules=['no_such_module_anywhere'])
+        try:
+            graph.key('broken')
+        except ImportError as e:
+            print(f"Raised: {e}")
+            return
+        raise AssertionError('key() should fail for an unknown module')
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("Dependency Edit Makes Stage Stale", test_dependency_edit_makes_stage_stale),
+        ("Imported Module Edit Makes Stage Stale", test_imported_module_edit_makes_stage_stale),
+        ("Forced Rebuild", test_force_rebuilds),
+        ("Unknown Dependency Module", test_unknown_module)
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✅ {test_name} - PASSED")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test_name} - FAILED: {e}")
+
+    print("\n" + "="*60)
+    print(f"TEST RESULTS: {passed} passed, {failed} failed")
+    print("="*60)
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
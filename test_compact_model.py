@@ -0,0 +1,84 @@
+"""
+Test script for the model compaction tool (compact_model.py)
+Runs every candidate family on a toy forest with the installed scikit-learn
+"""
+
+import sys
+
+import numpy as np
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+
+from compact_model import build_candidates, in_bag_indices
+
+
+def toy_forest():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    y = X[:, 0] * 2 + np.sin(X[:, 1]) + rng.normal(scale=0.1, size=300)
+    forest = RandomForestRegressor(n_estimators=12, max_depth=8, random_state=42, n_jobs=1)
+    forest.fit(X, y)
+    return forest, X, y
+
+
+def test_in_bag_indices():
+    """Bootstrap samples are recovered on every supported scikit-learn version"""
+    print("\n" + "="*60)
+    print(f"TEST 1: In-Bag Indices (scikit-learn {sklearn.__version__})")
+    print("="*60)
+
+    forest, X, _ = toy_forest()
+    samples = in_bag_indices(forest, len(X))
+    assert samples is not None and len(samples) == len(forest.estimators_)
+    assert all(len(s) == len(X) for s in samples)
+
+
+def test_build_candidates():
+    """Every family yields a working candidate"""
+    print("\n" + "="*60)
+    print("TEST 2: Build Candidates")
+    print("="*60)
+
+    forest, X, y = toy_forest()
+    candidates = list(build_candidates(forest, X, y, trees=[4], depths=[3], ccp_alphas=[0.01]))
+    names = [name for name, _, _ in candidates]
+    print(f"Candidates: {names}")
+    assert names == ['full', 'trees=4', 'depth=3', 'ccp_alpha=0.01']
+
+    models = {name: model for name, _, model in candidates}
+    assert len(models['trees=4'].estimators_) == 4
+    assert max(tree.tree_.max_depth for tree in models['depth=3'].estimators_) <= 3
+    for name, model in models.items():
+        assert model.predict(X[:5]).shape == (5,), name
+
+    # Truncating below the full depth changes predictions; at full depth it would not
+    assert not np.allclose(models['depth=3'].predict(X), forest.predict(X))
+
+
+def run_all_tests():
+    """Run all tests"""
+    tests = [
+        ("In-Bag Indices", test_in_bag_indices),
+        ("Build Candidates", test_build_candidates)
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        try:
+            test_func()
+            passed += 1
+            print(f"✅ {test_name} - PASSED")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {test_name} - FAILED: {e}")
+
+    print("\n" + "="*60)
+    print(f"TEST RESULTS: {passed} passed, {failed} failed")
+    print("="*60)
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_all_tests() else 1)
@@ -199,6 +199,91 @@ def test_out_of_range():
     assert response.status_code == 400
 
 
+def test_batch_with_uncertainty():
+    """Test batch prediction with per-tree uncertainty"""
+    print("\n" + "="*60)
+    print("TEST 9: Batch Prediction with Uncertainty")
+    print("="*60)
+    
+    payload = {
+        "inputs": [
+            {"Country": "United States", "Population": 1.1, "Exports": 5.2, "Imports": 4.8,
+             "Investment": 3.5, "Consumption": 2.8, "Govt_Spend": 2.0},
+            {"Country": "India", "Population": 1.2, "Exports": 6.5, "Imports": 5.8,
+             "Investment": 4.5, "Consumption": 4.0, "Govt_Spend": 2.5}
+        ],
+        "include_uncertainty": True,
+        "quantiles": [0.1, 0.9]
+    }
+    
+    response = requests.post(f"{BASE_URL}/predict/batch", json=payload)
+    
+    print(f"Status Code: {response.status_code}")
+    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    assert response.status_code == 200
+    
+    predictions = response.json()['predictions']
+    assert len(predictions) == 2
+    for prediction in predictions:
+        quantiles = prediction['uncertainty']['quantiles']
+        assert quantiles['0.1'] <= quantiles['0.9']
+    
+    # The flag must be a JSON boolean: the string "false" is rejected, not read as true
+    response = requests.post(f"{BASE_URL}/predict/batch", json={**payload, "include_uncertainty": "false"})
+    print(f"String flag status code: {response.status_code}")
+    assert response.status_code == 400
+
+
+def test_history_bulk():
+    """Test multi-country history and the full-dataset snapshot"""
+    print("\n" + "="*60)
+    print("TEST 10: Bulk History")
+    print("="*60)
+    
+    response = requests.get(f"{BASE_URL}/api/history/bulk",
+                            params={"country": ["United States", "India", "Atlantis"]})
+    
+    print(f"Status Code: {response.status_code}")
+    assert response.status_code == 200
+    
+    data = response.json()
+    print(f"Countries returned: {list(data['series'])}, missing: {data['missing']}")
+    assert set(data['series']) == {"United States", "India"}
+    assert data['missing'] == ["Atlantis"]
+    
+    response = requests.get(f"{BASE_URL}/api/history/all")
+    print(f"Snapshot: {len(response.content)} bytes on the wire, "
+          f"Content-Encoding: {response.headers.get('Content-Encoding')}")
+    assert response.status_code == 200
+    assert "United States" in response.json()['series']
+    
+    cached = requests.get(f"{BASE_URL}/api/history/all", headers={"If-None-Match": response.headers['ETag']})
+    assert cached.status_code == 304
+
+
+def test_history_projection():
+    """Test field selection, year range and columnar output of /api/history"""
+    print("\n" + "="*60)
+    print("TEST 11: History Projection and Columnar Shape")
+    print("="*60)
+    
+    params = {"country": "India", "fields": "GDP_Growth,Investment_Growth",
+              "from": 2000, "to": 2010, "shape": "columnar"}
+    response = requests.get(f"{BASE_URL}/api/history", params=params)
+    
+    print(f"Status Code: {response.status_code}")
+    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert set(data) == {"Country", "Year", "GDP_Growth", "Investment_Growth"}
+    assert min(data['Year']) >= 2000 and max(data['Year']) <= 2010
+    assert len(data['GDP_Growth']) == len(data['Year'])
+    
+    response = requests.get(f"{BASE_URL}/api/history", params={"country": "India", "fields": "Unknown"})
+    assert response.status_code == 400
+
+
 def run_all_tests():
     """Run all tests"""
     print("\n" + "🧪 " + "="*58)
@@ -213,7 +298,10 @@ def run_all_tests():
         ("Missing Field", test_missing_field),
         ("Invalid Value", test_invalid_value),
         ("Unknown Country", test_unknown_country),
-        ("Out of Range", test_out_of_range)
+        ("Out of Range", test_out_of_range),
+        ("Batch with Uncertainty", test_batch_with_uncertainty),
+        ("Bulk History", test_history_bulk),
+        ("History Projection", test_history_projection)
     ]
     
     passed = 0
@@ -178,6 +178,54 @@ if r.status_code == 400:
 else:
     print(f"❌ FAILED - Should return 400")
 
+# Test 11: Explain a Scenario
+print("\n1️⃣1️⃣ Explain Scenario (Per-Feature Contributions)")
+print("-" * 60)
+r = requests.post(f"{BASE_URL}/explain", json=export_boost)
+explanation = r.json()
+total = explanation['base_value'] + sum(explanation['contributions'].values())
+print(f"Predicted GDP Growth: {explanation['predicted_gdp_growth']}%")
+print(f"Base value: {explanation['base_value']}")
+for name, value in explanation['contributions'].items():
+    print(f"  {name}: {value:+.4f}")
+if abs(total - explanation['predicted_gdp_growth']) < 0.01:
+    print(f"✅ PASSED - Contributions add up to the prediction")
+else:
+    print(f"❌ FAILED - Contributions sum to {total:.2f}")
+
+# Test 12: Fast Serving Mode (Distilled Surrogate)
+print("\n1️⃣2️⃣ Fast Serving Mode")
+print("-" * 60)
+full = requests.post(f"{BASE_URL}/simulate", json=export_boost).json()
+print(f"Full model: {full['predicted_gdp_growth']}%")
+r = requests.post(f"{BASE_URL}/simulate", json={**export_boost, 'mode': 'fast'})
+if r.status_code == 200:
+    print(f"✅ PASSED - 'fast' mode: {r.json()['predicted_gdp_growth']}%")
+else:
+    print(f"⚠️ SKIPPED - {r.json()['message']}")
+
+# Test 13: Scenario Comparison Matrix
+print("\n1️⃣3️⃣ Scenario Comparison Matrix")
+print("-" * 60)
+rates = {key: value for key, value in export_boost.items() if key != 'Country'}
+comparison = {
+    "scenarios": [
+        {"name": "Export boom", **rates},
+        {"name": "Austerity", **{**rates, "Govt_Spend_Growth_Rate": -5.0, "Consumption_Growth_Rate": 0.0}}
+    ],
+    "countries": ["United States", export_boost["Country"]]
+}
+r = requests.post(f"{BASE_URL}/simulate/compare", json=comparison)
+result = r.json()
+for name, deltas in zip(result['scenarios'], result['delta_vs_baseline']):
+    print(f"{name}: " + ", ".join(f"{country} {delta:+.2f}" for country, delta in zip(result['countries'], deltas)))
+single = requests.post(f"{BASE_URL}/simulate", json=export_boost).json()
+if abs(result['predicted_gdp_growth'][0][result['countries'].index(export_boost['Country'])]
+       - single['predicted_gdp_growth']) < 0.01:
+    print(f"✅ PASSED - Matrix matches /simulate")
+else:
+    print(f"❌ FAILED - Matrix differs from /simulate")
+
 print("\n" + "=" * 60)
 print("ALL TESTS COMPLETED SUCCESSFULLY!")
 print("=" * 60)
@@ -0,0 +1,177 @@
+"""
+Unified Training CLI - builds the lagged and scenario models together
+
+- Loads DATASET_PATH once (train_model.py / train_scenario_model.py each
+  reloaded it; retrain_model.py even used a different file and split)
+- Fits one country encoder on every country, shared by both models
+- Trains the two models concurrently in separate processes, splitting the
+  cores between them
+- Writes all artifacts as one consistent, versioned set (model_registry.py)
+  and optionally installs them to the config.py serving paths
+
+Splits match the individual scripts:
+- lagged model: temporal split at TEMPORAL_SPLIT_YEAR
+- scenario model: 80/20 shuffled split (random_state=42)
+
+Usage:
+    python train_all.py
+    python train_all.py --install
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from config import (
+    DATASET_PATH, MODEL_PATH, ENCODER_PATH,
+    SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH, SCENARIO_FEATURE_INFO_PATH,
+    TEMPORAL_SPLIT_YEAR, MODEL_ESTIMATOR, SCENARIO_MODEL_ESTIMATOR
+)
+from estimators import make_estimator, describe, LAGGED_PARAMS, SCENARIO_PARAMS
+from build_graph import row_keys
+from feature_engine import create_lagged_features
+from model_registry import save_bundle
+
+RELEASE_NAME = 'release'
+
+
+def build_matrices(df, encoder):
+    """Train/test matrices for both models from one loaded dataset"""
+    import train_model
+    import train_scenario_model
+
+    # Lagged model: T-1 features, temporal split
+    lagged = create_lagged_features(df)
+    train_df, test_df = train_model.temporal_train_test_split(lagged, TEMPORAL_SPLIT_YEAR)
+    X_train, y_train, _ = train_model.prepare_features(train_df, encoder=encoder, fit_encoder=False)
+    X_test, y_test, _ = train_model.prepare_features(test_df, encoder=encoder, fit_encoder=False)
+    lagged_data = (X_train, y_train, X_test, y_test)
+    train_keys = {'lagged': row_keys(train_df, X_train)}
+
+    # Scenario model: concurrent features, shuffled 80/20 split
+    X, y, _, feature_columns = train_scenario_model.prepare_features(df.copy(), encoder=encoder, fit_encoder=False)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, shuffle=True)
+    scenario_data = (X_train, y_train, X_test, y_test)
+    train_keys['scenario'] = row_keys(df, X_train)
+
+    return lagged_data, scenario_data, feature_columns, train_keys
+
+
+def fit_model(kind, estimator, params_by_estimator, data, n_jobs):
+    """Fit one model in a worker process and evaluate it"""
+    X_train, y_train, X_test, y_test = data
+    model = make_estimator(estimator, params_by_estimator)
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_jobs)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    y_pred = model.predict(X_test)
+    return kind, model, {
+        'estimator': estimator,
+        'params': params_by_estimator[estimator],
+        'fit_seconds': fit_seconds,
+        'train_rows': len(X_train),
+        'test_rows': len(X_test),
+        'test_r2': r2_score(y_test, y_pred),
+        'test_rmse': float(np.sqrt(mean_squared_error(y_test, y_pred)))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train the lagged and scenario models together')
+    parser.add_argument('--data', default=DATASET_PATH)
+    parser.add_argument('--install', action='store_true',
+                        help='Also write the artifacts to the config.py serving paths')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GDP MODELS - UNIFIED TRAINING")
+    print("=" * 60)
+    start = time.perf_counter()
+
+    # 1. Load data once
+    print(f"\n📂 Loading data from: {args.data}")
+    with open(args.data, 'rb') as f:
+        dataset_sha256 = hashlib.sha256(f.read()).hexdigest()
+    df = pd.read_csv(args.data)
+    print(f"   Loaded {len(df)} samples, {df['Country'].nunique()} countries, "
+          f"years {df['Year'].min()} - {df['Year'].max()}")
+
+    # 2. One encoder for every country, shared by both models
+    encoder = LabelEncoder().fit(df['Country'])
+    lagged_data, scenario_data, feature_columns, train_keys = build_matrices(df, encoder)
+
+    # 3. Train both models concurrently, splitting the cores between them
+    cores = os.cpu_count() or 2
+    n_jobs = max(1, cores // 2)
+    print(f"\n🤖 Training both models in parallel ({n_jobs} cores each)...")
+
+    jobs = [
+        ('lagged', MODEL_ESTIMATOR, LAGGED_PARAMS, lagged_data),
+        ('scenario', SCENARIO_MODEL_ESTIMATOR, SCENARIO_PARAMS, scenario_data)
+    ]
+    models, metrics = {}, {}
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(fit_model, kind, estimator, params, data, n_jobs)
+                   for kind, estimator, params, data in jobs]
+        for future in futures:
+            kind, model, result = future.result()
+            # Rows the model has seen, read by incremental_update.py
+            model.trained_keys_ = train_keys[kind]
+            models[kind], metrics[kind] = model, result
+            print(f"   ✅ {kind}: {describe(model)}, fit {result['fit_seconds']:.2f}s, "
+                  f"test R² {result['test_r2']:.4f}, RMSE {result['test_rmse']:.4f}")
+
+    # 4. Write one consistent, versioned artifact set
+    feature_info = {
+        'feature_columns': feature_columns,
+        'feature_names': [
+            'Country_Encoded',
+            'Population_Growth_Rate',
+            'Exports_Growth_Rate',
+            'Imports_Growth_Rate',
+            'Investment_Growth_Rate',
+            'Consumption_Growth_Rate',
+            'Govt_Spend_Growth_Rate'
+        ]
+    }
+    artifacts = {
+        os.path.basename(MODEL_PATH): models['lagged'],
+        os.path.basename(ENCODER_PATH): encoder,
+        os.path.basename(SCENARIO_MODEL_PATH): models['scenario'],
+        os.path.basename(SCENARIO_ENCODER_PATH): encoder,
+        os.path.basename(SCENARIO_FEATURE_INFO_PATH): feature_info
+    }
+    version, version_dir = save_bundle(RELEASE_NAME, artifacts, {
+        'dataset': args.data,
+        'dataset_sha256': dataset_sha256,
+        'countries': len(encoder.classes_),
+        'temporal_split_year': TEMPORAL_SPLIT_YEAR,
+        'models': metrics
+    })
+    print(f"\n💾 Saved release {version} to: {version_dir}")
+
+    if args.install:
+        for path, obj in [(MODEL_PATH, models['lagged']), (ENCODER_PATH, encoder),
+                          (SCENARIO_MODEL_PATH, models['scenario']), (SCENARIO_ENCODER_PATH, encoder),
+                          (SCENARIO_FEATURE_INFO_PATH, feature_info)]:
+            joblib.dump(obj, path)
+        print(f"💾 Installed to serving paths: {MODEL_PATH}, {SCENARIO_MODEL_PATH} (+ encoders)")
+
+    print(f"\n✅ Done in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,18 @@ Fixes:
 2. Temporal train/test split
 3. Consistent paths via config.py
 4. Proper validation and error handling
+
+Features, split, encoder and model come from the cached build graph
+(build_graph.py): a rerun with unchanged data, code and parameters loads
+them instead of rebuilding. Each graph stage (dataset, lagged_features,
+temporal_split, lagged_matrices, lagged_model) is a profiler stage of its
+own, flagged cached or rebuilt.
 """
 
+import argparse
+import os
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import joblib
@@ -20,50 +27,11 @@ warnings.filterwarnings('ignore')
 from config import (
     DATASET_PATH, MODEL_PATH, ENCODER_PATH,
     FEATURE_COLUMNS, TARGET_COLUMN,
-    TEMPORAL_SPLIT_YEAR, MODEL_PARAMS
+    TEMPORAL_SPLIT_YEAR, MODEL_ESTIMATOR
 )
-
-
-def create_lagged_features(df):
-    """
-    Create lagged features (T-1) to predict GDP at time T
-    This prevents data leakage by using previous year's data
-    
-    Args:
-        df: DataFrame with columns [Country, Year, features...]
-    
-    Returns:
-        DataFrame with lagged features
-    """
-    print("\n📊 Creating lagged features (T-1)...")
-    
-    # Sort by Country and Year to ensure proper ordering
-    df = df.sort_values(['Country', 'Year']).reset_index(drop=True)
-    
-    # Create lagged features grouped by Country
-    # This ensures data doesn't bleed between countries
-    lagged_features = [
-        'Population_Growth_Rate',
-        'Exports of goods and services_Growth_Rate',
-        'Imports of goods and services_Growth_Rate',
-        'Gross capital formation_Growth_Rate',
-        'Final consumption expenditure_Growth_Rate',
-        'Government_Expenditure_Growth_Rate'
-    ]
-    
-    for feature in lagged_features:
-        # Shift by 1 within each country group
-        df[f'{feature}_Lag1'] = df.groupby('Country')[feature].shift(1)
-    
-    # Drop rows with NaN values created by shifting
-    # (first year for each country will have NaN)
-    rows_before = len(df)
-    df = df.dropna()
-    rows_after = len(df)
-    print(f"   Dropped {rows_before - rows_after} rows with NaN values from lagging")
-    print(f"   Remaining samples: {rows_after}")
-    
-    return df
+from build_graph import default_graph
+from estimators import describe, LAGGED_PARAMS
+from stage_profiler import StageProfiler
 
 
 def temporal_train_test_split(df, split_year):
@@ -163,7 +131,10 @@ def evaluate_model(model, X_train, y_train, X_test, y_test):
     
     print("=" * 60)
     
-    # Feature importance
+    # Feature importance (not every estimator exposes impurity importances)
+    if not hasattr(model, 'feature_importances_'):
+        return
+    
     feature_importance = pd.DataFrame({
         'Feature': FEATURE_COLUMNS,
         'Importance': model.feature_importances_
@@ -178,49 +149,53 @@ def main():
     """
     Main training pipeline
     """
+    parser = argparse.ArgumentParser(description='Train the lagged GDP prediction model')
+    parser.add_argument('--profile', action='store_true',
+                        help='Capture a cProfile dump of the slowest stage')
+    parser.add_argument('--report', default='training_profile.json',
+                        help='Where to write the per-stage JSON report')
+    args = parser.parse_args()
+    
+    profiler = StageProfiler(profile=args.profile)
+    
     print("=" * 60)
     print("GDP Growth Prediction Model Training")
     print("=" * 60)
     
-    # 1. Load data
-    print(f"\n📂 Loading data from: {DATASET_PATH}")
-    df = pd.read_csv(DATASET_PATH)
-    print(f"   Loaded {len(df)} samples")
-    print(f"   Countries: {df['Country'].nunique()}")
-    print(f"   Years: {df['Year'].min()} - {df['Year'].max()}")
+    graph = default_graph(profiler=profiler)
     
-    # 2. Create lagged features (Fix Issue #1: Data Leakage)
-    df = create_lagged_features(df)
-    
-    # 3. Temporal train/test split (Fix Issue #2: Time-Series Awareness)
-    train_df, test_df = temporal_train_test_split(df, TEMPORAL_SPLIT_YEAR)
-    
-    # 4. Prepare features
-    print("\n🔧 Preparing features...")
-    X_train, y_train, encoder = prepare_features(train_df, fit_encoder=True)
-    X_test, y_test, _ = prepare_features(test_df, encoder=encoder, fit_encoder=False)
+    # 1-4. Load data, create lagged features (Fix Issue #1: Data Leakage),
+    # temporal train/test split (Fix Issue #2: Time-Series Awareness), encode
+    print(f"\n📂 Building features from: {DATASET_PATH}")
+    matrices = graph.build('lagged_matrices')
+    X_train, y_train = matrices['X_train'], matrices['y_train']
+    X_test, y_test = matrices['X_test'], matrices['y_test']
+    encoder = matrices['encoder']
     
+    print(f"   Temporal split at {TEMPORAL_SPLIT_YEAR}: "
+          f"{len(X_train)} training / {len(X_test)} test samples")
     print(f"   Training features shape: {X_train.shape}")
     print(f"   Test features shape: {X_test.shape}")
     
     # 5. Train model
-    print(f"\n🤖 Training Random Forest Regressor...")
-    print(f"   Parameters: {MODEL_PARAMS}")
+    print(f"\n🤖 Training {MODEL_ESTIMATOR} model...")
+    print(f"   Parameters: {LAGGED_PARAMS[MODEL_ESTIMATOR]}")
     
-    model = RandomForestRegressor(**MODEL_PARAMS)
-    model.fit(X_train, y_train)
+    model = graph.build('lagged_model')
     
-    print("   ✅ Training complete!")
+    print(f"   ✅ {describe(model)} ready!")
     
     # 6. Evaluate model
-    evaluate_model(model, X_train, y_train, X_test, y_test)
+    with profiler.stage('evaluate'):
+        evaluate_model(model, X_train, y_train, X_test, y_test)
     
     # 7. Save model and encoder (Fix Issue #3: Consistent Paths)
-    print(f"\n💾 Saving model to: {MODEL_PATH}")
-    joblib.dump(model, MODEL_PATH)
-    
-    print(f"💾 Saving encoder to: {ENCODER_PATH}")
-    joblib.dump(encoder, ENCODER_PATH)
+    with profiler.stage('save'):
+        print(f"\n💾 Saving model to: {MODEL_PATH}")
+        joblib.dump(model, MODEL_PATH)
+        
+        print(f"💾 Saving encoder to: {ENCODER_PATH}")
+        joblib.dump(encoder, ENCODER_PATH)
     
     print("\n✅ Training pipeline complete!")
     print("=" * 60)
@@ -233,6 +208,12 @@ def main():
     print(f"   Predicted GDP Growth: {prediction:.2f}%")
     print(f"   Actual GDP Growth: {actual:.2f}%")
     print(f"   Error: {abs(prediction - actual):.2f}%")
+    
+    # 9. Stage profile
+    profiler.print_summary()
+    profiler.write_json(args.report)
+    if args.profile:
+        profiler.dump_slowest_profile(os.path.splitext(args.report)[0])
 
 
 if __name__ == "__main__":
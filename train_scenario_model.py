@@ -7,19 +7,30 @@ This is NOT a forecasting model - it's a scenario simulator that answers:
 
 Scientific Validity: Uses the GDP accounting identity relationship
 GDP = Consumption + Investment + Government + (Exports - Imports)
+
+Features, split, encoder and model come from the cached build graph
+(build_graph.py): a rerun with unchanged data, code and parameters loads
+them instead of rebuilding. Each graph stage is a profiler stage of its own,
+flagged cached or rebuilt.
 """
 
+import argparse
+import os
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 import joblib
 import warnings
 warnings.filterwarnings('ignore')
 
-from config import DATASET_PATH
+from config import (
+    DATASET_PATH, SCENARIO_MODEL_PATH, SCENARIO_ENCODER_PATH,
+    SCENARIO_FEATURE_INFO_PATH, SCENARIO_MODEL_ESTIMATOR
+)
+from build_graph import default_graph
+from estimators import describe, SCENARIO_PARAMS
+from stage_profiler import StageProfiler
 
 
 def prepare_features(df, encoder=None, fit_encoder=False):
@@ -85,7 +96,17 @@ def evaluate_model(model, X_train, y_train, X_test, y_test):
     
     print("=" * 60)
     
-    # Feature importance
+    results = {
+        'train_r2': train_r2,
+        'test_r2': test_r2,
+        'train_rmse': train_rmse,
+        'test_rmse': test_rmse
+    }
+    
+    # Feature importance (not every estimator exposes impurity importances)
+    if not hasattr(model, 'feature_importances_'):
+        return results
+    
     feature_importance = pd.DataFrame({
         'Feature': [
             'Country',
@@ -103,18 +124,22 @@ def evaluate_model(model, X_train, y_train, X_test, y_test):
     for idx, row in feature_importance.iterrows():
         print(f"   {row['Feature']}: {row['Importance']:.4f}")
     
-    return {
-        'train_r2': train_r2,
-        'test_r2': test_r2,
-        'train_rmse': train_rmse,
-        'test_rmse': test_rmse
-    }
+    return results
 
 
 def main():
     """
     Main training pipeline for GDP Scenario Simulator
     """
+    parser = argparse.ArgumentParser(description='Train the GDP scenario simulator model')
+    parser.add_argument('--profile', action='store_true',
+                        help='Capture a cProfile dump of the slowest stage')
+    parser.add_argument('--report', default='training_profile_scenario.json',
+                        help='Where to write the per-stage JSON report')
+    args = parser.parse_args()
+    
+    profiler = StageProfiler(profile=args.profile)
+    
     print("=" * 60)
     print("GDP ECONOMIC SCENARIO SIMULATOR - Model Training")
     print("=" * 60)
@@ -122,49 +147,30 @@ def main():
     print("   NOT forecasting - simulates economic scenarios")
     print("   Example: 'If exports grow 10%, what happens to GDP?'")
     
-    # Load data
-    print(f"\n📂 Loading data from: {DATASET_PATH}")
-    df = pd.read_csv(DATASET_PATH)
-    print(f"   Loaded {len(df)} samples")
-    print(f"   Countries: {df['Country'].nunique()}")
-    print(f"   Years: {df['Year'].min()} - {df['Year'].max()}")
-    
-    # Prepare features (NO LAGGING - current year indicators)
-    print("\n🔧 Preparing features (concurrent indicators)...")
-    X, y, encoder, feature_columns = prepare_features(df, fit_encoder=True)
-    
-    print(f"   Features shape: {X.shape}")
-    print(f"   Using CURRENT YEAR growth rates (no lagging)")
-    
-    # Standard train/test split with shuffle
-    print("\n📊 Splitting data (80/20 with shuffle)...")
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y,
-        test_size=0.2,
-        random_state=42,
-        shuffle=True
-    )
+    graph = default_graph(profiler=profiler)
+    
+    # Load data, prepare features (NO LAGGING - current year indicators)
+    # and split 80/20 with shuffle
+    print(f"\n📂 Building features from: {DATASET_PATH}")
+    print("   Using CURRENT YEAR growth rates (no lagging), 80/20 shuffled split")
+    matrices = graph.build('scenario_matrices')
+    X_train, y_train = matrices['X_train'], matrices['y_train']
+    X_test, y_test = matrices['X_test'], matrices['y_test']
+    encoder, feature_columns = matrices['encoder'], matrices['feature_columns']
     
     print(f"   Training: {len(X_train)} samples (80%)")
     print(f"   Test: {len(X_test)} samples (20%)")
     
     # Train model
-    print(f"\n🤖 Training Random Forest Regressor...")
-    
-    model = RandomForestRegressor(
-        n_estimators=100,
-        max_depth=15,
-        min_samples_split=5,
-        min_samples_leaf=2,
-        random_state=42,
-        n_jobs=-1
-    )
+    print(f"\n🤖 Training {SCENARIO_MODEL_ESTIMATOR} model...")
+    print(f"   Parameters: {SCENARIO_PARAMS[SCENARIO_MODEL_ESTIMATOR]}")
     
-    model.fit(X_train, y_train)
-    print(f"   ✅ Training complete!")
+    model = graph.build('scenario_model')
+    print(f"   ✅ {describe(model)} ready!")
     
     # Evaluate model
-    results = evaluate_model(model, X_train, y_train, X_test, y_test)
+    with profiler.stage('evaluate'):
+        results = evaluate_model(model, X_train, y_train, X_test, y_test)
     
     # Check if we achieved target accuracy
     if results['test_r2'] >= 0.85:
@@ -175,14 +181,15 @@ def main():
         print(f"\n⚠️ Below target. Test R² = {results['test_r2']:.4f} (<80%)")
     
     # Save model and encoder
-    model_path = "gdp_scenario_model.pkl"
-    encoder_path = "country_encoder_scenario.pkl"
+    model_path = SCENARIO_MODEL_PATH
+    encoder_path = SCENARIO_ENCODER_PATH
     
-    print(f"\n💾 Saving model to: {model_path}")
-    joblib.dump(model, model_path)
-    
-    print(f"💾 Saving encoder to: {encoder_path}")
-    joblib.dump(encoder, encoder_path)
+    with profiler.stage('save'):
+        print(f"\n💾 Saving model to: {model_path}")
+        joblib.dump(model, model_path)
+        
+        print(f"💾 Saving encoder to: {encoder_path}")
+        joblib.dump(encoder, encoder_path)
     
     # Save feature columns for API
     feature_info = {
@@ -197,8 +204,8 @@ def main():
             'Govt_Spend_Growth_Rate'
         ]
     }
-    joblib.dump(feature_info, 'feature_info_scenario.pkl')
-    print(f"💾 Saving feature info to: feature_info_scenario.pkl")
+    joblib.dump(feature_info, SCENARIO_FEATURE_INFO_PATH)
+    print(f"💾 Saving feature info to: {SCENARIO_FEATURE_INFO_PATH}")
     
     print("\n✅ Training pipeline complete!")
     print("=" * 60)
@@ -230,6 +237,12 @@ def main():
     print("   ✅ Scenario Planning: Simulate different economic conditions")
     print("   ✅ Policy Simulation: Evaluate fiscal policy effects")
     print("   ❌ NOT for forecasting future GDP")
+    
+    # Stage profile
+    profiler.print_summary()
+    profiler.write_json(args.report)
+    if args.profile:
+        profiler.dump_slowest_profile(os.path.splitext(args.report)[0])
 
 
 if __name__ == "__main__":
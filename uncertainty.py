@@ -0,0 +1,115 @@
+"""
+Prediction uncertainty from the individual trees of a random forest
+
+A RandomForestRegressor prediction is the mean of its trees' outputs; the
+spread of those outputs is a cheap, model-native measure of uncertainty.
+
+Per-tree outputs are obtained in one vectorized pass: model.apply(X) gives the
+leaf index of every row in every tree, and a precomputed (trees x nodes)
+table of node values turns those indices into a (trees x rows) prediction
+matrix with a single fancy-indexing gather. Quantiles, standard deviation and
+the share of trees predicting negative growth are then column reductions.
+"""
+
+import numpy as np
+
+from config import UNCERTAINTY_QUANTILES
+
+
+class TreeDistribution:
+    """Per-tree prediction matrix and summary statistics for a fitted forest"""
+
+    def __init__(self, model):
+        if not hasattr(model, 'estimators_'):
+            raise TypeError(f"{type(model).__name__} has no per-tree estimators")
+
+        self.model = model
+        self.n_trees = len(model.estimators_)
+
+        # Node values padded to the largest tree: table[t, node]
+        max_nodes = max(est.tree_.node_count for est in model.estimators_)
+        self._values = np.zeros((self.n_trees, max_nodes))
+        for t, est in enumerate(model.estimators_):
+            self._values[t, :est.tree_.node_count] = est.tree_.value[:, 0, 0]
+        self._tree_index = np.arange(self.n_trees)
+
+    def per_tree(self, X):
+        """
+        Prediction of every tree for every row
+
+        Returns:
+            ndarray (n_trees, n_rows)
+        """
+        leaves = self.model.apply(X)  # (n_rows, n_trees)
+        return self._values[self._tree_index, leaves].T
+
+    def summarize(self, X, quantiles=None):
+        """
+        Summary statistics of the tree predictions for each row of X
+
+        Returns:
+            dict of arrays, each of length n_rows:
+            'mean', 'std', 'prob_negative' and 'quantiles' ((n_quantiles, n_rows))
+        """
+        quantiles = UNCERTAINTY_QUANTILES if quantiles is None else quantiles
+        preds = self.per_tree(X)
+
+        return {
+            'mean': preds.mean(axis=0),
+            'std': preds.std(axis=0),
+            'prob_negative': (preds < 0).mean(axis=0),
+            'quantiles': np.quantile(preds, quantiles, axis=0)
+        }
+
+    def to_json(self, summary, quantiles=None):
+        """Convert a summarize() result into one JSON-ready dict per row"""
+        quantiles = UNCERTAINTY_QUANTILES if quantiles is None else quantiles
+        return [
+            {
+                'std': round(float(summary['std'][i]), 4),
+                'quantiles': {
+                    str(q): round(float(summary['quantiles'][j, i]), 2)
+                    for j, q in enumerate(quantiles)
+                },
+                'prob_negative_growth': round(float(summary['prob_negative'][i]), 4),
+                'n_trees': self.n_trees
+            }
+            for i in range(len(summary['std']))
+        ]
+
+
+def parse_uncertainty_options(data):
+    """
+    Read the optional uncertainty settings from a request body
+
+    Body keys:
+        include_uncertainty: JSON boolean (default False); anything else is an error
+        quantiles: list of floats in [0, 1] (default config.UNCERTAINTY_QUANTILES)
+
+    Returns:
+        tuple: (include_uncertainty, quantiles, error_message)
+    """
+    if not isinstance(data, dict):
+        return False, UNCERTAINTY_QUANTILES, None
+
+    include = data.get('include_uncertainty', False)
+    if not isinstance(include, bool):
+        # bool("false") is True: only accept a JSON boolean
+        return False, None, 'include_uncertainty must be a boolean (true or false)'
+    quantiles = data.get('quantiles', UNCERTAINTY_QUANTILES)
+
+    if not include:
+        return False, UNCERTAINTY_QUANTILES, None
+
+    if not isinstance(quantiles, list) or not quantiles:
+        return True, None, 'quantiles must be a non-empty list of numbers between 0 and 1'
+
+    try:
+        quantiles = [float(q) for q in quantiles]
+    except (ValueError, TypeError):
+        return True, None, 'quantiles must be a non-empty list of numbers between 0 and 1'
+
+    if not all(0 <= q <= 1 for q in quantiles):
+        return True, None, 'quantiles must be a non-empty list of numbers between 0 and 1'
+
+    return True, quantiles, None
@@ -0,0 +1,187 @@
+"""
+Shared input validation and country encoding
+Used by the Flask APIs (app.py, app_scenario.py) and the offline batch scorer
+so that online and offline predictions go through exactly the same checks
+"""
+
+import numpy as np
+
+
+# Request fields for the lagged model (/predict)
+PREDICTION_FIELDS = [
+    'Country',
+    'Population',
+    'Exports',
+    'Imports',
+    'Investment',
+    'Consumption',
+    'Govt_Spend'
+]
+
+# Request fields for the scenario model (/simulate)
+SCENARIO_FIELDS = [
+    'Country',
+    'Population_Growth_Rate',
+    'Exports_Growth_Rate',
+    'Imports_Growth_Rate',
+    'Investment_Growth_Rate',
+    'Consumption_Growth_Rate',
+    'Govt_Spend_Growth_Rate'
+]
+
+
+def validate_prediction_input(data):
+    """
+    Validate incoming prediction request (Fix Issue #4: Input Validation)
+    
+    Args:
+        data: JSON request data
+    
+    Returns:
+        tuple: (is_valid, error_message, validated_data)
+    """
+    required_fields = PREDICTION_FIELDS
+    
+    # Check if data exists
+    if not data:
+        return False, 'Request body is empty', None
+    
+    # Check for missing fields
+    missing_fields = [field for field in required_fields if field not in data]
+    if missing_fields:
+        return False, f'Missing required fields: {", ".join(missing_fields)}', None
+    
+    # Validate and convert to float
+    validated_data = {}
+    
+    # Country should be string
+    try:
+        validated_data['Country'] = str(data['Country']).strip()
+        if not validated_data['Country']:
+            return False, 'Country name cannot be empty', None
+    except Exception:
+        return False, 'Invalid Country value', None
+    
+    # Numeric fields should be convertible to float
+    numeric_fields = PREDICTION_FIELDS[1:]
+    
+    for field in numeric_fields:
+        try:
+            value = float(data[field])
+            
+            # Check for reasonable ranges (growth rates typically -100% to +100%)
+            if not -100 <= value <= 100:
+                return False, f'{field} value {value} is outside reasonable range (-100 to 100)', None
+            
+            validated_data[field] = value
+            
+        except (ValueError, TypeError):
+            return False, f'Invalid {field} value: must be a number', None
+    
+    return True, None, validated_data
+
+
+def validate_scenario_input(data):
+    """
+    Validate incoming scenario simulation request
+    
+    Returns: (is_valid, error_message, validated_data)
+    """
+    required_fields = SCENARIO_FIELDS
+    
+    # Check if data exists
+    if not data:
+        return False, 'Request body is empty', None
+    
+    # Check for missing fields
+    missing_fields = [field for field in required_fields if field not in data]
+    if missing_fields:
+        return False, f'Missing required fields: {", ".join(missing_fields)}', None
+    
+    validated_data = {}
+    
+    # Validate country
+    try:
+        validated_data['Country'] = str(data['Country']).strip()
+        if not validated_data['Country']:
+            return False, 'Country name cannot be empty', None
+    except Exception:
+        return False, 'Invalid Country value', None
+    
+    # Validate numeric fields
+    is_valid, error_msg, rates = validate_scenario_rates(data)
+    if not is_valid:
+        return False, error_msg, None
+    validated_data.update(rates)
+    
+    return True, None, validated_data
+
+
+def validate_scenario_rates(data):
+    """
+    Validate the growth-rate fields of a scenario (every field except Country)
+    
+    Used on its own for scenarios applied to several countries (/simulate/compare).
+    
+    Returns: (is_valid, error_message, rates)
+    """
+    if not isinstance(data, dict) or not data:
+        return False, 'Scenario must be a non-empty object', None
+    
+    numeric_fields = SCENARIO_FIELDS[1:]
+    missing_fields = [field for field in numeric_fields if field not in data]
+    if missing_fields:
+        return False, f'Missing required fields: {", ".join(missing_fields)}', None
+    
+    rates = {}
+    for field in numeric_fields:
+        try:
+            value = float(data[field])
+            
+            # Check for reasonable ranges (-100% to +100%)
+            if not -100 <= value <= 100:
+                return False, f'{field} value {value} is outside reasonable range (-100 to 100)', None
+            
+            rates[field] = value
+        except (ValueError, TypeError):
+            return False, f'Invalid {field} value: must be a number', None
+    
+    return True, None, rates
+
+
+def country_code_map(encoder):
+    """
+    Build a {country: code} lookup equivalent to encoder.transform
+    
+    LabelEncoder codes are the positions in the sorted classes_ array,
+    so a dict lookup gives identical codes without a per-row transform call.
+    """
+    return {country: code for code, country in enumerate(encoder.classes_.tolist())}
+
+
+def build_feature_matrix(validated_rows, fields, code_map):
+    """
+    Turn validated rows into the model feature matrix
+    
+    Args:
+        validated_rows: list of validated dicts (output of validate_*_input)
+        fields: PREDICTION_FIELDS or SCENARIO_FIELDS (Country first)
+        code_map: output of country_code_map
+    
+    Returns:
+        tuple: (X, unknown) - float64 matrix in training column order, and the
+        positions of rows whose country is not known to the encoder (their
+        X rows are left as NaN)
+    """
+    X = np.full((len(validated_rows), len(fields)), np.nan)
+    unknown = []
+    
+    for i, row in enumerate(validated_rows):
+        code = code_map.get(row['Country'])
+        if code is None:
+            unknown.append(i)
+            continue
+        X[i, 0] = code
+        X[i, 1:] = [row[field] for field in fields[1:]]
+    
+    return X, unknown
@@ -0,0 +1,82 @@
+"""
+Startup warm-up and readiness for the Flask APIs
+
+load_model_and_data() returning does not make an instance fast: the first
+requests still pay one-off costs (numpy/sklearn code paths, joblib-loaded
+arrays being paged in, Flask and JSON machinery). After loading, each app
+replays representative requests for every route through a test client in a
+background thread, so those costs are paid before real traffic arrives.
+
+/healthz (liveness) answers as soon as the process is up; /readyz
+(readiness) returns 503 until the warm-up has finished, so a platform only
+routes traffic to warm instances.
+"""
+
+import threading
+import time
+
+from config import WARMUP_REPEATS
+
+
+class Readiness:
+    """Warm-up state shared by /readyz"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._ready = threading.Event()
+        self.report = None
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def mark_ready(self, report):
+        self.report = report
+        self._ready.set()
+
+    def uptime(self):
+        return time.time() - self.started
+
+
+def run_warm_up(app, warm_up_requests, readiness, repeats=WARMUP_REPEATS):
+    """
+    Replay each (method, path, options) request `repeats` times, then mark ready
+
+    options are test-client keyword arguments (e.g. json=..., query_string=...).
+    Failures are recorded in the report but do not block readiness: a cold
+    instance is still better than one that never takes traffic.
+    """
+    start = time.perf_counter()
+    results = []
+    try:
+        client = app.test_client()
+        for method, path, options in warm_up_requests:
+            timings = []
+            status = None
+            for _ in range(repeats):
+                request_start = time.perf_counter()
+                status = client.open(path, method=method, **options).status_code
+                timings.append((time.perf_counter() - request_start) * 1000)
+            results.append({
+                'request': f'{method} {path}',
+                'status': status,
+                'first_ms': round(timings[0], 2),
+                'last_ms': round(timings[-1], 2)
+            })
+        print(f"✅ Warm-up complete: {len(results)} routes in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        print(f"⚠️ Warm-up failed: {e}")
+        results.append({'error': str(e)})
+
+    readiness.mark_ready({
+        'seconds': round(time.perf_counter() - start, 3),
+        'requests': results
+    })
+
+
+def start_warm_up(app, warm_up_requests, readiness):
+    """Run the warm-up in a daemon thread so /healthz answers immediately"""
+    thread = threading.Thread(target=run_warm_up, args=(app, warm_up_requests, readiness),
+                              name='warm-up', daemon=True)
+    thread.start()
+    return thread